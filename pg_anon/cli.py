@@ -5,15 +5,21 @@ import uuid
 
 from pg_anon import PgAnonApp
 from pg_anon.common.constants import (
+    DEFAULT_COMPRESSION,
     DEFAULT_DB_CONNECTIONS_PER_PROCESS,
+    DEFAULT_DUMP_CHUNK_SIZE,
+    DEFAULT_DUMP_PROCESSES,
     DEFAULT_PG_DUMP_PATH,
     DEFAULT_PG_RESTORE_PATH,
+    DEFAULT_POST_DATA_WORKERS,
     DEFAULT_PROCESSES,
+    DEFAULT_RESTORE_BUFFER_SIZE,
     DEFAULT_SCAN_PARTIAL_ROWS,
+    DEFAULT_TABLE_RESTORE_CONCURRENCY,
 )
 from pg_anon.common.dto import PgAnonResult, RunOptions
-from pg_anon.common.enums import AnonMode, ResultCode, ScanMode, VerboseOptions
-from pg_anon.common.utils import make_run_dir, parse_comma_separated_list
+from pg_anon.common.enums import AnonMode, ResultCode, ScanMode, ScanSampleMethod, VerboseOptions
+from pg_anon.common.utils import make_run_dir, parse_comma_separated_list, parse_non_negative_int, parse_positive_int
 from pg_anon.version import __version__
 
 
@@ -112,7 +118,7 @@ def common_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def multiprocessing_common_parser() -> argparse.ArgumentParser:
+def multiprocessing_common_parser(default_processes: int = DEFAULT_PROCESSES) -> argparse.ArgumentParser:
     """Create the argument parser with multiprocessing options."""
     p = argparse.ArgumentParser(add_help=False)
     p.add_argument(
@@ -124,8 +130,8 @@ def multiprocessing_common_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--processes",
         type=int,
-        default=DEFAULT_PROCESSES,
-        help="""Number of concurrent compression workers for dump mode. (default: %(default)s)""",
+        default=default_processes,
+        help="""Number of worker processes. In dump mode each process has its own event loop and "--db-connections-per-process" connections, so the dump uses processes * connections in total; 1 dumps data in the main process. (default: %(default)s)""",
     )
 
     return p
@@ -180,6 +186,28 @@ def scan_parser() -> argparse.ArgumentParser:
         default=DEFAULT_SCAN_PARTIAL_ROWS,
         help="""In "--scan-mode=partial" defines amount of rows to scan (default: %(default)s). Actual rows count can be smaller after getting unique values.""",
     )
+    p.add_argument(
+        "--scan-sample-method",
+        choices=[v.value for v in ScanSampleMethod],
+        default=ScanSampleMethod.LIMIT.value,
+        help="""In "--scan-mode=partial" defines how rows are sampled: "limit" takes the first rows, "system" and "bernoulli" use TABLESAMPLE with a percentage calculated from the estimated rows count of the table, "system_rows" uses TABLESAMPLE SYSTEM_ROWS and requires the "tsm_system_rows" extension (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--scan-server-filter",
+        action="store_true",
+        help="""In "--scan-mode=full" checks data by constants and regexes in PostgreSQL, so data of insensitive fields is not transferred to pg_anon. Regexes without a PostgreSQL equivalent and data functions are checked on the client side (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--scan-use-stats",
+        action="store_true",
+        help="""Check most common values and histogram bounds from "pg_stats" before reading tables. Fields found sensitive by them are not scanned (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--scan-state-file",
+        type=str,
+        default=None,
+        help="""File with verdicts of the previous scans. If it is set, fields are rescanned only if they are new, their type or rules were changed or their table got more than 10%% of rows written since the last scan (default: %(default)s)""",
+    )
 
     p.add_argument(
         "--save-dicts",
@@ -261,6 +289,28 @@ def dump_parser() -> argparse.ArgumentParser:
         default=None,
         help="Additional options passed directly to pg_dump utility.",
     )
+    p.add_argument(
+        "--dump-chunk-size",
+        type=int,
+        default=DEFAULT_DUMP_CHUNK_SIZE,
+        help="""Split tables larger than this size (in MB) into ctid ranges, which are dumped in parallel into separate files. Requires PostgreSQL 14+ on the source. 0 disables splitting. (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--disable-largest-first",
+        action="store_true",
+        help="""Dump tables in the catalog order instead of the largest first order.""",
+    )
+    p.add_argument(
+        "--compression",
+        type=str,
+        default=DEFAULT_COMPRESSION,
+        help="""Compression codec and optional level of data files: "gzip[:1-9]", "zstd[:1-22]", "lz4[:0-16]" or "none". zstd and lz4 require the "compression" extra. (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="""Continue an interrupted dump in the same output directory. Data files recorded in the dump journal are kept, only the rest are dumped under a new snapshot.""",
+    )
 
     return p
 
@@ -293,6 +343,34 @@ def restore_parser() -> argparse.ArgumentParser:
         default=DEFAULT_DB_CONNECTIONS_PER_PROCESS,
         help="""Number of database connections. (default: %(default)s)""",
     )
+    p.add_argument(
+        "--table-restore-concurrency",
+        type=parse_non_negative_int,
+        default=DEFAULT_TABLE_RESTORE_CONCURRENCY,
+        help="""Max number of connections loading data files of the same table at once. Matters for tables dumped in chunks (see "--dump-chunk-size"). 0 means limited only by "--db-connections-per-process". (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--disable-largest-first",
+        action="store_true",
+        help="""Restore data files in the dump order instead of the largest first order.""",
+    )
+    p.add_argument(
+        "--restore-buffer-size",
+        type=parse_positive_int,
+        default=DEFAULT_RESTORE_BUFFER_SIZE,
+        help="""Size (in MB) of chunks decompressed from data files and sent to COPY. Each connection holds up to two chunks in memory. (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--post-data-workers",
+        type=int,
+        default=DEFAULT_POST_DATA_WORKERS,
+        help="""Number of pg_restore processes which build indexes and constraints of a table as soon as all its data files are loaded, while other tables are still loading. Foreign keys and other post-data objects are restored after all data. 0 restores post-data only after all data. (default: %(default)s)""",
+    )
+    p.add_argument(
+        "--resume",
+        action="store_true",
+        help="""Continue an interrupted restore into the same database using the restore journal stored in it. Completed stages and data files are skipped.""",
+    )
     p.add_argument(
         "--disable-checks",
         action="store_true",
@@ -489,7 +567,7 @@ def get_arg_parser() -> argparse.ArgumentParser:
     ]:
         sub.add_parser(
             mode_name,
-            parents=[common_parser(), multiprocessing_common_parser(), dump_parser()],
+            parents=[common_parser(), multiprocessing_common_parser(DEFAULT_DUMP_PROCESSES), dump_parser()],
             help=help_text,
         )
 
@@ -573,6 +651,9 @@ def build_run_options(cli_run_params: list[str] | None = None) -> RunOptions:
     if args_dict.get("scan_mode"):
         args_dict["scan_mode"] = ScanMode(args_dict["scan_mode"])
 
+    if args_dict.get("scan_sample_method"):
+        args_dict["scan_sample_method"] = ScanSampleMethod(args_dict["scan_sample_method"])
+
     if args_dict.get("verbose"):
         args_dict["verbose"] = VerboseOptions(args_dict["verbose"])
 
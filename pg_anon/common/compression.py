@@ -0,0 +1,146 @@
+import gzip
+import importlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from pg_anon.common.errors import ErrorCode, PgAnonError
+
+LEGACY_COMPRESSION: dict[str, Any] = {"codec": "gzip", "level": 1}
+
+
+def _import_optional(module_name: str, codec_name: str) -> Any:  # noqa: ANN401
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        raise PgAnonError(
+            ErrorCode.UNSUPPORTED_COMPRESSION,
+            f'Compression codec "{codec_name}" requires the "{module_name}" package. '
+            f'Install it with: pip install "pg_anon[compression]"',
+        ) from exc
+
+
+def _open_gzip_writer(path: Path, level: int | None) -> BinaryIO:
+    return gzip.open(path, "wb", compresslevel=level if level is not None else 1)  # type: ignore[return-value]
+
+
+def _open_gzip_reader(path: Path) -> BinaryIO:
+    return gzip.open(path, "rb")  # type: ignore[return-value]
+
+
+def _open_zstd_writer(path: Path, level: int | None) -> BinaryIO:
+    zstandard = _import_optional("zstandard", "zstd")
+    # Single-threaded: files of all connections are compressed at the same time, extra zstd threads
+    # per file would only oversubscribe the cores
+    compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+    return compressor.stream_writer(path.open("wb"), closefd=True)
+
+
+def _open_zstd_reader(path: Path) -> BinaryIO:
+    zstandard = _import_optional("zstandard", "zstd")
+    return zstandard.ZstdDecompressor().stream_reader(path.open("rb"), read_across_frames=True, closefd=True)
+
+
+def _open_lz4_writer(path: Path, level: int | None) -> BinaryIO:
+    lz4_frame = _import_optional("lz4.frame", "lz4")
+    return lz4_frame.open(path, "wb", compression_level=level if level is not None else 0)
+
+
+def _open_lz4_reader(path: Path) -> BinaryIO:
+    lz4_frame = _import_optional("lz4.frame", "lz4")
+    return lz4_frame.open(path, "rb")
+
+
+def _open_plain_writer(path: Path, _level: int | None) -> BinaryIO:
+    return path.open("wb")
+
+
+def _open_plain_reader(path: Path) -> BinaryIO:
+    return path.open("rb")
+
+
+@dataclass(frozen=True)
+class CompressionCodec:
+    name: str
+    extension: str
+    levels: range | None
+    open_writer: Callable[[Path, int | None], BinaryIO]
+    open_reader: Callable[[Path], BinaryIO]
+
+
+COMPRESSION_CODECS: dict[str, CompressionCodec] = {
+    codec.name: codec
+    for codec in (
+        CompressionCodec("gzip", ".bin.gz", range(1, 10), _open_gzip_writer, _open_gzip_reader),
+        CompressionCodec("zstd", ".bin.zst", range(1, 23), _open_zstd_writer, _open_zstd_reader),
+        CompressionCodec("lz4", ".bin.lz4", range(0, 17), _open_lz4_writer, _open_lz4_reader),
+        CompressionCodec("none", ".bin", None, _open_plain_writer, _open_plain_reader),
+    )
+}
+
+
+@dataclass(frozen=True)
+class Compression:
+    """Compression codec with level, used for dump data files."""
+
+    codec: CompressionCodec
+    level: int | None = None
+
+    @property
+    def extension(self) -> str:
+        """Extension of data files written by the codec."""
+        return self.codec.extension
+
+    def open_writer(self, path: Path) -> BinaryIO:
+        """Open a binary file object compressing everything written to the path."""
+        return self.codec.open_writer(path, self.level)
+
+    def open_reader(self, path: Path) -> BinaryIO:
+        """Open a binary file object returning decompressed content of the path."""
+        return self.codec.open_reader(path)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the compression for metadata."""
+        return {"codec": self.codec.name, "level": self.level}
+
+    def __str__(self) -> str:
+        return self.codec.name if self.level is None else f"{self.codec.name}:{self.level}"
+
+
+def parse_compression(value: str) -> Compression:
+    """Parse a compression spec like ``zstd:3``, ``lz4``, ``gzip:6`` or ``none``."""
+    name, _, level_str = value.strip().lower().partition(":")
+    name = "gzip" if name == "gz" else name
+
+    codec = COMPRESSION_CODECS.get(name)
+    if codec is None:
+        raise PgAnonError(
+            ErrorCode.UNSUPPORTED_COMPRESSION,
+            f'Unknown compression codec "{name}". Supported: {", ".join(COMPRESSION_CODECS)}',
+        )
+
+    level = None
+    if level_str:
+        if codec.levels is None:
+            raise PgAnonError(ErrorCode.UNSUPPORTED_COMPRESSION, f'Compression codec "{name}" has no levels')
+        try:
+            level = int(level_str)
+        except ValueError:
+            raise PgAnonError(
+                ErrorCode.UNSUPPORTED_COMPRESSION, f'Invalid compression level "{level_str}" for "{name}"'
+            ) from None
+        if level not in codec.levels:
+            raise PgAnonError(
+                ErrorCode.UNSUPPORTED_COMPRESSION,
+                f'Compression level for "{name}" must be between {codec.levels.start} and {codec.levels.stop - 1}',
+            )
+
+    return Compression(codec=codec, level=level)
+
+
+def get_metadata_compression(data: dict[str, Any] | None) -> Compression:
+    """Build the compression recorded in dump metadata. Dumps without this record are gzip compressed."""
+    data = data or LEGACY_COMPRESSION
+    level = data.get("level")
+    return parse_compression(data["codec"] if level is None else f"{data['codec']}:{level}")
@@ -10,6 +10,8 @@ LOGS_FILE_NAME = "logs.log"
 SAVED_RUN_OPTIONS_FILE_NAME = "run_options.json"
 SAVED_RUN_STATUS_FILE_NAME = "run_status.json"
 SAVED_DICTS_INFO_FILE_NAME = "saved_dicts_info.json"
+SAVED_PROGRESS_FILE_NAME = "progress.json"
+PG_RESTORE_PROGRESS_FILE_NAME = "pg_restore_progress.json"
 
 ANON_UTILS_DB_SCHEMA_NAME = "anon_funcs"
 DEFAULT_HASH_FUNC = f"{ANON_UTILS_DB_SCHEMA_NAME}.digest(\"%s\", 'salt_word', 'md5')"
@@ -56,10 +58,49 @@ SECRET_RUN_OPTIONS = ["db_user_password"]
 
 TRACEBACK_LINES_COUNT = 100
 QUEUE_POLL_TIMEOUT = 60
+COPY_OUTPUT_BUFFER_SIZE = 1024 * 1024
+# Max length of a log line of pg_dump / pg_restore read from a running process
+PG_UTIL_LOG_LINE_LIMIT = 1024 * 1024
+
+DUMP_WORKER_POLL_TIMEOUT = 1
+DUMP_WORKER_TASK_STARTED = "started"
+DUMP_WORKER_TASK_FINISHED = "finished"
+DUMP_WORKER_TASK_FAILED = "failed"
+DUMP_WORKER_TASK_PROGRESS = "progress"
+
+PROGRESS_SAVE_INTERVAL = 5
+
+DUMP_JOURNAL_FILE_NAME = "dump_journal.jsonl"
+DUMP_JOURNAL_VERSION = 1
+
+RESTORE_JOURNAL_SCHEMA_NAME = "anon_restore_journal"
+RESTORE_JOURNAL_DUMP_ITEM = "dump"
+RESTORE_JOURNAL_STAGE_ITEM_PREFIX = "stage:"
+RESTORE_JOURNAL_FILE_ITEM_PREFIX = "file:"
+
+# Share of not NULL rows which most common values from pg_stats must cover to represent all values of a field
+STATS_MCV_FULL_COVERAGE = 0.999
+
+# How many times more rows than "--scan-partial-rows" are requested by TABLESAMPLE SYSTEM and BERNOULLI
+SCAN_SAMPLE_OVERSAMPLING = 2
+
+SCAN_STATE_VERSION = 1
+# Share of live rows of a table which can be written after the scan without rescanning its fields
+SCAN_STATE_CHANGED_ROWS_RATIO = 0.1
+
+# Fields with fewer values are checked in the event loop instead of a worker process
+CLASSIFY_IN_WORKER_MIN_VALUES = 500
 
 # Default values for RunOptions
 DEFAULT_PROCESSES = 4
+# Dump runs in the main process unless worker processes are requested explicitly
+DEFAULT_DUMP_PROCESSES = 1
 DEFAULT_DB_CONNECTIONS_PER_PROCESS = 4
 DEFAULT_PG_DUMP_PATH = "/usr/bin/pg_dump"
 DEFAULT_PG_RESTORE_PATH = "/usr/bin/pg_restore"
 DEFAULT_SCAN_PARTIAL_ROWS = 10000
+DEFAULT_DUMP_CHUNK_SIZE = 0
+DEFAULT_COMPRESSION = "gzip:1"
+DEFAULT_TABLE_RESTORE_CONCURRENCY = 0
+DEFAULT_RESTORE_BUFFER_SIZE = 1
+DEFAULT_POST_DATA_WORKERS = 0
@@ -0,0 +1,125 @@
+import re
+import time
+from collections.abc import Callable, Iterable
+
+from pg_anon.common.matchers import RegexMatcher, SubstringMatcher
+
+CHECK_DATA_CONST = "data_const"
+CHECK_DATA_PARTIAL_CONST = "data_partial_const"
+CHECK_DATA_REGEX = "data_regex"
+CHECK_DATA_FUNC = "data_func"
+
+# (check, matched constant or regex or None, seconds)
+CheckResult = tuple[str, str | None, float]
+
+
+class DataClassifier:
+    """Check values of a field by ``data_const`` and ``data_regex`` rules of the meta dictionary.
+
+    Checks don't do any I/O, so they can run in worker processes. An instance is picklable
+    and is sent to every worker once, when the worker starts.
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        phrases: Iterable[str],
+        partial_constants: Iterable[str],
+        regexes: list[re.Pattern],
+        client_regexes: list[re.Pattern] | None = None,
+    ) -> None:
+        self.words = frozenset(words)
+        self.words_min_length = min(map(len, self.words), default=0)
+        phrases = list(phrases)
+        self.phrases_matcher = SubstringMatcher(phrases) if phrases else None
+        partial_constants = list(partial_constants)
+        self.partial_constants_matcher = SubstringMatcher(partial_constants) if partial_constants else None
+        self.regex_matcher = RegexMatcher(regexes) if regexes else None
+        # Regexes without a PostgreSQL equivalent, which are left after the server-side screening
+        self.client_regex_matcher = RegexMatcher(client_regexes) if client_regexes else None
+
+    def find_constant(self, values: list[str]) -> str | None:
+        """Return a constant word or phrase which one of the values contains."""
+        for value in values:
+            if value is None:
+                continue
+
+            for word in value.split():
+                if len(word) >= self.words_min_length and word.lower() in self.words:
+                    return word
+
+            if self.phrases_matcher is not None and (phrase := self.phrases_matcher.search(value.lower())) is not None:
+                return phrase
+
+        return None
+
+    def find_partial_constant(self, values: list[str]) -> str | None:
+        """Return a partial constant which one of the values contains."""
+        if self.partial_constants_matcher is None:
+            return None
+
+        for value in values:
+            if value is None:
+                continue
+
+            if (partial_constant := self.partial_constants_matcher.search(value.lower())) is not None:
+                return partial_constant
+
+        return None
+
+    @staticmethod
+    def find_regex(values: list[str], regex_matcher: RegexMatcher | None) -> str | None:
+        """Return the regex and the value which it matches."""
+        if regex_matcher is None:
+            return None
+
+        for value in values:
+            if value is None:
+                continue
+
+            if (rule := regex_matcher.search(value)) is not None:
+                return f"regex={rule.pattern}; value={value}"
+
+        return None
+
+    def classify(self, values: list[str], screened: bool = False, check_regex: bool = True) -> list[CheckResult]:
+        """Run checks ordered by cost until the first match and return the results of the checks which were run.
+
+        Constants of a ``screened`` field were already checked on the server side, only client regexes are left.
+        """
+        checks: list[tuple[str, Callable[[list[str]], str | None]]] = []
+        if not screened:
+            if self.words or self.phrases_matcher is not None:
+                checks.append((CHECK_DATA_CONST, self.find_constant))
+            if self.partial_constants_matcher is not None:
+                checks.append((CHECK_DATA_PARTIAL_CONST, self.find_partial_constant))
+
+        regex_matcher = self.client_regex_matcher if screened else self.regex_matcher
+        if check_regex and regex_matcher is not None:
+            checks.append((CHECK_DATA_REGEX, lambda field_values: self.find_regex(field_values, regex_matcher)))
+
+        results: list[CheckResult] = []
+        for check, find in checks:
+            started = time.perf_counter()
+            matched = find(values)
+            results.append((check, matched, time.perf_counter() - started))
+            if matched is not None:
+                break
+
+        return results
+
+
+_worker_classifier: DataClassifier | None = None
+
+
+def init_classifier_worker(classifier: DataClassifier) -> None:
+    """Keep the classifier in the worker process for all next batches."""
+    global _worker_classifier  # noqa: PLW0603
+    _worker_classifier = classifier
+
+
+def classify_in_worker(values: list[str], screened: bool, check_regex: bool) -> list[CheckResult]:
+    """Classify a batch of values by the classifier of the worker process."""
+    if _worker_classifier is None:
+        raise RuntimeError("Classifier worker is not initialized")
+    return _worker_classifier.classify(values, screened=screened, check_regex=check_regex)
@@ -1,7 +1,8 @@
 import re
 
-from pg_anon.common.constants import ANON_UTILS_DB_SCHEMA_NAME
+from pg_anon.common.constants import ANON_UTILS_DB_SCHEMA_NAME, SCAN_SAMPLE_OVERSAMPLING
 from pg_anon.common.dto import FieldInfo
+from pg_anon.common.enums import ScanSampleMethod
 
 
 def get_limit_query(limit: int | None) -> str:
@@ -104,34 +105,103 @@ def get_tables_with_fields_query(schema: str, limit: int = 10, offset: int = 0,
     """
 
 
-def get_data_from_field_query(
-    field_info: FieldInfo, limit: int | None = None, condition: str | None = None, not_null: bool = True
+def get_table_sample_clause(sample_method: ScanSampleMethod | None, limit: int | None, reltuples: int = 0) -> str:
+    """Build a TABLESAMPLE clause returning about ``limit`` rows of a table with ``reltuples`` estimated rows.
+
+    Return an empty string if the whole table is smaller than the sample or its rows count is unknown.
+    """
+    if sample_method is None or sample_method == ScanSampleMethod.LIMIT or not limit or limit <= 0:
+        return ""
+
+    if sample_method == ScanSampleMethod.SYSTEM_ROWS:
+        return f"TABLESAMPLE SYSTEM_ROWS ({limit})"
+
+    if reltuples <= limit:
+        return ""
+
+    # Rows where all fields are NULL are filtered out after sampling, so more rows are sampled than needed
+    percent = min(100.0, 100.0 * limit * SCAN_SAMPLE_OVERSAMPLING / reltuples)
+    return f"TABLESAMPLE {sample_method.value.upper()} ({percent:.6g})"
+
+
+def get_data_from_table_fields_query(
+    fields_info: list[FieldInfo],
+    limit: int | None = None,
+    condition: str | None = None,
+    sample_method: ScanSampleMethod | None = None,
+    reltuples: int = 0,
 ) -> str:
-    """Build a query for receiving data from a table."""
+    """Build a query for receiving data of several fields of one table in one pass.
+
+    The N-th column of the result contains text values of the N-th field. Rows where all fields are NULL are skipped.
+    """
     conditions = []
-    query_condition = ""
 
     if condition:
         condition = re.sub(r"^\s*where\b\s*", "", condition, flags=re.IGNORECASE)
-        conditions.append(condition)
-
-    if not_null:
-        conditions.append(f'"{field_info.column_name}" is NOT NULL')
+        conditions.append(f"({condition})")
 
-    if conditions:
-        query_condition = "WHERE "
-        query_condition += " and ".join(conditions)
+    not_null_conditions = " or ".join(f'"{field_info.column_name}" is NOT NULL' for field_info in fields_info)
+    conditions.append(f"({not_null_conditions})")
 
+    query_fields = ",\n        ".join(
+        f'substring("{field_info.column_name}"::text, 1, 8196)' for field_info in fields_info
+    )
+    query_condition = "WHERE " + " and ".join(conditions)
     query_limit = get_limit_query(limit)
+    query_sample = get_table_sample_clause(sample_method=sample_method, limit=limit, reltuples=reltuples)
 
     return f"""
-    SELECT distinct t1._field
-    FROM (
-        SELECT (substring(\"{field_info.column_name}\"::text, 1, 8196)) as _field
-        FROM \"{field_info.nspname}\".\"{field_info.relname}\"
-        {query_condition}
-        {query_limit}
-    ) as t1
+    SELECT
+        {query_fields}
+    FROM \"{fields_info[0].nspname}\".\"{fields_info[0].relname}\" {query_sample}
+    {query_condition}
+    {query_limit}
+    """
+
+
+def get_field_screening_query(
+    field_info: FieldInfo,
+    condition: str | None = None,
+    check_words: bool = False,
+    check_substrings: bool = False,
+    regexes_count: int = 0,
+) -> str:
+    """Build a query checking on the server side whether any value of a field contains sensitive data.
+
+    Parameters are passed in the order: words (text[]), LIKE patterns of substrings (text[]), regexes (text).
+    The values are truncated to the same length as in the data receiving query.
+    """
+    conditions = []
+    if condition:
+        condition = re.sub(r"^\s*where\b\s*", "", condition, flags=re.IGNORECASE)
+        conditions.append(f"({condition})")
+    conditions.append(f'"{field_info.column_name}" is NOT NULL')
+
+    checks = []
+    param_number = 0
+    if check_words:
+        param_number += 1
+        checks.append(f"regexp_split_to_array(lower(t1._field), '\\s+') && ${param_number}::text[]")
+    if check_substrings:
+        param_number += 1
+        checks.append(f"lower(t1._field) LIKE ANY (${param_number}::text[])")
+    for _ in range(regexes_count):
+        param_number += 1
+        checks.append(f"t1._field ~ ${param_number}")
+
+    query_checks = "\n           OR ".join(checks)
+
+    return f"""
+    SELECT EXISTS (
+        SELECT 1
+        FROM (
+            SELECT substring(\"{field_info.column_name}\"::text, 1, 8196) as _field
+            FROM \"{field_info.nspname}\".\"{field_info.relname}\"
+            WHERE {" and ".join(conditions)}
+        ) as t1
+        WHERE {query_checks}
+    )
     """
 
 
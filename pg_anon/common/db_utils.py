@@ -6,7 +6,12 @@ from typing import Any
 import asyncpg
 from asyncpg import Connection, Pool
 
-from pg_anon.common.constants import ANON_UTILS_DB_SCHEMA_NAME, DEFAULT_EXCLUDED_SCHEMAS, SERVER_SETTINGS
+from pg_anon.common.constants import (
+    ANON_UTILS_DB_SCHEMA_NAME,
+    DEFAULT_EXCLUDED_SCHEMAS,
+    RESTORE_JOURNAL_SCHEMA_NAME,
+    SERVER_SETTINGS,
+)
 from pg_anon.common.db_queries import (
     get_count_query,
     get_database_size_query,
@@ -15,7 +20,6 @@ from pg_anon.common.db_queries import (
 )
 from pg_anon.common.dto import ConnectionParams, FieldInfo
 from pg_anon.common.errors import ErrorCode, PgAnonError
-from pg_anon.common.utils import get_dict_rule_for_table
 from pg_anon.context import Context
 from pg_anon.logger import get_logger
 
@@ -220,11 +224,26 @@ async def get_db_size(
     return result
 
 
-async def exec_data_scan_func_query(connection: Connection, scan_func: str, value: Any, field_info: FieldInfo) -> bool:  # noqa: ANN401
-    """Execute a row-level scan using a custom database function."""
-    query = f"""SELECT {scan_func}($1, $2, $3, $4)"""
-    statement = await connection.prepare(query)
-    return await statement.fetchval(value, field_info.nspname, field_info.relname, field_info.column_name)
+async def exec_data_scan_func_query(
+    connection: Connection, scan_func: str, values: list[str], field_info: FieldInfo, max_matches: int
+) -> int:
+    """Execute a row-level scan using a custom database function for a batch of values in one round trip.
+
+    Values are checked in the given order until ``max_matches`` of them are matched,
+    the returned number of matched values is capped by ``max_matches``.
+    """
+    query = f"""
+        SELECT count(*)
+        FROM (
+            SELECT 1
+            FROM unnest($1::text[]) AS t(value)
+            WHERE t.value IS NOT NULL AND {scan_func}(t.value, $2, $3, $4)
+            LIMIT $5
+        ) AS matched
+    """
+    return await connection.fetchval(
+        query, values, field_info.nspname, field_info.relname, field_info.column_name, max_matches
+    )
 
 
 async def exec_data_scan_func_per_field_query(
@@ -329,6 +348,105 @@ async def get_partition_ancestors_map(
     return result
 
 
+async def get_tables_size_info(
+    connection: Connection,
+    tables: list[tuple[str, str]],
+) -> dict[tuple[str, str], dict[str, int]]:
+    """Get heap size in bytes, heap pages count and estimated rows count of the given tables."""
+    if not tables:
+        return {}
+
+    args = _tables_as_arrays(tables)
+
+    rows = await connection.fetch(
+        """
+        SELECT n.nspname,
+               c.relname,
+               pg_relation_size(c.oid) AS size,
+               pg_relation_size(c.oid) / current_setting('block_size')::bigint AS pages,
+               greatest(c.reltuples, 0)::bigint AS reltuples
+          FROM unnest($1::text[], $2::text[]) AS v(s, t)
+          JOIN pg_namespace n ON n.nspname = v.s
+          JOIN pg_class c ON c.relname = v.t AND c.relnamespace = n.oid
+        """,
+        *args,
+    )
+    return {
+        (r["nspname"], r["relname"]): {"size": r["size"], "pages": r["pages"], "reltuples": r["reltuples"]}
+        for r in rows
+    }
+
+
+async def get_fields_stats(
+    connection: Connection,
+    fields_info: list[FieldInfo],
+) -> dict[str, dict[str, Any]]:
+    """Get statistics collected by ANALYZE for the given fields, by ``obj_id`` of the field.
+
+    Most common values and histogram bounds are returned as text, the same way field data is scanned.
+    Fields of tables which were never analyzed are missing in the result.
+    """
+    if not fields_info:
+        return {}
+
+    rows = await connection.fetch(
+        """
+        SELECT DISTINCT ON (v.obj_id)
+               v.obj_id,
+               s.null_frac,
+               s.n_distinct,
+               s.avg_width,
+               s.most_common_vals::text::text[] AS most_common_vals,
+               s.most_common_freqs,
+               s.histogram_bounds::text::text[] AS histogram_bounds
+          FROM unnest($1::text[], $2::text[], $3::text[], $4::text[]) AS v(obj_id, s, t, f)
+          JOIN pg_stats s ON s.schemaname = v.s AND s.tablename = v.t AND s.attname = v.f
+         ORDER BY v.obj_id, s.inherited DESC
+        """,
+        [field_info.obj_id for field_info in fields_info],
+        [field_info.nspname for field_info in fields_info],
+        [field_info.relname for field_info in fields_info],
+        [field_info.column_name for field_info in fields_info],
+    )
+    return {r["obj_id"]: dict(r) for r in rows}
+
+
+async def get_tables_mod_stats(
+    connection: Connection,
+    tables: list[tuple[str, str]],
+) -> dict[tuple[str, str], dict[str, int | None]]:
+    """Get the number of written rows (``n_tup_mod``) and live rows of the given tables and their inheritors."""
+    if not tables:
+        return {}
+
+    args = _tables_as_arrays(tables)
+
+    rows = await connection.fetch(
+        """
+        WITH RECURSIVE
+        tables(nspname, relname, relid) AS (
+            SELECT n.nspname, c.relname, c.oid
+              FROM unnest($1::text[], $2::text[]) AS v(s, t)
+              JOIN pg_namespace n ON n.nspname = v.s
+              JOIN pg_class c ON c.relname = v.t AND c.relnamespace = n.oid
+            UNION
+            SELECT t.nspname, t.relname, inh.inhrelid
+              FROM tables t
+              JOIN pg_inherits inh ON inh.inhparent = t.relid
+        )
+        SELECT t.nspname,
+               t.relname,
+               sum(s.n_tup_ins + s.n_tup_upd + s.n_tup_del)::bigint AS n_tup_mod,
+               sum(s.n_live_tup)::bigint AS n_live_tup
+          FROM tables t
+          LEFT JOIN pg_stat_user_tables s ON s.relid = t.relid
+         GROUP BY t.nspname, t.relname
+        """,
+        *args,
+    )
+    return {(r["nspname"], r["relname"]): {"n_tup_mod": r["n_tup_mod"], "n_live_tup": r["n_live_tup"]} for r in rows}
+
+
 async def get_db_tables(
     connection: Connection,
     excluded_schemas: list[str] | None = None,
@@ -925,12 +1043,62 @@ async def check_db_is_empty(connection: Connection) -> bool:
                 WHERE table_schema not in (
                         'pg_catalog',
                         'information_schema',
-                        '{ANON_UTILS_DB_SCHEMA_NAME}'
+                        '{ANON_UTILS_DB_SCHEMA_NAME}',
+                        '{RESTORE_JOURNAL_SCHEMA_NAME}'
                     ) AND table_type = 'BASE TABLE'
             )"""
     )
 
 
+async def get_restore_journal(connection: Connection) -> dict[str, dict[str, Any]] | None:
+    """Read the restore journal of the target database. Returns None if there is no journal."""
+    journal_exists = await connection.fetchval(
+        "SELECT to_regclass($1) IS NOT NULL", f'"{RESTORE_JOURNAL_SCHEMA_NAME}"."journal"'
+    )
+    if not journal_exists:
+        return None
+
+    rows = await connection.fetch(f'SELECT item, value, rows FROM "{RESTORE_JOURNAL_SCHEMA_NAME}"."journal"')
+    return {row["item"]: {"value": row["value"], "rows": row["rows"]} for row in rows}
+
+
+async def create_restore_journal(connection: Connection) -> None:
+    """Create an empty restore journal in the target database, replacing the existing one."""
+    await connection.execute(
+        f"""
+        DROP SCHEMA IF EXISTS "{RESTORE_JOURNAL_SCHEMA_NAME}" CASCADE;
+        CREATE SCHEMA "{RESTORE_JOURNAL_SCHEMA_NAME}";
+        CREATE TABLE "{RESTORE_JOURNAL_SCHEMA_NAME}"."journal" (
+            item text PRIMARY KEY,
+            value text,
+            rows bigint,
+            finished_at timestamptz NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+
+async def add_restore_journal_item(
+    connection: Connection, item: str, value: str | None = None, rows: int | None = None
+) -> None:
+    """Record a completed restore item. Runs in the caller's transaction, if any."""
+    await connection.execute(
+        f"""
+        INSERT INTO "{RESTORE_JOURNAL_SCHEMA_NAME}"."journal" (item, value, rows)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (item) DO UPDATE SET value = EXCLUDED.value, rows = EXCLUDED.rows, finished_at = now()
+        """,
+        item,
+        value,
+        rows,
+    )
+
+
+async def drop_restore_journal(connection: Connection) -> None:
+    """Drop the restore journal from the target database."""
+    await connection.execute(f'DROP SCHEMA IF EXISTS "{RESTORE_JOURNAL_SCHEMA_NAME}" CASCADE')
+
+
 async def run_query_in_pool(pool: Pool, query: str) -> None:
     """Execute a SQL query using a connection from the pool."""
     logger.info("================> Started query %s", query)
@@ -1007,8 +1175,14 @@ async def get_dump_query(  # noqa: C901, PLR0912
     files: dict | None = None,
     fields_cache: dict | None = None,
     legacy_inherits_parents: set[tuple[str, str]] | None = None,
+    chunk: dict[str, Any] | None = None,
+    file_extension: str = ".bin.gz",
 ) -> str | None:
-    """Build the SELECT query used to dump a table with optional anonymization rules."""
+    """Build the SELECT query used to dump a table with optional anonymization rules.
+
+    When ``chunk`` is given, the query reads only the heap pages range ``[start_page, end_page)`` of the table
+    (``end_page=None`` means up to the end of the table) and the data file is registered per chunk.
+    """
     table_name_full = f'"{table_schema}"."{table_name}"'
     from_clause_target = (
         f"ONLY {table_name_full}"
@@ -1028,11 +1202,7 @@ async def get_dump_query(  # noqa: C901, PLR0912
 
     # dictionary_exclude has third priority
     if "dictionary_exclude" in ctx.prepared_dictionary_obj:
-        exclude_rule = get_dict_rule_for_table(
-            dictionary_rules=ctx.prepared_dictionary_obj["dictionary_exclude"],
-            schema=table_schema,
-            table=table_name,
-        )
+        exclude_rule = ctx.get_rule_index("dictionary_exclude").find(table_schema, table_name)
 
         if exclude_rule is not None and table_rule is None:
             ctx.logger.info("Skipping: %s", table_name_full)
@@ -1043,7 +1213,14 @@ async def get_dump_query(  # noqa: C901, PLR0912
     ).hexdigest()
 
     if files is not None:
-        files[f"{hashed_name}.bin.gz"] = {"schema": table_schema, "table": table_name}
+        if chunk is None:
+            files[f"{hashed_name}{file_extension}"] = {"schema": table_schema, "table": table_name}
+        else:
+            files[f"{hashed_name}.{chunk['index']}{file_extension}"] = {
+                "schema": table_schema,
+                "table": table_name,
+                "chunk": chunk,
+            }
 
     if table_rule and "raw_sql" in table_rule:
         # the table is transferred using "raw_sql"
@@ -1090,9 +1267,19 @@ async def get_dump_query(  # noqa: C901, PLR0912
 
     fields_expr = ",\n".join(fields)
     query = f"SELECT {fields_expr}\nFROM {from_clause_target}"
+    conditions = []
     if sql_condition := table_rule and table_rule.get("sql_condition"):
-        condition = re.sub(r"^\s*where\b\s*", "", sql_condition, flags=re.IGNORECASE)
-        query += f"\nWHERE {condition}"
+        conditions.append(re.sub(r"^\s*where\b\s*", "", sql_condition, flags=re.IGNORECASE))
+    if chunk is not None:
+        ctid_condition = f"ctid >= '({chunk['start_page']},0)'::tid"
+        if chunk["end_page"] is not None:
+            ctid_condition += f" AND ctid < '({chunk['end_page']},0)'::tid"
+        conditions.append(ctid_condition)
+
+    if len(conditions) == 1:
+        query += f"\nWHERE {conditions[0]}"
+    elif conditions:
+        query += "\nWHERE " + " AND ".join(f"({condition})" for condition in conditions)
 
     if (
         ctx.options.dbg_stage_1_validate_dict
@@ -8,14 +8,19 @@ from pathlib import Path
 from typing import Any
 
 from pg_anon.common.constants import (
+    DEFAULT_COMPRESSION,
     DEFAULT_DB_CONNECTIONS_PER_PROCESS,
+    DEFAULT_DUMP_CHUNK_SIZE,
     DEFAULT_PG_DUMP_PATH,
     DEFAULT_PG_RESTORE_PATH,
+    DEFAULT_POST_DATA_WORKERS,
     DEFAULT_PROCESSES,
+    DEFAULT_RESTORE_BUFFER_SIZE,
     DEFAULT_SCAN_PARTIAL_ROWS,
+    DEFAULT_TABLE_RESTORE_CONCURRENCY,
     SECRET_RUN_OPTIONS,
 )
-from pg_anon.common.enums import AnonMode, ResultCode, ScanMode, VerboseOptions
+from pg_anon.common.enums import AnonMode, ResultCode, ScanMode, ScanSampleMethod, VerboseOptions
 
 
 @dataclass
@@ -53,6 +58,10 @@ class RunOptions:
     output_no_sens_dict_file: str | None = None
     scan_mode: ScanMode | None = None
     scan_partial_rows: int = DEFAULT_SCAN_PARTIAL_ROWS
+    scan_sample_method: ScanSampleMethod = ScanSampleMethod.LIMIT
+    scan_server_filter: bool = False
+    scan_use_stats: bool = False
+    scan_state_file: str | None = None
 
     # dump options
     prepared_sens_dict_files: list[str] | None = None
@@ -65,6 +74,8 @@ class RunOptions:
     dbg_stage_3_validate_full: bool = False
     partial_tables_dict_files: list[str] | None = None
     partial_tables_exclude_dict_files: list[str] | None = None
+    dump_chunk_size: int = DEFAULT_DUMP_CHUNK_SIZE
+    compression: str = DEFAULT_COMPRESSION
 
     # restore options
     input_dir: str = ""
@@ -75,9 +86,14 @@ class RunOptions:
     disable_checks: bool = False
     clean_db: bool = False
     drop_db: bool = False
+    table_restore_concurrency: int = DEFAULT_TABLE_RESTORE_CONCURRENCY
+    restore_buffer_size: int = DEFAULT_RESTORE_BUFFER_SIZE
+    post_data_workers: int = DEFAULT_POST_DATA_WORKERS
 
     # dump, restore options
     ignore_privileges: bool = False
+    disable_largest_first: bool = False
+    resume: bool = False
 
     # view-fields options
     view_only_sensitive_fields: bool = False
@@ -265,6 +281,8 @@ class Metadata:
         self.indexes: dict | None = None
         self.constraints: dict | None = None
         self.files: dict[str, dict[str, Any]] | None = None
+        self.compression: dict[str, Any] | None = None
+        self.consistency: dict[str, Any] | None = None
         self.total_tables_size: int | None = None
         self.total_rows: int | None = None
         self.db_size: int | None = None
@@ -294,6 +312,8 @@ class Metadata:
             "indexes": self.indexes,
             "constraints": self.constraints,
             "files": self.files,
+            "compression": self.compression,
+            "consistency": self.consistency,
             "total_tables_size": self.total_tables_size,
             "total_rows": self.total_rows,
             "db_size": self.db_size,
@@ -320,6 +340,10 @@ class Metadata:
 
         if self.files is None:
             del data["files"]
+        if self.compression is None:
+            del data["compression"]
+        if self.consistency is None:
+            del data["consistency"]
         if self.total_tables_size is None:
             del data["total_tables_size"]
         if self.total_rows is None:
@@ -353,7 +377,9 @@ class Metadata:
     def _serialize_tables(self) -> dict:
         if not self.files:
             return {"tables": []}
-        data = [{k: v for k, v in table_data.items() if k in ("schema", "table")} for table_data in self.files.values()]
+        # Chunked tables have several files, each table must be listed once
+        tables = dict.fromkeys((table_data["schema"], table_data["table"]) for table_data in self.files.values())
+        data = [{"schema": schema, "table": table} for schema, table in tables]
         return {"tables": data}
 
     def _deserialize_data(self, data: dict) -> None:
@@ -372,6 +398,8 @@ class Metadata:
         self.constraints = data.get("constraints")
 
         self.files = data.get("files")
+        self.compression = data.get("compression")
+        self.consistency = data.get("consistency")
         self.total_tables_size = data.get("total_tables_size")
         self.total_rows = data.get("total_rows")
 
@@ -29,3 +29,10 @@ class AnonMode(Enum):
 class ScanMode(Enum):
     FULL = "full"
     PARTIAL = "partial"
+
+
+class ScanSampleMethod(Enum):
+    LIMIT = "limit"  # first rows of the table
+    SYSTEM = "system"  # TABLESAMPLE SYSTEM, random pages
+    BERNOULLI = "bernoulli"  # TABLESAMPLE BERNOULLI, random rows from all pages
+    SYSTEM_ROWS = "system_rows"  # TABLESAMPLE SYSTEM_ROWS of the "tsm_system_rows" extension
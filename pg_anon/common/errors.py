@@ -34,6 +34,8 @@ class ErrorCode(StrEnum):
     DUMP_FAILED = "DUMP_FAILED"
     DUMP_QUERY_FAILED = "DUMP_QUERY_FAILED"
     COMPRESSION_FAILED = "COMPRESSION_FAILED"
+    UNSUPPORTED_COMPRESSION = "UNSUPPORTED_COMPRESSION"
+    DUMP_JOURNAL_MISMATCH = "DUMP_JOURNAL_MISMATCH"
 
     # Restore
     INPUT_DIR_NOT_FOUND = "INPUT_DIR_NOT_FOUND"
@@ -46,6 +48,7 @@ class ErrorCode(StrEnum):
     EXTENSION_ERROR = "EXTENSION_ERROR"
     ROW_COUNT_MISMATCH = "ROW_COUNT_MISMATCH"
     VALIDATION_FAILED = "VALIDATION_FAILED"
+    RESTORE_JOURNAL_MISMATCH = "RESTORE_JOURNAL_MISMATCH"
 
     # Scan
     NO_OBJECTS_FOR_SCAN = "NO_OBJECTS_FOR_SCAN"
@@ -0,0 +1,65 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+class Journal:
+    """Append-only JSON lines file used to resume interrupted runs.
+
+    The first line is a header describing the run, every next line is an entry about one completed step.
+    Each line is flushed and synced to disk before ``append`` returns, so the journal stays valid
+    if the process is killed at any moment (a torn last line is ignored on load).
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self.file_path = file_path
+        self.header: dict[str, Any] | None = None
+        self.entries: list[dict[str, Any]] = []
+
+    @property
+    def exists(self) -> bool:
+        """Check whether the journal file exists."""
+        return self.file_path.exists()
+
+    def load(self) -> None:
+        """Read the header and entries from the journal file."""
+        self.header = None
+        self.entries = []
+        if not self.exists:
+            return
+
+        with self.file_path.open(encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+                if self.header is None:
+                    self.header = record
+                else:
+                    self.entries.append(record)
+
+    def start(self, header: dict[str, Any], entries: list[dict[str, Any]] | None = None) -> None:
+        """Rewrite the journal with the header and already completed entries."""
+        self.header = header
+        self.entries = []
+
+        tmp_file_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with tmp_file_path.open("w", encoding="utf-8") as journal_file:
+            for record in [header, *(entries or [])]:
+                journal_file.write(json.dumps(record) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        tmp_file_path.replace(self.file_path)
+
+        self.entries = list(entries or [])
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """Durably add an entry to the journal."""
+        with self.file_path.open("a", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self.entries.append(entry)
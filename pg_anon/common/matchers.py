@@ -0,0 +1,266 @@
+import re
+from collections import deque
+from collections.abc import Iterable
+from re import _constants as sre_constants  # type: ignore[attr-defined]
+from re import _parser as sre_parser  # type: ignore[attr-defined]
+
+_REPEAT_OPCODES = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+
+def _get_required_literals(items: sre_parser.SubPattern) -> list[str]:
+    """Collect strings which must be contained in any text matched by the parsed regex sequence."""
+    literals: list[str] = []
+    chars: list[str] = []
+
+    for opcode, argument in items:
+        if opcode is sre_constants.LITERAL:
+            chars.append(chr(argument))
+            continue
+
+        if chars:
+            literals.append("".join(chars))
+            chars = []
+
+        if opcode is sre_constants.SUBPATTERN:
+            _group, add_flags, _del_flags, sub_items = argument
+            if not add_flags & re.IGNORECASE:
+                literals.extend(_get_required_literals(sub_items))
+        elif opcode is sre_constants.ATOMIC_GROUP:
+            literals.extend(_get_required_literals(argument))
+        elif opcode in _REPEAT_OPCODES:
+            min_count, _max_count, sub_items = argument
+            if min_count > 0:
+                literals.extend(_get_required_literals(sub_items))
+
+    if chars:
+        literals.append("".join(chars))
+
+    return literals
+
+
+def get_required_literal(pattern: re.Pattern) -> str | None:
+    """Return the longest string which must be contained in any text matched by the pattern, if there is one."""
+    if not isinstance(pattern.pattern, str) or pattern.flags & re.IGNORECASE:
+        return None
+
+    try:
+        literals = _get_required_literals(sre_parser.parse(pattern.pattern, pattern.flags))
+    except Exception:  # noqa: BLE001
+        return None
+
+    return max(literals, key=len, default=None)
+
+
+class RegexMatcher:
+    """Search a text by many regular expressions, skipping patterns which can't match it.
+
+    Every pattern is analyzed once for a literal string that any of its matches must contain
+    (for example ``@`` for e-mails), a pattern is run by the regex engine only if the text contains it.
+    Patterns are tried in the given order, so the result is the same as searching by every pattern.
+    """
+
+    def __init__(self, patterns: list[re.Pattern]) -> None:
+        self.patterns = list(patterns)
+        self._rules = [(pattern, get_required_literal(pattern)) for pattern in self.patterns]
+
+    def search(self, text: str) -> re.Pattern | None:
+        """Return the first pattern which matches the text, or None if no one pattern matches."""
+        for pattern, literal in self._rules:
+            if literal is not None and literal not in text:
+                continue
+            if pattern.search(text) is not None:
+                return pattern
+
+        return None
+
+
+class SubstringMatcher:
+    """Find which of many strings is contained in a text by one scan of the text.
+
+    Strings are compiled into an Aho-Corasick automaton, so the time of the search depends on the length
+    of the text and not on the number of strings.
+    """
+
+    def __init__(self, strings: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[str | None] = [None]  # a string which ends in the state
+
+        for string in strings:
+            self._add(string)
+        self._build_fail_links()
+
+    def _add(self, string: str) -> None:
+        state = 0
+        for char in string:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            state = next_state
+
+        if self._output[state] is None:
+            self._output[state] = string
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+
+                # A shorter string ending at the same position is found through the fail link
+                if self._output[next_state] is None:
+                    self._output[next_state] = self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> str | None:
+        """Return a string which is contained in the text, or None if no one string is contained."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        if output[0] is not None:
+            return output[0]
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+
+        return None
+
+
+# PostgreSQL regular expressions don't accept bounds of repetition greater than this value
+_POSIX_MAX_REPEAT = 255
+
+_POSIX_SPECIAL_CHARS = frozenset("\\^$.|?*+()[]{}")
+
+_POSIX_BRACKET_SPECIAL_CHARS = frozenset("\\]^-[")
+
+_POSIX_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: "\\d",
+    sre_constants.CATEGORY_NOT_DIGIT: "\\D",
+    sre_constants.CATEGORY_SPACE: "\\s",
+    sre_constants.CATEGORY_NOT_SPACE: "\\S",
+    sre_constants.CATEGORY_WORD: "\\w",
+    sre_constants.CATEGORY_NOT_WORD: "\\W",
+}
+
+_POSIX_BRACKET_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: "\\d",
+    sre_constants.CATEGORY_SPACE: "\\s",
+    sre_constants.CATEGORY_WORD: "\\w",
+}
+
+_POSIX_ANCHORS = {
+    sre_constants.AT_BEGINNING: "^",
+    sre_constants.AT_BEGINNING_STRING: "^",
+    # Python "$" matches also before the trailing newline
+    sre_constants.AT_END: "(?=\\n?$)",
+    sre_constants.AT_END_STRING: "$",
+    sre_constants.AT_BOUNDARY: "\\y",
+    sre_constants.AT_NON_BOUNDARY: "\\Y",
+}
+
+
+class _UnsupportedRegexError(Exception):
+    pass
+
+
+def _posix_char(char: str, special_chars: frozenset[str]) -> str:
+    return f"\\{char}" if char in special_chars else char
+
+
+def _posix_bracket(items: list) -> str:
+    if len(items) == 1 and items[0][0] is sre_constants.CATEGORY:
+        if items[0][1] not in _POSIX_CATEGORIES:
+            raise _UnsupportedRegexError
+        return _POSIX_CATEGORIES[items[0][1]]
+
+    parts: list[str] = []
+    for opcode, argument in items:
+        if opcode is sre_constants.NEGATE:
+            parts.insert(0, "^")
+        elif opcode is sre_constants.LITERAL:
+            parts.append(_posix_char(chr(argument), _POSIX_BRACKET_SPECIAL_CHARS))
+        elif opcode is sre_constants.RANGE:
+            parts.append(
+                f"{_posix_char(chr(argument[0]), _POSIX_BRACKET_SPECIAL_CHARS)}-"
+                f"{_posix_char(chr(argument[1]), _POSIX_BRACKET_SPECIAL_CHARS)}"
+            )
+        elif opcode is sre_constants.CATEGORY and argument in _POSIX_BRACKET_CATEGORIES:
+            parts.append(_POSIX_BRACKET_CATEGORIES[argument])
+        else:
+            raise _UnsupportedRegexError
+    return f"[{''.join(parts)}]"
+
+
+def _posix_sequence(items: sre_parser.SubPattern) -> str:  # noqa: C901, PLR0912
+    parts: list[str] = []
+    for opcode, argument in items:
+        if opcode is sre_constants.LITERAL:
+            parts.append(_posix_char(chr(argument), _POSIX_SPECIAL_CHARS))
+        elif opcode is sre_constants.NOT_LITERAL:
+            parts.append(f"[^{_posix_char(chr(argument), _POSIX_BRACKET_SPECIAL_CHARS)}]")
+        elif opcode is sre_constants.ANY:
+            parts.append(".")
+        elif opcode is sre_constants.IN:
+            parts.append(_posix_bracket(argument))
+        elif opcode in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            # Greedy and lazy quantifiers find the same texts
+            min_count, max_count, sub_items = argument
+            if min_count > _POSIX_MAX_REPEAT or (
+                max_count != sre_constants.MAXREPEAT and max_count > _POSIX_MAX_REPEAT
+            ):
+                raise _UnsupportedRegexError
+            bound = f"{min_count}," if max_count == sre_constants.MAXREPEAT else f"{min_count},{max_count}"
+            parts.append(f"(?:{_posix_sequence(sub_items)}){{{bound}}}")
+        elif opcode is sre_constants.SUBPATTERN:
+            _group, add_flags, del_flags, sub_items = argument
+            if add_flags or del_flags:
+                raise _UnsupportedRegexError
+            parts.append(f"(?:{_posix_sequence(sub_items)})")
+        elif opcode is sre_constants.BRANCH:
+            parts.append(f"(?:{'|'.join(_posix_sequence(branch) for branch in argument[1])})")
+        elif opcode in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            direction, sub_items = argument
+            kind = "=" if opcode is sre_constants.ASSERT else "!"
+            parts.append(f"(?{'' if direction > 0 else '<'}{kind}{_posix_sequence(sub_items)})")
+        elif opcode is sre_constants.AT and argument in _POSIX_ANCHORS:
+            parts.append(_POSIX_ANCHORS[argument])
+        else:
+            raise _UnsupportedRegexError
+    return "".join(parts)
+
+
+def get_posix_regex(pattern: re.Pattern) -> str | None:
+    """Translate a Python regex compiled with ``re.DOTALL`` into a PostgreSQL regex which matches the same texts.
+
+    Return None if the pattern uses syntax without an exact equivalent (back references, atomic groups,
+    possessive quantifiers, flags other than ``re.IGNORECASE``), so it must be checked on the client side.
+    """
+    if not isinstance(pattern.pattern, str):
+        return None
+
+    # In PostgreSQL "." matches a newline and "^", "$" match only at the ends of the text, as Python does with DOTALL
+    extra_flags = pattern.flags & ~(re.UNICODE | re.DOTALL | re.IGNORECASE)
+    if extra_flags or not pattern.flags & re.DOTALL:
+        return None
+
+    try:
+        posix_regex = _posix_sequence(sre_parser.parse(pattern.pattern, pattern.flags))
+    except (_UnsupportedRegexError, re.error):
+        return None
+
+    return f"(?i){posix_regex}" if pattern.flags & re.IGNORECASE else posix_regex
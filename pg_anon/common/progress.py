@@ -0,0 +1,295 @@
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pg_anon.common.constants import PROGRESS_SAVE_INTERVAL
+from pg_anon.common.utils import pretty_size
+
+
+@dataclass
+class _TaskProgress:
+    schema: str
+    table: str
+    expected_bytes: int
+    transferred_bytes: int = 0
+    file_bytes: int = 0
+    rows: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def done_bytes(self) -> int:
+        if self.finished:
+            return self.expected_bytes
+        return min(self.transferred_bytes, self.expected_bytes)
+
+
+class TransferProgress:
+    """Byte and row based progress of data files transfer in dump and restore.
+
+    Progress of every data file is the number of COPY bytes transferred, capped by the expected bytes,
+    so the percentage and the ETA are weighted by the size of tables instead of the number of files.
+    The state is written into a JSON file and logged not more often than once per ``save_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        file_path: Path | None = None,
+        logger: logging.Logger | None = None,
+        save_interval: float = PROGRESS_SAVE_INTERVAL,
+    ) -> None:
+        self.operation = operation
+        self.file_path = file_path
+        self.logger = logger
+        self.save_interval = save_interval
+
+        self._tasks: dict[str, _TaskProgress] = {}
+        self._started = time.time()
+        self._started_at = time.monotonic()
+        self._saved_at: float | None = None
+
+    def add_task(self, key: str, schema: str, table: str, expected_bytes: int) -> None:
+        """Register a data file with the expected size of its COPY data."""
+        self._tasks[key] = _TaskProgress(schema=schema, table=table, expected_bytes=max(expected_bytes, 0))
+
+    def task_started(self, key: str) -> None:
+        """Register the start of the data file transfer."""
+        if task := self._tasks.get(key):
+            task.started_at = time.monotonic()
+
+    def bytes_transferred(self, key: str, size: int) -> None:
+        """Add COPY bytes of the data file received from or sent to the server."""
+        if task := self._tasks.get(key):
+            task.transferred_bytes += size
+        self.save()
+
+    def task_finished(self, key: str, rows: int, file_bytes: int) -> None:
+        """Register the end of the data file transfer with its rows count and compressed size."""
+        if task := self._tasks.get(key):
+            task.rows = rows
+            task.file_bytes = file_bytes
+            task.finished_at = time.monotonic()
+        self.save()
+
+    def get_summary(self) -> dict[str, Any]:
+        """Return the progress state as a JSON serializable dict."""
+        now = time.monotonic()
+        elapsed = now - self._started_at
+        tasks = self._tasks.values()
+
+        expected_bytes = sum(task.expected_bytes for task in tasks)
+        done_bytes = sum(task.done_bytes for task in tasks)
+        transferred_bytes = sum(task.transferred_bytes for task in tasks)
+        rows = sum(task.rows for task in tasks)
+        finished_tasks = sum(task.finished for task in tasks)
+
+        if expected_bytes:
+            ratio = done_bytes / expected_bytes
+        else:
+            ratio = finished_tasks / len(self._tasks) if self._tasks else 1.0
+
+        eta_seconds = None
+        if ratio >= 1:
+            eta_seconds = 0.0
+        elif ratio > 0:
+            eta_seconds = round(elapsed * (1 - ratio) / ratio, 1)
+
+        return {
+            "operation": self.operation,
+            "started": self._started,
+            "updated": time.time(),
+            "elapsed_seconds": round(elapsed, 1),
+            "percent": round(ratio * 100, 2),
+            "eta_seconds": eta_seconds,
+            "files_total": len(self._tasks),
+            "files_finished": finished_tasks,
+            "expected_bytes": expected_bytes,
+            "transferred_bytes": transferred_bytes,
+            "file_bytes": sum(task.file_bytes for task in tasks),
+            "rows": rows,
+            "bytes_per_second": round(transferred_bytes / elapsed) if elapsed else None,
+            "rows_per_second": round(rows / elapsed) if elapsed else None,
+            "tables": self._get_tables_summary(now),
+        }
+
+    def _get_tables_summary(self, now: float) -> dict[str, dict[str, Any]]:
+        tables: dict[str, dict[str, Any]] = {}
+        busy_seconds: dict[str, float] = {}
+
+        for task in self._tasks.values():
+            table_name = f"{task.schema}.{task.table}"
+            table = tables.setdefault(
+                table_name,
+                {
+                    "schema": task.schema,
+                    "table": task.table,
+                    "files_total": 0,
+                    "files_finished": 0,
+                    "expected_bytes": 0,
+                    "transferred_bytes": 0,
+                    "file_bytes": 0,
+                    "rows": 0,
+                    "rows_per_second": None,
+                },
+            )
+            table["files_total"] += 1
+            table["files_finished"] += task.finished
+            table["expected_bytes"] += task.expected_bytes
+            table["transferred_bytes"] += task.transferred_bytes
+            table["file_bytes"] += task.file_bytes
+            table["rows"] += task.rows
+
+            if task.started_at is not None:
+                busy_seconds[table_name] = busy_seconds.get(table_name, 0.0) + (
+                    (task.finished_at or now) - task.started_at
+                )
+
+        # Rows are known only for finished files, so the rate is measured by them
+        for table_name, table in tables.items():
+            if table["files_finished"] and busy_seconds.get(table_name):
+                table["rows_per_second"] = round(table["rows"] / busy_seconds[table_name])
+
+        return tables
+
+    @staticmethod
+    def get_log_message(summary: dict[str, Any]) -> str:
+        """Describe the progress summary in one line for logs."""
+        message = (
+            f"Progress {summary['percent']}%: {summary['files_finished']}/{summary['files_total']} files, "
+            f"{pretty_size(summary['transferred_bytes'])} transferred, {summary['rows']} rows"
+        )
+        if summary["bytes_per_second"] is not None:
+            message += f", {pretty_size(summary['bytes_per_second'])}/s"
+        if summary["eta_seconds"] is not None:
+            message += f", ETA {summary['eta_seconds']:.0f}s"
+        return message
+
+    def save(self, force: bool = False) -> None:
+        """Write the progress file and log the progress if the save interval has passed."""
+        now = time.monotonic()
+        if not force and self._saved_at is not None and now - self._saved_at < self.save_interval:
+            return
+
+        self._saved_at = now
+        summary = self.get_summary()
+        if self.file_path is not None:
+            # Readers of the progress file must never see it partially written
+            tmp_file_path = self.file_path.with_name(self.file_path.name + ".tmp")
+            tmp_file_path.write_text(json.dumps(summary, indent=4), encoding="utf-8")
+            tmp_file_path.replace(self.file_path)
+        if self.logger is not None:
+            self.logger.info(self.get_log_message(summary))
+
+
+# With parallel jobs pg_restore reports entries restored before forking the workers by "processing item N"
+# (or "processing missed item N") and entries restored by the workers by "finished item N"
+_PG_RESTORE_ITEM_RE = re.compile(r"\b(?:processing(?: missed)?|finished) item (\d+)\b")
+# A serial pg_restore reports only "creating ..." or "executing ..." for every entry
+_PG_RESTORE_SERIAL_ITEM_RE = re.compile(r"^pg_restore: (?:creating|executing) ")
+
+
+class PgRestoreProgress:
+    """Progress of a pg_restore run, parsed from its verbose log lines while it is running.
+
+    The percentage is the number of reported entries to the number of entries in the TOC list.
+    The state is written into a JSON file and logged not more often than once per ``save_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        section: str,
+        total_items: int,
+        parallel: bool,
+        file_path: Path | None = None,
+        logger: logging.Logger | None = None,
+        save_interval: float = PROGRESS_SAVE_INTERVAL,
+    ) -> None:
+        self.section = section
+        self.total_items = total_items
+        self.parallel = parallel
+        self.file_path = file_path
+        self.logger = logger
+        self.save_interval = save_interval
+
+        self._item_ids: set[int] = set()
+        self._serial_items = 0
+        self._finished = False
+        self._started = time.time()
+        self._started_at = time.monotonic()
+        self._saved_at: float | None = None
+
+    @property
+    def done_items(self) -> int:
+        """Number of TOC entries which pg_restore has reported so far."""
+        done_items = len(self._item_ids) if self.parallel else self._serial_items
+        return min(done_items, self.total_items)
+
+    def parse_line(self, line: str) -> None:
+        """Count the entry reported by the log line of pg_restore."""
+        if self.parallel:
+            if match := _PG_RESTORE_ITEM_RE.search(line):
+                self._item_ids.add(int(match.group(1)))
+                self.save()
+        elif _PG_RESTORE_SERIAL_ITEM_RE.match(line):
+            self._serial_items += 1
+            self.save()
+
+    def finish(self) -> None:
+        """Register the successful end of pg_restore, all entries of the TOC list are restored."""
+        self._finished = True
+        self.save(force=True)
+
+    def get_summary(self) -> dict[str, Any]:
+        """Return the progress state as a JSON serializable dict."""
+        elapsed = time.monotonic() - self._started_at
+        ratio = self.done_items / self.total_items if self.total_items else 0.0
+        if self._finished:
+            ratio = 1.0
+
+        eta_seconds = None
+        if ratio >= 1:
+            eta_seconds = 0.0
+        elif ratio > 0:
+            eta_seconds = round(elapsed * (1 - ratio) / ratio, 1)
+
+        return {
+            "operation": "pg_restore",
+            "section": self.section,
+            "started": self._started,
+            "updated": time.time(),
+            "elapsed_seconds": round(elapsed, 1),
+            "percent": round(ratio * 100, 2),
+            "eta_seconds": eta_seconds,
+            "items_total": self.total_items,
+            "items_done": self.total_items if self._finished else self.done_items,
+        }
+
+    def save(self, force: bool = False) -> None:
+        """Write the progress file and log the progress if the save interval has passed."""
+        now = time.monotonic()
+        if not force and self._saved_at is not None and now - self._saved_at < self.save_interval:
+            return
+
+        self._saved_at = now
+        summary = self.get_summary()
+        if self.file_path is not None:
+            tmp_file_path = self.file_path.with_name(self.file_path.name + ".tmp")
+            tmp_file_path.write_text(json.dumps(summary, indent=4), encoding="utf-8")
+            tmp_file_path.replace(self.file_path)
+        if self.logger is not None:
+            self.logger.info(
+                "pg_restore %s progress %s%%: %s/%s items",
+                self.section,
+                summary["percent"],
+                summary["items_done"],
+                summary["items_total"],
+            )
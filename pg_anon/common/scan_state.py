@@ -0,0 +1,91 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from pg_anon.common.constants import SCAN_STATE_CHANGED_ROWS_RATIO, SCAN_STATE_VERSION
+from pg_anon.common.dto import FieldInfo
+
+
+class ScanState:
+    """Verdicts of the previous create-dict runs for every field checked by data, used to rescan only changed fields.
+
+    A verdict is reused if the field has the same type and the same hash of the rules which check it,
+    and its table got not more writes than ``changed_rows_ratio`` of its live rows since the verdict was saved.
+    The writes are counted by ``n_tup_ins + n_tup_upd + n_tup_del`` from ``pg_stat_user_tables``.
+    """
+
+    def __init__(
+        self, file_path: Path, database: str, changed_rows_ratio: float = SCAN_STATE_CHANGED_ROWS_RATIO
+    ) -> None:
+        self.file_path = file_path
+        self.database = database
+        self.changed_rows_ratio = changed_rows_ratio
+        self.fields: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> None:
+        """Read verdicts from the state file. The state of another database or another version is ignored."""
+        self.fields = {}
+        if not self.file_path.exists():
+            return
+
+        try:
+            state = json.loads(self.file_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+
+        if state.get("version") != SCAN_STATE_VERSION or state.get("database") != self.database:
+            return
+
+        self.fields = state.get("fields", {})
+
+    def get_verdict(
+        self, field_info: FieldInfo, rules_hash: str, table_stats: dict[str, int | None] | None
+    ) -> dict[str, Any] | None:
+        """Return the saved verdict of the field if it is still valid."""
+        entry = self.fields.get(field_info.obj_id)
+        if entry is None or entry["type"] != field_info.type or entry["rules_hash"] != rules_hash:
+            return None
+
+        n_tup_mod = (table_stats or {}).get("n_tup_mod")
+        if n_tup_mod is None or entry["n_tup_mod"] is None:
+            return None
+
+        # Counters decrease after the statistics reset, so the writes since the verdict are unknown
+        changed_rows = n_tup_mod - entry["n_tup_mod"]
+        if changed_rows < 0 or changed_rows > self.changed_rows_ratio * ((table_stats or {}).get("n_live_tup") or 0):
+            return None
+
+        return entry
+
+    def set_verdict(
+        self,
+        field_info: FieldInfo,
+        rules_hash: str,
+        table_stats: dict[str, int | None] | None,
+        sensitive: bool,
+    ) -> None:
+        """Save the verdict of the scanned field with the current writes counter of its table."""
+        self.fields[field_info.obj_id] = {
+            "schema": field_info.nspname,
+            "table": field_info.relname,
+            "field": field_info.column_name,
+            "type": field_info.type,
+            "rules_hash": rules_hash,
+            "n_tup_mod": (table_stats or {}).get("n_tup_mod"),
+            "sensitive": sensitive,
+            "rule": field_info.rule if sensitive else None,
+        }
+
+    def retain(self, obj_ids: set[str]) -> None:
+        """Forget verdicts of fields which don't exist anymore or are not checked by data."""
+        self.fields = {obj_id: entry for obj_id, entry in self.fields.items() if obj_id in obj_ids}
+
+    def save(self) -> None:
+        """Write the state file."""
+        state = {"version": SCAN_STATE_VERSION, "database": self.database, "fields": self.fields}
+
+        # A run interrupted while writing must not leave a broken state file
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        tmp_file_path.write_text(json.dumps(state, indent=4, ensure_ascii=False), encoding="utf-8")
+        tmp_file_path.replace(self.file_path)
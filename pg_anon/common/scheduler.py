@@ -0,0 +1,121 @@
+import heapq
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+# Per-row overhead of COPY expressed in bytes, so narrow tables with many rows are not underestimated
+ROW_COST_BYTES = 32
+
+
+def estimate_table_cost(size: int, reltuples: int) -> int:
+    """Estimate the cost of copying a table by its heap size and estimated rows count."""
+    return max(size, 0) + max(reltuples, 0) * ROW_COST_BYTES
+
+
+def simulate_makespan(costs: Sequence[float], workers: int) -> float:
+    """Return the makespan of greedy list scheduling of tasks in the given order.
+
+    Every task is assigned to the worker which becomes free first, the same way as
+    the dump and restore loops hand out connections.
+    """
+    if not costs:
+        return 0.0
+
+    loads = [0.0] * max(workers, 1)
+    for cost in costs:
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+@dataclass
+class TaskSchedule:
+    """Execution order of tasks together with its predicted makespan in cost units."""
+
+    order: list[int]
+    workers: int
+    costs: list[float]
+    predicted_makespan: float
+    in_order_makespan: float
+    started_at: float | None = None
+    busy_seconds: float = 0.0
+    finished_costs: float = 0.0
+    _tasks_started_at: dict[int, float] = field(default_factory=dict)
+
+    @property
+    def total_cost(self) -> float:
+        """Sum of all tasks costs."""
+        return sum(self.costs)
+
+    def task_started(self, idx: int) -> None:
+        """Register the start of the task with the given index."""
+        now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        self._tasks_started_at[idx] = now
+
+    def task_finished(self, idx: int) -> None:
+        """Register the end of the task with the given index."""
+        started_at = self._tasks_started_at.pop(idx, None)
+        if started_at is None:
+            return
+        self.busy_seconds += time.monotonic() - started_at
+        self.finished_costs += self.costs[idx]
+
+    def get_plan_summary(self) -> str:
+        """Describe the planned schedule."""
+        return (
+            f"{len(self.order)} tasks on {self.workers} workers, "
+            f"predicted makespan {self.predicted_makespan:.0f} cost units "
+            f"(lower bound {self._makespan_lower_bound:.0f}, in-order {self.in_order_makespan:.0f})"
+        )
+
+    def get_result_summary(self) -> str:
+        """Describe the actual makespan compared to the predicted one."""
+        if self.started_at is None:
+            return "no tasks were executed"
+
+        actual_seconds = time.monotonic() - self.started_at
+        summary = f"actual makespan {actual_seconds:.2f}s"
+
+        if self.busy_seconds > 0 and self.finished_costs > 0:
+            # Convert the predicted makespan into seconds using the observed throughput
+            seconds_per_cost = self.busy_seconds / self.finished_costs
+            summary += f", predicted makespan {self.predicted_makespan * seconds_per_cost:.2f}s"
+
+        if actual_seconds > 0:
+            utilization = self.busy_seconds * 100 / (actual_seconds * self.workers)
+            summary += f", workers utilization {utilization:.1f}%"
+
+        return summary
+
+    @property
+    def _makespan_lower_bound(self) -> float:
+        if not self.costs:
+            return 0.0
+        return max(self.total_cost / self.workers, max(self.costs))
+
+
+def plan_tasks(costs: Sequence[float], workers: int, largest_first: bool = True) -> TaskSchedule:
+    """Plan the execution order of tasks.
+
+    With ``largest_first`` tasks are ordered by the longest-processing-time-first rule,
+    otherwise the original order is kept and only the makespan is predicted.
+    """
+    workers = max(workers, 1)
+    costs = [float(cost) for cost in costs]
+    in_order_makespan = simulate_makespan(costs, workers)
+
+    if largest_first:
+        order = sorted(range(len(costs)), key=lambda idx: costs[idx], reverse=True)
+        predicted_makespan = simulate_makespan([costs[idx] for idx in order], workers)
+    else:
+        order = list(range(len(costs)))
+        predicted_makespan = in_order_makespan
+
+    return TaskSchedule(
+        order=order,
+        workers=workers,
+        costs=costs,
+        predicted_makespan=predicted_makespan,
+        in_order_makespan=in_order_makespan,
+    )
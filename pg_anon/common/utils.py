@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import argparse
 import ast
+import asyncio
 import concurrent.futures
 import decimal
 import json
+import queue
 import re
 import subprocess
 import sys
 import traceback
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import multiprocessing
     from collections.abc import Callable
 
     from pg_anon.common.dto import FieldInfo, RunOptions
@@ -20,7 +25,13 @@ if TYPE_CHECKING:
 
 import yaml
 
-from pg_anon.common.constants import BASE_TYPE_ALIASES, RUNS_BASE_DIR, SAVED_DICTS_INFO_FILE_NAME, TRACEBACK_LINES_COUNT
+from pg_anon.common.constants import (
+    BASE_TYPE_ALIASES,
+    PG_UTIL_LOG_LINE_LIMIT,
+    RUNS_BASE_DIR,
+    SAVED_DICTS_INFO_FILE_NAME,
+    TRACEBACK_LINES_COUNT,
+)
 from pg_anon.common.errors import ErrorCode, PgAnonError
 from pg_anon.logger import get_logger
 
@@ -45,6 +56,47 @@ def get_pg_util_version(util_name: str) -> str:
     return re.findall(r"(\d+\.\d+)", str(res.stdout))[0]
 
 
+async def run_process_with_logs(
+    command: list[str], on_log_line: Callable[[str], None], env: dict[str, str] | None = None
+) -> int:
+    """Run a process without blocking the event loop and return its exit code.
+
+    Every line of stderr is passed to ``on_log_line`` as soon as the process writes it, stdout is discarded.
+    The process is killed if the awaiting task is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        limit=PG_UTIL_LOG_LINE_LIMIT,
+        env=env,
+    )
+    try:
+        if proc.stderr is not None:
+            async for line in proc.stderr:
+                on_log_line(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+        return await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+
+def discard_queue(task_queue: multiprocessing.Queue, timeout: float) -> None:
+    """Read and drop all items of a multiprocessing queue, so it can be closed without blocking the process exit.
+
+    The feeder thread of a queue flushes its buffer into a pipe and is joined at the process exit,
+    so items which nobody reads would block the exit forever.
+    """
+    while True:
+        try:
+            task_queue.get(timeout=timeout)
+        except queue.Empty:
+            break
+    task_queue.cancel_join_thread()
+
+
 def check_pg_util(ctx: Context, util_name: str, output_util_res: str) -> bool:
     """Check that a PostgreSQL utility exists and matches the expected version."""
     if not Path(util_name).is_file():
@@ -135,43 +187,136 @@ def parse_comma_separated_list(value: str | None = None) -> list[str] | None:
     return list(value.split(","))
 
 
+def parse_non_negative_int(value: str) -> int:
+    """Parse an integer option which can't be negative."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
+
+
+def parse_positive_int(value: str) -> int:
+    """Parse an integer option which must be 1 or greater."""
+    number = parse_non_negative_int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or greater, got {number}")
+    return number
+
+
 def get_dict_rule_for_table(dictionary_rules: list[dict], schema: str, table: str) -> dict | None:
-    """Find matching rules for a table in the prepared dictionary."""
-    result = None
+    """Find matching rules for a table in the prepared dictionary.
 
-    for rule in dictionary_rules:
-        schema_matched = False
-        table_matched = False
-        schema_mask_matched = False
-        table_mask_matched = False
+    For many lookups in the same rules build ``RuleIndex`` once instead.
+    """
+    return RuleIndex(dictionary_rules).find(schema, table)
 
-        if "schema" in rule and schema == rule["schema"]:
-            schema_matched = True
 
-        if "table" in rule and table == rule["table"]:
-            table_matched = True
+@dataclass(frozen=True)
+class _MaskRule:
+    position: int
+    rule: dict
+    schema: str | None
+    schema_mask: re.Pattern | None
+    table: str | None
+    table_mask: re.Pattern | None
+    any_schema: bool
+    any_table: bool
 
-        if schema_matched and table_matched:
-            return rule
+    def matches(self, schema: str, table: str) -> bool:
+        return _name_matches(schema, self.schema, self.schema_mask, self.any_schema) and _name_matches(
+            table, self.table, self.table_mask, self.any_table
+        )
 
-        if "schema_mask" in rule and (
-            rule["schema_mask"] == "*" or re.search(safe_compile(rule["schema_mask"]), schema) is not None
-        ):
-            schema_mask_matched = True
 
-        if "table_mask" in rule and (
-            rule["table_mask"] == "*" or re.search(safe_compile(rule["table_mask"]), table) is not None
-        ):
-            table_mask_matched = True
+def _name_matches(value: str, exact: str | None, mask: re.Pattern | None, any_value: bool) -> bool:
+    return any_value or value == exact or (mask is not None and mask.search(value) is not None)
 
-        if schema_mask_matched and table_matched:
-            result = rule
-        if schema_matched and table_mask_matched:
-            result = rule
-        if schema_mask_matched and table_mask_matched:
-            result = rule
 
-    return result
+def _compile_mask(mask: str | None) -> re.Pattern | None:
+    if mask is None or mask == "*":
+        return None
+    return safe_compile(mask)
+
+
+class RuleIndex:
+    """Find rules of a dictionary for tables, built once per rules list.
+
+    The first rule with the exact schema and table has the highest priority, it is found by a hash lookup.
+    Otherwise, the last rule in the list which matches the table by ``schema_mask`` or ``table_mask`` is used.
+    Masks are compiled once, and mask rules with an exact schema or an exact table are kept in buckets
+    by this name, so a lookup tries only rules which can match. Results of lookups by masks are cached.
+    """
+
+    def __init__(self, dictionary_rules: list[dict]) -> None:
+        self._exact_rules: dict[tuple[str, str], dict] = {}
+        self._schema_buckets: dict[str, list[_MaskRule]] = {}
+        self._table_buckets: dict[str, list[_MaskRule]] = {}
+        self._mask_rules: list[_MaskRule] = []
+        self._cache: dict[tuple[str, str], dict | None] = {}
+
+        for position, rule in enumerate(dictionary_rules):
+            if "schema" in rule and "table" in rule:
+                self._exact_rules.setdefault((rule["schema"], rule["table"]), rule)
+
+            has_schema_mask = "schema_mask" in rule
+            has_table_mask = "table_mask" in rule
+            if not (has_schema_mask or has_table_mask):
+                continue
+
+            # A rule without any condition for the schema or the table never matches
+            if not (has_schema_mask or "schema" in rule) or not (has_table_mask or "table" in rule):
+                continue
+
+            mask_rule = _MaskRule(
+                position=position,
+                rule=rule,
+                schema=rule.get("schema"),
+                schema_mask=_compile_mask(rule.get("schema_mask")),
+                table=rule.get("table"),
+                table_mask=_compile_mask(rule.get("table_mask")),
+                any_schema=rule.get("schema_mask") == "*",
+                any_table=rule.get("table_mask") == "*",
+            )
+
+            if not has_schema_mask:
+                self._schema_buckets.setdefault(rule["schema"], []).append(mask_rule)
+            elif not has_table_mask:
+                self._table_buckets.setdefault(rule["table"], []).append(mask_rule)
+            else:
+                self._mask_rules.append(mask_rule)
+
+    @staticmethod
+    def _find_last(mask_rules: list[_MaskRule], schema: str, table: str) -> _MaskRule | None:
+        for mask_rule in reversed(mask_rules):
+            if mask_rule.matches(schema, table):
+                return mask_rule
+        return None
+
+    def find(self, schema: str, table: str) -> dict | None:
+        """Return the rule for the table or None if no one rule matches it."""
+        key = (schema, table)
+        if (rule := self._exact_rules.get(key)) is not None:
+            return rule
+
+        if key in self._cache:
+            return self._cache[key]
+
+        # There is no rule with the exact schema and table, so any matched rule is matched by a mask
+        found = [
+            mask_rule
+            for mask_rule in (
+                self._find_last(self._schema_buckets.get(schema, []), schema, table),
+                self._find_last(self._table_buckets.get(table, []), schema, table),
+                self._find_last(self._mask_rules, schema, table),
+            )
+            if mask_rule is not None
+        ]
+        result = max(found, key=lambda mask_rule: mask_rule.position).rule if found else None
+        self._cache[key] = result
+        return result
 
 
 def validate_exists_mode(mode: str) -> bool:
@@ -319,16 +464,19 @@ def filter_db_tables(
     if not (white_list_rules or black_list_rules):
         return tables, black_listed_tables, white_listed_tables
 
+    black_list_index = RuleIndex(black_list_rules) if black_list_rules else None
+    white_list_index = RuleIndex(white_list_rules) if white_list_rules else None
+
     for table_data in tables:
         # black list has the highest priority for pg_dump / pg_restore
-        if black_list_rules and get_dict_rule_for_table(black_list_rules, *table_data):
+        if black_list_index and black_list_index.find(*table_data):
             # if table in black list, this table must be filtered out
             black_listed_tables.add(table_data)
             continue
 
         # white list has the second priority for pg_dump / pg_restore
-        if white_list_rules:
-            if get_dict_rule_for_table(white_list_rules, *table_data):
+        if white_list_index:
+            if white_list_index.find(*table_data):
                 # if white list is using and table in white list, this table must not be filtered
                 white_listed_tables.add(table_data)
                 filtered_tables.append(table_data)
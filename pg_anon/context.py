@@ -19,6 +19,7 @@ from pg_anon.common.utils import (
     normalize_data_type,
     read_dict_data_from_file,
     read_yaml,
+    RuleIndex,
     safe_compile,
     split_constants_to_words_and_phrases,
 )
@@ -37,6 +38,7 @@ class Context:
         self.meta_dictionary_obj: dict = {}
         self.prepared_dictionary_obj: dict = {}
         self.prepared_dictionary_contents: dict[str, str] = {}  # for dump process
+        self._rule_indexes: dict[str, tuple[list[dict], RuleIndex]] = {}
         self.metadata: dict | None = None  # for restore process
         self.task_results: dict = {}  # for dump process (key is hash() of SQL query)
         self.total_rows = 0
@@ -202,6 +204,7 @@ class Context:
             "validate_tables": [],
         }
         self.prepared_dictionary_contents = {}
+        self._rule_indexes = {}
         tmp_prepared_dict = {}
 
         for dict_file in self.options.prepared_sens_dict_files:
@@ -237,6 +240,15 @@ class Context:
 
         self.prepared_dictionary_obj["dictionary"].extend(tmp_prepared_dict.values())
 
+    def get_rule_index(self, dictionary_name: str) -> RuleIndex:
+        """Return the index of rules of the prepared dictionary section, built once for all lookups."""
+        dictionary_rules = self.prepared_dictionary_obj.get(dictionary_name, [])
+        cached = self._rule_indexes.get(dictionary_name)
+        if cached is None or cached[0] is not dictionary_rules:
+            cached = (dictionary_rules, RuleIndex(dictionary_rules))
+            self._rule_indexes[dictionary_name] = cached
+        return cached[1]
+
     def read_partial_tables_dicts(self) -> None:
         """Read partial table inclusion and exclusion dictionary files."""
         if self.options.partial_tables_dict_files:
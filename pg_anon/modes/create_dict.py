@@ -1,38 +1,71 @@
 import asyncio
+import hashlib
 import json
+import multiprocessing
 import re
 import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
-from asyncpg import Connection, Pool
+from asyncpg import Connection, Pool, PostgresError
 
-from pg_anon.common.constants import DEFAULT_HASH_FUNC
-from pg_anon.common.db_queries import get_data_from_field_query
+from pg_anon.common.constants import CLASSIFY_IN_WORKER_MIN_VALUES, DEFAULT_HASH_FUNC, STATS_MCV_FULL_COVERAGE
+from pg_anon.common.data_classifier import (
+    CHECK_DATA_FUNC,
+    CheckResult,
+    classify_in_worker,
+    DataClassifier,
+    init_classifier_worker,
+)
+from pg_anon.common.db_queries import get_data_from_table_fields_query, get_field_screening_query
 from pg_anon.common.db_utils import (
     check_required_connections,
     create_connection,
     create_pool,
     exec_data_scan_func_per_field_query,
     exec_data_scan_func_query,
+    get_extensions,
+    get_fields_stats,
     get_scan_fields_list,
+    get_tables_mod_stats,
+    get_tables_size_info,
 )
 from pg_anon.common.dto import FieldInfo
-from pg_anon.common.enums import ScanMode
+from pg_anon.common.enums import ScanMode, ScanSampleMethod
 from pg_anon.common.errors import ErrorCode, PgAnonError
-from pg_anon.common.utils import (
-    get_base_field_type,
-    get_dict_rule_for_table,
-    safe_compile,
-    save_dicts_info_file,
-    setof_to_list,
-)
+from pg_anon.common.matchers import get_posix_regex, RegexMatcher
+from pg_anon.common.scan_state import ScanState
+from pg_anon.common.utils import get_base_field_type, RuleIndex, safe_compile, save_dicts_info_file
 from pg_anon.context import Context
 
 
+@dataclass
+class _CheckStats:
+    calls: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
 class CreateDictMode:
     def __init__(self, context: Context) -> None:
         self.context = context
+        # Server-side screening (--scan-server-filter)
+        self._screening_args: list | None = None
+        self._screening_regexes_count = 0
+        self._client_regex_patterns: list[re.Pattern] = []
+        self._screened_fields: set[str] = set()
+        self._sql_condition_index: RuleIndex | None = None
+        # Incremental scan (--scan-state-file)
+        self._scan_state: ScanState | None = None
+        self._tables_mod_stats: dict[tuple[str, str], dict[str, int | None]] = {}
+        self._common_rules_hash: str | None = None
+        # Calls, hits and time of every check of field data
+        self._checks_stats: dict[str, _CheckStats] = {}
+        # Checks of field data in worker processes (--processes)
+        self._classifier: DataClassifier | None = None
+        self._classify_executor: ProcessPoolExecutor | None = None
 
     def _check_field_match_by_rule(self, field: dict, rule: dict) -> bool:
         schema_matched = False
@@ -106,7 +139,7 @@ class CreateDictMode:
             if self._check_include_fields(field) and self._check_not_skip_fields(field)
         }
 
-    def _scan_fields_by_names(self, fields_info: dict[str, FieldInfo]) -> None:  # noqa: C901, PLR0912
+    def _scan_fields_by_names(self, fields_info: dict[str, FieldInfo]) -> None:  # noqa: C901
         """Scan fields by names and remove matches according to dict rules.
 
         Priorities of rules:
@@ -114,23 +147,27 @@ class CreateDictMode:
             - meta-dict-file
             - prepared-no-sens-dict-file
         """
+        field_constants = set(self.context.meta_dictionary_obj["field"]["constants"])
+        field_rules = self.context.meta_dictionary_obj["field"]["rules"]
+        field_rules_matcher = RegexMatcher(field_rules) if field_rules else None
+
+        # (schema, table) -> field -> the first rule of the no sens dictionary with this field
+        no_sens_fields: dict[tuple[str, str], dict[str, dict]] = {}
+        for rule in self.context.meta_dictionary_obj["no_sens_dictionary"]:
+            table_fields = no_sens_fields.setdefault((rule["schema"], rule["table"]), {})
+            for field_name in rule["fields"]:
+                table_fields.setdefault(field_name, rule)
+
         for obj_id, field_info in fields_info.copy().items():
-            matched: bool = False
             include_rule: dict | None = None
             exclude_rule: dict | None = None
 
             if self.context.prepared_dictionary_obj.get("dictionary"):
-                include_rule = get_dict_rule_for_table(
-                    dictionary_rules=self.context.prepared_dictionary_obj["dictionary"],
-                    schema=field_info.nspname,
-                    table=field_info.relname,
-                )
+                include_rule = self.context.get_rule_index("dictionary").find(field_info.nspname, field_info.relname)
 
             if self.context.prepared_dictionary_obj.get("dictionary_exclude"):
-                exclude_rule = get_dict_rule_for_table(
-                    dictionary_rules=self.context.prepared_dictionary_obj["dictionary_exclude"],
-                    schema=field_info.nspname,
-                    table=field_info.relname,
+                exclude_rule = self.context.get_rule_index("dictionary_exclude").find(
+                    field_info.nspname, field_info.relname
                 )
 
             # include_rule + has field in include_rule => sensitive field
@@ -147,9 +184,9 @@ class CreateDictMode:
                 del fields_info[obj_id]
                 field_info.rule = include_rule["fields"][field_info.column_name]
                 self.context.create_dict_sens_matches[obj_id] = field_info
-                matched = True
+                continue
 
-            elif exclude_rule:
+            if exclude_rule:
                 self.context.logger.debug(
                     '------> Field %s.%s.%s is INSENSITIVE by rule "%s"',
                     field_info.nspname,
@@ -159,158 +196,60 @@ class CreateDictMode:
                 )
                 del fields_info[obj_id]
                 self.context.create_dict_no_sens_matches[obj_id] = field_info
-                matched = True
-
-            if matched:
-                continue
-
-            for rule in self.context.meta_dictionary_obj["field"]["constants"]:
-                if rule == field_info.column_name:
-                    if obj_id in fields_info:
-                        self.context.logger.debug(
-                            '------> Field %s.%s.%s is SENSITIVE by rule "%s"',
-                            field_info.nspname,
-                            field_info.relname,
-                            field_info.column_name,
-                            rule,
-                        )
-                        del fields_info[obj_id]
-                        self.context.create_dict_sens_matches[obj_id] = field_info
-                    matched = True
-                    break
-
-            if matched:
                 continue
 
-            for rule in self.context.meta_dictionary_obj["field"]["rules"]:
-                if re.search(rule, field_info.column_name) is not None:
-                    if obj_id in fields_info:
-                        self.context.logger.debug(
-                            '------> Field %s.%s.%s is SENSITIVE by rule "%s"',
-                            field_info.nspname,
-                            field_info.relname,
-                            field_info.column_name,
-                            rule,
-                        )
-                        del fields_info[obj_id]
-                        self.context.create_dict_sens_matches[obj_id] = field_info
-                    matched = True
-                    break
-
-            if matched:
-                continue
-
-            for rule in self.context.meta_dictionary_obj["no_sens_dictionary"]:
-                if (
-                    rule["schema"] == field_info.nspname
-                    and rule["table"] == field_info.relname
-                    and field_info.column_name in rule["fields"]
-                ):
-                    if obj_id in fields_info:
-                        self.context.logger.debug(
-                            '------> Field %s.%s.%s is INSENSITIVE by rule "%s"',
-                            field_info.nspname,
-                            field_info.relname,
-                            field_info.column_name,
-                            rule,
-                        )
-                        del fields_info[obj_id]
-                        self.context.create_dict_no_sens_matches[obj_id] = field_info
-                    break
-
-    def _check_data_by_constants(self, name: str, dictionary_obj: dict, field_info: FieldInfo, fld_data: list) -> bool:
-        words = dictionary_obj["data_const"]["constants"]["words"]
-        phrases = dictionary_obj["data_const"]["constants"]["phrases"]
-        if not words and not phrases:
-            return False
-
-        self.context.logger.debug(
-            "========> Process[%s]: checking by constants data of field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-
-        for value in fld_data:
-            if value is None:
+            if field_info.column_name in field_constants:
+                self.context.logger.debug(
+                    '------> Field %s.%s.%s is SENSITIVE by rule "%s"',
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    field_info.column_name,
+                )
+                del fields_info[obj_id]
+                self.context.create_dict_sens_matches[obj_id] = field_info
                 continue
 
-            for word in value.split():
-                if len(word) >= (self.context.data_const_constants_min_length or 0) and word.lower() in words:
-                    self.context.logger.debug(
-                        "========> Process[%s]: Field %s.%s.%s is SENSITIVE by constant %s",
-                        name,
-                        field_info.nspname,
-                        field_info.relname,
-                        field_info.column_name,
-                        word,
-                    )
-                    return True
-
-            for phrase in phrases:
-                if phrase in value.lower():
-                    self.context.logger.debug(
-                        "========> Process[%s]: Field %s.%s.%s is SENSITIVE by constant %s",
-                        name,
-                        field_info.nspname,
-                        field_info.relname,
-                        field_info.column_name,
-                        phrase,
-                    )
-                    return True
-
-        self.context.logger.debug(
-            "========> Process[%s]: No one constants matched in data of field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-        return False
-
-    def _check_data_by_partial_constants(
-        self, name: str, dictionary_obj: dict, field_info: FieldInfo, fld_data: list
-    ) -> bool:
-        if not dictionary_obj["data_const"]["partial_constants"]:
-            return False
-
-        self.context.logger.debug(
-            "========> Process[%s]: checking by partial constants data of field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-
-        for value in fld_data:
-            if value is None:
+            if field_rules_matcher is not None and (rule := field_rules_matcher.search(field_info.column_name)):
+                self.context.logger.debug(
+                    '------> Field %s.%s.%s is SENSITIVE by rule "%s"',
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    rule,
+                )
+                del fields_info[obj_id]
+                self.context.create_dict_sens_matches[obj_id] = field_info
                 continue
 
-            lower_value = value.lower()
-            for partial_constant in dictionary_obj["data_const"]["partial_constants"]:
-                if partial_constant in lower_value:
-                    self.context.logger.debug(
-                        "========> Process[%s]: Field %s.%s.%s is SENSITIVE by partial constant %s",
-                        name,
-                        field_info.nspname,
-                        field_info.relname,
-                        field_info.column_name,
-                        partial_constant,
-                    )
-                    return True
+            no_sens_rule = no_sens_fields.get((field_info.nspname, field_info.relname), {}).get(field_info.column_name)
+            if no_sens_rule is not None:
+                self.context.logger.debug(
+                    '------> Field %s.%s.%s is INSENSITIVE by rule "%s"',
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    no_sens_rule,
+                )
+                del fields_info[obj_id]
+                self.context.create_dict_no_sens_matches[obj_id] = field_info
 
-        self.context.logger.debug(
-            "========> Process[%s]: No one partial constants matched in data of field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-        return False
+    @staticmethod
+    def _get_data_func_rules(dictionary_obj: dict, field_info: FieldInfo) -> list[dict]:
+        rules_by_type = dictionary_obj["data_func"].get(field_info.type, [])
+        if not rules_by_type:
+            rules_by_type = dictionary_obj["data_func"].get(get_base_field_type(field_info), [])
+        rules_for_anyelements = dictionary_obj["data_func"].get("anyelement", [])
+        return [*rules_by_type, *rules_for_anyelements]
 
-    async def _check_data_by_functions(  # noqa: C901, PLR0912
-        self, connection: Connection, name: str, dictionary_obj: dict, field_info: FieldInfo, fld_data: list
+    async def _check_data_by_functions(  # noqa: C901
+        self,
+        connection: Connection,
+        name: str,
+        dictionary_obj: dict,
+        field_info: FieldInfo,
+        fld_data: list,
+        data_func_rules: list[dict] | None = None,
     ) -> bool:
         if not dictionary_obj["data_func"]:
             return False
@@ -324,11 +263,8 @@ class CreateDictMode:
             field_info.type,
         )
 
-        rules_by_type = dictionary_obj["data_func"].get(field_info.type, [])
-        if not rules_by_type:
-            rules_by_type = dictionary_obj["data_func"].get(get_base_field_type(field_info), [])
-        rules_for_anyelements = dictionary_obj["data_func"].get("anyelement", [])
-        data_func_rules = [*rules_by_type, *rules_for_anyelements]
+        if data_func_rules is None:
+            data_func_rules = self._get_data_func_rules(dictionary_obj, field_info)
 
         if not data_func_rules:
             self.context.logger.debug(
@@ -367,29 +303,27 @@ class CreateDictMode:
                 return True
 
         for rule in scan_func_rules:
-            matched_count = 0
             rule_expected_matches_count = rule.get("n_count", 1)
 
-            for value in fld_data:
-                if value is None:
-                    continue
-
-                if await exec_data_scan_func_query(
-                    connection=connection, scan_func=rule["scan_func"], value=value, field_info=field_info
-                ):
-                    matched_count += 1
-
-                    if matched_count == rule_expected_matches_count:
-                        field_info.rule = rule["anon_func"]
-                        self.context.logger.debug(
-                            "========> Process[%s]: Field %s.%s.%s is SENSITIVE by data scan func %s",
-                            name,
-                            field_info.nspname,
-                            field_info.relname,
-                            field_info.column_name,
-                            rule["scan_func"],
-                        )
-                        return True
+            # All values are checked by one query, which stops as soon as enough values are matched
+            matched_count = await exec_data_scan_func_query(
+                connection=connection,
+                scan_func=rule["scan_func"],
+                values=fld_data,
+                field_info=field_info,
+                max_matches=rule_expected_matches_count,
+            )
+            if 0 < matched_count == rule_expected_matches_count:
+                field_info.rule = rule["anon_func"]
+                self.context.logger.debug(
+                    "========> Process[%s]: Field %s.%s.%s is SENSITIVE by data scan func %s",
+                    name,
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    rule["scan_func"],
+                )
+                return True
 
         self.context.logger.debug(
             "========> Process[%s]: No one data functions found sensitive data in field %s.%s.%s",
@@ -401,44 +335,6 @@ class CreateDictMode:
 
         return False
 
-    def _check_data_by_regexp(
-        self, name: str, dictionary_obj: dict, create_dict_matches: dict, field_info: FieldInfo, fld_data: list
-    ) -> bool:
-        if field_info.obj_id in create_dict_matches:
-            return False
-
-        self.context.logger.debug(
-            "========> Process[%s]: checking by regexp data of field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-
-        if dictionary_obj["data_regex"]["rules"]:
-            for value in fld_data:
-                for rule in dictionary_obj["data_regex"]["rules"]:
-                    if value is not None and re.search(rule, value) is not None:
-                        self.context.logger.debug(
-                            "========> Process[%s]: Field %s.%s.%s is SENSITIVE by data_regex (regex=%s; value=%s)",
-                            name,
-                            field_info.nspname,
-                            field_info.relname,
-                            field_info.column_name,
-                            rule,
-                            value,
-                        )
-                        return True
-
-        self.context.logger.debug(
-            "========> Process[%s]: No one regexp rules found sensitive data in field %s.%s.%s",
-            name,
-            field_info.nspname,
-            field_info.relname,
-            field_info.column_name,
-        )
-        return False
-
     async def _check_sensitive_data_in_fld(
         self,
         connection: Connection,
@@ -468,40 +364,44 @@ class CreateDictMode:
         )
         result = {field_info.obj_id: field_info}
         matched = False
+        # Constants and regexes with a PostgreSQL equivalent were already checked by the server-side screening
+        screened = field_info.obj_id in self._screened_fields
 
-        if not matched and await self._check_data_by_functions(
-            connection=connection,
-            name=name,
-            dictionary_obj=dictionary_obj,
-            field_info=field_info,
-            fld_data=fld_data,
-        ):
-            matched = True
-
-        if self._check_data_by_constants(
-            name=name,
-            dictionary_obj=dictionary_obj,
-            field_info=field_info,
-            fld_data=fld_data,
+        # Checks are ordered by cost: local checks in memory first, data functions (queries to the database) last
+        for check, matched_rule, seconds in await self._classify_values(
+            fld_data, screened=screened, check_regex=field_info.obj_id not in create_dict_matches
         ):
-            matched = True
+            self._count_check(check, seconds, matched_rule is not None)
+            if matched_rule is not None:
+                self.context.logger.debug(
+                    "========> Process[%s]: Field %s.%s.%s is SENSITIVE by %s (%s)",
+                    name,
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    check,
+                    matched_rule,
+                )
+                matched = True
 
-        if not matched and self._check_data_by_partial_constants(
-            name=name,
-            dictionary_obj=dictionary_obj,
-            field_info=field_info,
-            fld_data=fld_data,
-        ):
-            matched = True
-
-        if not matched and self._check_data_by_regexp(
-            name=name,
-            dictionary_obj=dictionary_obj,
-            create_dict_matches=create_dict_matches,
-            field_info=field_info,
-            fld_data=fld_data,
-        ):
-            matched = True
+        data_func_rules = [] if screened else self._get_data_func_rules(dictionary_obj, field_info)
+        if matched:
+            # The verdict is final, a data function can only change the anonymization function of the field
+            anon_func = self._get_field_anon_func(dictionary_obj, field_info)
+            data_func_rules = [rule for rule in data_func_rules if rule.get("anon_func") != anon_func]
+
+        if data_func_rules:
+            started = time.perf_counter()
+            matched_by_functions = await self._check_data_by_functions(
+                connection=connection,
+                name=name,
+                dictionary_obj=dictionary_obj,
+                field_info=field_info,
+                fld_data=fld_data,
+                data_func_rules=data_func_rules,
+            )
+            self._count_check(CHECK_DATA_FUNC, time.perf_counter() - started, matched_by_functions)
+            matched = matched or matched_by_functions
 
         if matched:
             self.context.logger.debug(
@@ -522,6 +422,29 @@ class CreateDictMode:
         )
         return {}
 
+    def _count_check(self, stage: str, seconds: float, matched: bool) -> None:
+        stats = self._checks_stats.setdefault(stage, _CheckStats())
+        stats.calls += 1
+        stats.hits += matched
+        stats.seconds += seconds
+
+    def get_checks_summary(self) -> dict[str, dict[str, int | float]]:
+        """Return the number of fields checked and found sensitive by every check of data and its total time."""
+        return {
+            stage: {"calls": stats.calls, "hits": stats.hits, "seconds": round(stats.seconds, 3)}
+            for stage, stats in self._checks_stats.items()
+        }
+
+    def _log_checks_summary(self) -> None:
+        for stage, stats in self.get_checks_summary().items():
+            self.context.logger.info(
+                "Check %s: %s fields checked, %s sensitive, %s sec",
+                stage,
+                stats["calls"],
+                stats["hits"],
+                stats["seconds"],
+            )
+
     def _field_can_be_sensitive_by_type(self, dictionary_obj: dict, field_info: FieldInfo) -> bool:
         if field_info.type in dictionary_obj["sens_pg_types"]:
             return True
@@ -529,91 +452,404 @@ class CreateDictMode:
         base_field_type = get_base_field_type(field_info)
         return base_field_type in dictionary_obj["sens_pg_types"]
 
-    async def _scan_obj_func(
+    async def _check_sensitive_data_in_rows(
         self,
+        connection: Connection,
         name: str,
-        pool: Pool,
-        field_info: FieldInfo,
-        scan_mode: ScanMode | None,
         dictionary_obj: dict,
+        fields_info: dict[int, FieldInfo],
+        rows: list,
+    ) -> dict[str, FieldInfo]:
+        """Fan out sampled rows of a table to checks of every field by the column index."""
+        res: dict[str, FieldInfo] = {}
+        for idx, field_info in fields_info.items():
+            fld_data = list(dict.fromkeys(row[idx] for row in rows if row[idx] is not None))
+            res.update(
+                await self._check_sensitive_data_in_fld(
+                    connection=connection,
+                    name=name,
+                    dictionary_obj=dictionary_obj,
+                    create_dict_matches=self.context.create_dict_sens_matches,
+                    field_info=field_info,
+                    fld_data=fld_data,
+                )
+            )
+        return res
+
+    async def _sample_sparse_fields(
+        self,
+        connection: Connection,
+        name: str,
+        fields_info: dict[int, FieldInfo],
+        rows: list,
+        found: dict[str, FieldInfo],
         scan_partial_rows: int,
-    ) -> dict[str, FieldInfo] | None:
-        field_full_name = f"{field_info.nspname}.{field_info.relname}.{field_info.column_name}"
+        condition: str | None,
+        reltuples: int,
+    ) -> dict[str, FieldInfo]:
+        """Sample again fields which got fewer than ``scan_partial_rows`` values from the sample of the table.
+
+        The table sample takes rows where any field is not NULL, so a sparse field of a wide table gets only
+        a small share of it. Such a field is sampled by its own query of rows where it is not NULL. Values of both
+        samples are checked together, so ``n_count`` of data functions is counted over all sampled values.
+        """
+        dictionary_obj = self.context.meta_dictionary_obj
+        res: dict[str, FieldInfo] = {}
+        for idx, field_info in fields_info.items():
+            if field_info.obj_id in found:
+                continue
 
-        self.context.logger.debug(
-            "====>>> Process[%s]: Started scan task for field %s (%s)", name, field_full_name, field_info
+            sampled_values = [row[idx] for row in rows if row[idx] is not None]
+            if len(sampled_values) >= scan_partial_rows:
+                continue
+
+            query = get_data_from_table_fields_query(
+                fields_info=[field_info],
+                limit=scan_partial_rows,
+                condition=condition,
+                sample_method=self.context.options.scan_sample_method,
+                reltuples=reltuples,
+            )
+            field_rows = await connection.fetch(query)
+            fld_data = list(dict.fromkeys([*sampled_values, *(row[0] for row in field_rows if row[0] is not None)]))
+            if not fld_data:
+                continue
+
+            res.update(
+                await self._check_sensitive_data_in_fld(
+                    connection=connection,
+                    name=name,
+                    dictionary_obj=dictionary_obj,
+                    create_dict_matches=self.context.create_dict_sens_matches,
+                    field_info=field_info,
+                    fld_data=fld_data,
+                )
+            )
+        return res
+
+    def _prepare_server_screening(self) -> None:
+        """Translate data_const and data_regex rules into parameters of the server-side screening query.
+
+        Regexes without an exact PostgreSQL equivalent are left for the check on the client side.
+        """
+        dictionary_obj = self.context.meta_dictionary_obj
+        words = sorted(dictionary_obj["data_const"]["constants"]["words"])
+        substrings = {
+            *dictionary_obj["data_const"]["constants"]["phrases"],
+            *dictionary_obj["data_const"]["partial_constants"],
+        }
+
+        posix_regexes: list[str] = []
+        posix_case_insensitive_regexes: list[str] = []
+        client_patterns: list[re.Pattern] = []
+        for pattern in dictionary_obj["data_regex"]["rules"]:
+            posix_regex = get_posix_regex(pattern)
+            if posix_regex is None:
+                client_patterns.append(pattern)
+            elif posix_regex.startswith("(?i)"):
+                posix_case_insensitive_regexes.append(posix_regex.removeprefix("(?i)"))
+            else:
+                posix_regexes.append(posix_regex)
+
+        # Regexes are joined, because PostgreSQL caches only a few compiled regexes
+        regexes = []
+        if posix_regexes:
+            regexes.append("|".join(f"(?:{regex})" for regex in posix_regexes))
+        if posix_case_insensitive_regexes:
+            regexes.append("(?i)" + "|".join(f"(?:{regex})" for regex in posix_case_insensitive_regexes))
+
+        self._screening_args = []
+        if words:
+            self._screening_args.append(words)
+        if substrings:
+            like_patterns = (re.sub(r"([\\%_])", r"\\\1", substring) for substring in substrings)
+            self._screening_args.append(sorted(f"%{like_pattern}%" for like_pattern in like_patterns))
+        self._screening_args.extend(regexes)
+        self._screening_regexes_count = len(regexes)
+        self._client_regex_patterns = client_patterns
+
+        self.context.logger.info(
+            "Server-side screening: %s words, %s phrases and partial constants, %s of %s regexes",
+            len(words),
+            len(substrings),
+            len(posix_regexes) + len(posix_case_insensitive_regexes),
+            len(dictionary_obj["data_regex"]["rules"]),
         )
+        if client_patterns:
+            self.context.logger.info(
+                "Regexes checked on the client side: %s", ", ".join(pattern.pattern for pattern in client_patterns)
+            )
 
-        start_t = time.time()
-        if not self._field_can_be_sensitive_by_type(dictionary_obj, field_info):
-            self.context.logger.debug(
-                "Process[%s]: Field %s is INSENSITIVE by type %s", name, field_full_name, field_info.type
+    async def _screen_fields_on_server(
+        self, connection: Connection, name: str, fields_info: list[FieldInfo], condition: str | None
+    ) -> tuple[dict[str, FieldInfo], list[FieldInfo]]:
+        """Check data of fields by constants and regexes in PostgreSQL, without transferring it to the client.
+
+        Return the fields found sensitive and the fields which still must be checked on the client side.
+        """
+        dictionary_obj = self.context.meta_dictionary_obj
+        sensitive_fields: dict[str, FieldInfo] = {}
+        client_fields: list[FieldInfo] = []
+
+        for field_info in fields_info:
+            # Data functions have priority and define the anonymization rule, so they are checked on the client side
+            if not self._screening_args or self._get_data_func_rules(dictionary_obj, field_info):
+                client_fields.append(field_info)
+                continue
+
+            query = get_field_screening_query(
+                field_info=field_info,
+                condition=condition,
+                check_words=bool(dictionary_obj["data_const"]["constants"]["words"]),
+                check_substrings=bool(
+                    dictionary_obj["data_const"]["constants"]["phrases"]
+                    or dictionary_obj["data_const"]["partial_constants"]
+                ),
+                regexes_count=self._screening_regexes_count,
             )
+            try:
+                found = await connection.fetchval(query, *self._screening_args)
+            except PostgresError as ex:
+                self.context.logger.warning(
+                    "Process[%s]: Server-side screening of field %s.%s.%s failed, it will be checked on the client side: %s",
+                    name,
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    ex,
+                )
+                client_fields.append(field_info)
+                continue
+
+            if found:
+                self.context.logger.debug(
+                    "========> Process[%s]: Field %s.%s.%s is SENSITIVE by server-side screening",
+                    name,
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                )
+                sensitive_fields[field_info.obj_id] = field_info
+            elif self._client_regex_patterns:
+                self._screened_fields.add(field_info.obj_id)
+                client_fields.append(field_info)
+
+        return sensitive_fields, client_fields
+
+    def _get_sql_condition(self, schema: str, table: str) -> str | None:
+        data_sql_condition = self.context.meta_dictionary_obj.get("data_sql_condition")
+        if not data_sql_condition:
             return None
 
+        if self._sql_condition_index is None:
+            self._sql_condition_index = RuleIndex(data_sql_condition)
+
+        rule = self._sql_condition_index.find(schema, table)
+        return rule.get("sql_condition") if rule else None
+
+    async def _scan_table_func(  # noqa: C901
+        self,
+        name: str,
+        pool: Pool,
+        fields_info: list[FieldInfo],
+        scan_mode: ScanMode | None,
+        scan_partial_rows: int,
+        reltuples: int = 0,
+    ) -> dict[str, FieldInfo]:
+        dictionary_obj = self.context.meta_dictionary_obj
+        table_full_name = f"{fields_info[0].nspname}.{fields_info[0].relname}"
+
+        self.context.logger.debug(
+            "====>>> Process[%s]: Started scan task for table %s (%s fields)", name, table_full_name, len(fields_info)
+        )
+
+        start_t = time.time()
         res: dict[str, FieldInfo] = {}
-        condition = None
-        if self.context.meta_dictionary_obj.get("data_sql_condition"):
-            rule = get_dict_rule_for_table(
-                dictionary_rules=self.context.meta_dictionary_obj["data_sql_condition"],
-                schema=field_info.nspname,
-                table=field_info.relname,
-            )
-            if rule:
-                condition = rule.get("sql_condition")
+        condition = self._get_sql_condition(fields_info[0].nspname, fields_info[0].relname)
 
+        pending_fields = dict(enumerate(fields_info))
         try:
             async with pool.acquire() as db_conn:
                 if scan_mode == ScanMode.PARTIAL:
-                    query = get_data_from_field_query(
-                        field_info=field_info, limit=scan_partial_rows, condition=condition
+                    query = get_data_from_table_fields_query(
+                        fields_info=fields_info,
+                        limit=scan_partial_rows,
+                        condition=condition,
+                        sample_method=self.context.options.scan_sample_method,
+                        reltuples=reltuples,
                     )
-                    fld_data = await db_conn.fetch(query)
-                    res = await self._check_sensitive_data_in_fld(
+                    rows = await db_conn.fetch(query)
+                    res = await self._check_sensitive_data_in_rows(
                         connection=db_conn,
                         name=name,
                         dictionary_obj=dictionary_obj,
-                        create_dict_matches=self.context.create_dict_sens_matches,
-                        field_info=field_info,
-                        fld_data=setof_to_list(fld_data),
+                        fields_info=pending_fields,
+                        rows=rows,
                     )
-                elif scan_mode == ScanMode.FULL:
-                    async with db_conn.transaction(isolation="repeatable_read", readonly=True):
-                        query = get_data_from_field_query(field_info=field_info, condition=condition)
-                        cursor = await db_conn.cursor(query)
-                        next_rows = True
-                        while next_rows:
-                            fld_data = await cursor.fetch(scan_partial_rows)
-                            res = await self._check_sensitive_data_in_fld(
+                    # Fewer rows than the limit mean that all rows with values of any field were read
+                    if len(rows) >= scan_partial_rows:
+                        res.update(
+                            await self._sample_sparse_fields(
                                 connection=db_conn,
                                 name=name,
-                                dictionary_obj=dictionary_obj,
-                                create_dict_matches=self.context.create_dict_sens_matches,
-                                field_info=field_info,
-                                fld_data=setof_to_list(fld_data),
+                                fields_info=pending_fields,
+                                rows=rows,
+                                found=res,
+                                scan_partial_rows=scan_partial_rows,
+                                condition=condition,
+                                reltuples=reltuples,
                             )
-                            if len(fld_data) == 0 or len(res) > 0:
-                                break
+                        )
+                elif scan_mode == ScanMode.FULL:
+                    if self.context.options.scan_server_filter:
+                        res, fields_info = await self._screen_fields_on_server(
+                            connection=db_conn, name=name, fields_info=fields_info, condition=condition
+                        )
+                        pending_fields = dict(enumerate(fields_info))
+
+                    if pending_fields:
+                        async with db_conn.transaction(isolation="repeatable_read", readonly=True):
+                            query = get_data_from_table_fields_query(fields_info=fields_info, condition=condition)
+                            cursor = await db_conn.cursor(query)
+                            while pending_fields:
+                                rows = await cursor.fetch(scan_partial_rows)
+                                if not rows:
+                                    break
+
+                                res.update(
+                                    await self._check_sensitive_data_in_rows(
+                                        connection=db_conn,
+                                        name=name,
+                                        dictionary_obj=dictionary_obj,
+                                        fields_info=pending_fields,
+                                        rows=rows,
+                                    )
+                                )
+                                # Sensitive fields are not checked in the next chunks
+                                pending_fields = {
+                                    idx: field_info
+                                    for idx, field_info in pending_fields.items()
+                                    if field_info.obj_id not in res
+                                }
 
         except Exception as ex:
-            field = f"{field_full_name} (type={field_info.type})"
-            self.context.logger.exception("Exception in scan_obj_func:\n%s", field)
-            raise PgAnonError(ErrorCode.SCAN_FIELD_ERROR, f"Can't execute task for field {field}. Error: {ex}") from ex
+            self.context.logger.exception("Exception in scan_table_func:\n%s", table_full_name)
+            raise PgAnonError(
+                ErrorCode.SCAN_FIELD_ERROR, f"Can't execute task for table {table_full_name}. Error: {ex}"
+            ) from ex
 
         end_t = time.time()
         if end_t - start_t > 10:  # noqa: PLR2004
             self.context.logger.debug(
-                "Process[%s]: scan_obj_func took %s sec. Task %s", name, round(end_t - start_t, 2), field_info
+                "Process[%s]: scan_table_func took %s sec. Table %s", name, round(end_t - start_t, 2), table_full_name
             )
 
         self.context.logger.debug(
-            "<<<<==== Process[%s]: Found %s items(s) Finished task %s ", name, len(res), field_info
+            "<<<<==== Process[%s]: Found %s items(s) Finished task for table %s ", name, len(res), table_full_name
         )
         return res
 
+    def _group_fields_by_tables(self, fields_info_list: list[FieldInfo]) -> list[list[FieldInfo]]:
+        """Group fields which can be sensitive by type into tables, so each table is sampled once."""
+        tables: dict[str, list[FieldInfo]] = {}
+        for field_info in fields_info_list:
+            if not self._field_can_be_sensitive_by_type(self.context.meta_dictionary_obj, field_info):
+                self.context.logger.debug(
+                    "Field %s.%s.%s is INSENSITIVE by type %s",
+                    field_info.nspname,
+                    field_info.relname,
+                    field_info.column_name,
+                    field_info.type,
+                )
+                continue
+            tables.setdefault(field_info.tbl_id, []).append(field_info)
+
+        return list(tables.values())
+
+    async def _prescan_fields_by_stats(
+        self, fields_info_list: list[FieldInfo]
+    ) -> tuple[dict[str, FieldInfo], set[str]]:
+        """Check most common values and histogram bounds from pg_stats before reading tables.
+
+        Return the fields found sensitive and ``obj_id`` of all fields which don't need to be scanned.
+        In ``--scan-mode=partial`` a field is also decided as insensitive if its most common values cover all rows,
+        because a sample of the table can't contain other values.
+        """
+        dictionary_obj = self.context.meta_dictionary_obj
+        candidates = [
+            field_info
+            for field_info in fields_info_list
+            if self._field_can_be_sensitive_by_type(dictionary_obj, field_info)
+            # Statistics are collected for the whole table and can't be filtered by the condition
+            and not self._get_sql_condition(field_info.nspname, field_info.relname)
+        ]
+
+        sensitive_fields: dict[str, FieldInfo] = {}
+        decided_fields: set[str] = set()
+        if not candidates:
+            return sensitive_fields, decided_fields
+
+        connection = await create_connection(
+            self.context.connection_params, server_settings=self.context.server_settings
+        )
+        try:
+            fields_stats = await get_fields_stats(connection, candidates)
+            for field_info in candidates:
+                stats = fields_stats.get(field_info.obj_id)
+                if not stats:
+                    continue
+
+                values = list(dict.fromkeys([*(stats["most_common_vals"] or []), *(stats["histogram_bounds"] or [])]))
+                if not values:
+                    continue
+
+                # If there is no histogram, ANALYZE saw every distinct value often enough to put it into the list
+                all_values_known = stats["histogram_bounds"] is None and sum(
+                    stats["most_common_freqs"] or []
+                ) >= STATS_MCV_FULL_COVERAGE * (1 - stats["null_frac"])
+
+                res = await self._check_sensitive_data_in_fld(
+                    connection=connection,
+                    name="stats",
+                    dictionary_obj=dictionary_obj,
+                    create_dict_matches=self.context.create_dict_sens_matches,
+                    field_info=field_info,
+                    fld_data=values,
+                )
+                if res:
+                    # Data functions define the anonymization rule, so a match by other rules is final only
+                    # if the functions were checked on all values or the field has no data functions
+                    if field_info.rule or all_values_known or not self._get_data_func_rules(dictionary_obj, field_info):
+                        sensitive_fields.update(res)
+                        decided_fields.add(field_info.obj_id)
+                elif all_values_known and self.context.options.scan_mode == ScanMode.PARTIAL:
+                    self.context.logger.debug(
+                        "Field %s.%s.%s is INSENSITIVE by most common values (n_distinct = %s)",
+                        field_info.nspname,
+                        field_info.relname,
+                        field_info.column_name,
+                        stats["n_distinct"],
+                    )
+                    decided_fields.add(field_info.obj_id)
+        finally:
+            await connection.close()
+
+        self.context.logger.info(
+            "Decided %s of %s fields by pg_stats (%s sensitive)",
+            len(decided_fields),
+            len(candidates),
+            len(sensitive_fields),
+        )
+        return sensitive_fields, decided_fields
+
     async def _run_scan_tasks(self, fields_info_list: list[FieldInfo]) -> list:  # noqa: C901
         self.context.logger.info("Using %s concurrent connections", self.context.options.db_connections_per_process)
 
+        tables_fields = self._group_fields_by_tables(fields_info_list)
+        self.context.logger.info(
+            "Scanning %s fields in %s tables", sum(len(fields) for fields in tables_fields), len(tables_fields)
+        )
+
         pool = await create_pool(
             connection_params=self.context.connection_params,
             server_settings=self.context.server_settings,
@@ -623,16 +859,27 @@ class CreateDictMode:
 
         results: list = []
         tasks: set[asyncio.Task] = set()
+        tables_size_info: dict[tuple[str, str], dict[str, int]] = {}
 
         status_ratio = 10
-        if len(fields_info_list) > 1000:
+        if len(tables_fields) > 1000:
             status_ratio = 100
-        if len(fields_info_list) > 50000:
+        if len(tables_fields) > 50000:
             status_ratio = 1000
 
         try:
-            fields_count = len(fields_info_list)
-            for idx, field_info in enumerate(fields_info_list):
+            if self.context.options.scan_mode == ScanMode.PARTIAL and self.context.options.scan_sample_method in (
+                ScanSampleMethod.SYSTEM,
+                ScanSampleMethod.BERNOULLI,
+            ):
+                # The sample percentage is calculated from the estimated rows count of a table
+                async with pool.acquire() as connection:
+                    tables_size_info = await get_tables_size_info(
+                        connection, [(fields[0].nspname, fields[0].relname) for fields in tables_fields]
+                    )
+
+            tables_count = len(tables_fields)
+            for idx, table_fields in enumerate(tables_fields):
                 while len(tasks) >= self.context.options.db_connections_per_process:
                     done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
                     for done_task in done:
@@ -645,19 +892,21 @@ class CreateDictMode:
                             results.append(r)
 
                 task = asyncio.create_task(
-                    self._scan_obj_func(
+                    self._scan_table_func(
                         "main",
                         pool,
-                        field_info,
+                        table_fields,
                         self.context.options.scan_mode,
-                        self.context.meta_dictionary_obj,
                         self.context.options.scan_partial_rows,
+                        tables_size_info.get((table_fields[0].nspname, table_fields[0].relname), {}).get(
+                            "reltuples", 0
+                        ),
                     )
                 )
                 tasks.add(task)
 
                 if idx % status_ratio == 0:
-                    progress_percents = round(float(idx) * 100 / fields_count, 2)
+                    progress_percents = round(float(idx) * 100 / tables_count, 2)
                     self.context.logger.info("Progress %s%%", progress_percents)
 
             while tasks:
@@ -675,19 +924,23 @@ class CreateDictMode:
 
         return results
 
+    @staticmethod
+    def _get_field_anon_func(meta_dictionary_obj: dict, field_info: FieldInfo) -> str:
+        """Return the anonymization function of a sensitive field, before the field name is substituted."""
+        if field_info.rule is not None:
+            return field_info.rule
+
+        base_field_type = get_base_field_type(field_info)
+        if field_info.type in meta_dictionary_obj["funcs"]:
+            return meta_dictionary_obj["funcs"][field_info.type]
+        if base_field_type in meta_dictionary_obj["funcs"]:
+            return meta_dictionary_obj["funcs"][base_field_type]
+        return meta_dictionary_obj["funcs"].get("default", DEFAULT_HASH_FUNC)
+
     def _prepare_sens_dict_rule(
         self, meta_dictionary_obj: dict, field_info: FieldInfo, prepared_sens_dict_rules: dict
     ) -> dict:
-        hash_func = field_info.rule
-
-        if hash_func is None:
-            base_field_type = get_base_field_type(field_info)
-            if field_info.type in meta_dictionary_obj["funcs"]:
-                hash_func = meta_dictionary_obj["funcs"][field_info.type]
-            elif base_field_type in meta_dictionary_obj["funcs"]:
-                hash_func = meta_dictionary_obj["funcs"][base_field_type]
-            else:
-                hash_func = meta_dictionary_obj["funcs"].get("default", DEFAULT_HASH_FUNC)
+        hash_func = self._get_field_anon_func(meta_dictionary_obj, field_info)
 
         if hash_func.find("%s") != -1:
             hash_func = hash_func % field_info.column_name
@@ -713,7 +966,165 @@ class CreateDictMode:
             prepared_no_sens_dict_rules[field_info.tbl_id]["fields"].append(field_info.column_name)
         return prepared_no_sens_dict_rules
 
-    async def _create_dict(self) -> None:  # noqa: C901, PLR0912
+    def _get_field_rules_hash(self, field_info: FieldInfo) -> str:
+        """Hash the rules and scan options which define the verdict of the field checked by data."""
+        dictionary_obj = self.context.meta_dictionary_obj
+        if self._common_rules_hash is None:
+            common_rules = {
+                "words": sorted(dictionary_obj["data_const"]["constants"]["words"]),
+                "phrases": sorted(dictionary_obj["data_const"]["constants"]["phrases"]),
+                "partial_constants": sorted(dictionary_obj["data_const"]["partial_constants"]),
+                "data_regex": [pattern.pattern for pattern in dictionary_obj["data_regex"]["rules"]],
+                "sens_pg_types": sorted(set(dictionary_obj["sens_pg_types"])),
+                "scan_mode": self.context.options.scan_mode.value if self.context.options.scan_mode else None,
+                "scan_partial_rows": self.context.options.scan_partial_rows,
+                "scan_sample_method": self.context.options.scan_sample_method.value,
+            }
+            self._common_rules_hash = hashlib.sha256(json.dumps(common_rules).encode()).hexdigest()
+
+        field_rules = {
+            "common": self._common_rules_hash,
+            "data_func": self._get_data_func_rules(dictionary_obj, field_info),
+            "sql_condition": self._get_sql_condition(field_info.nspname, field_info.relname),
+        }
+        return hashlib.sha256(json.dumps(field_rules, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def _reuse_scan_state(
+        self, fields_info_list: list[FieldInfo]
+    ) -> tuple[dict[str, FieldInfo], list[FieldInfo]]:
+        """Reuse verdicts of the previous runs from the scan state file.
+
+        Return the fields which are sensitive by the saved verdicts and the fields which must be scanned.
+        """
+        self._scan_state = ScanState(
+            file_path=Path(self.context.options.scan_state_file or ""),
+            database=self.context.connection_params.database,
+        )
+        self._scan_state.load()
+
+        connection = await create_connection(
+            self.context.connection_params, server_settings=self.context.server_settings
+        )
+        try:
+            self._tables_mod_stats = await get_tables_mod_stats(
+                connection, sorted({(field_info.nspname, field_info.relname) for field_info in fields_info_list})
+            )
+        finally:
+            await connection.close()
+
+        sensitive_fields: dict[str, FieldInfo] = {}
+        scan_fields: list[FieldInfo] = []
+        for field_info in fields_info_list:
+            verdict = self._scan_state.get_verdict(
+                field_info=field_info,
+                rules_hash=self._get_field_rules_hash(field_info),
+                table_stats=self._tables_mod_stats.get((field_info.nspname, field_info.relname)),
+            )
+            if verdict is None:
+                scan_fields.append(field_info)
+            elif verdict["sensitive"]:
+                field_info.rule = verdict["rule"]
+                sensitive_fields[field_info.obj_id] = field_info
+
+        self.context.logger.info(
+            "Reused verdicts of %s of %s fields from the scan state file (%s sensitive), %s fields will be scanned",
+            len(fields_info_list) - len(scan_fields),
+            len(fields_info_list),
+            len(sensitive_fields),
+            len(scan_fields),
+        )
+        return sensitive_fields, scan_fields
+
+    def _save_scan_state(
+        self, fields_info_list: list[FieldInfo], scanned_fields: list[FieldInfo], sensitive_obj_ids: set[str]
+    ) -> None:
+        """Save verdicts of the scanned fields, reused verdicts keep the writes counter of the scan which made them."""
+        if self._scan_state is None:
+            return
+
+        for field_info in scanned_fields:
+            self._scan_state.set_verdict(
+                field_info=field_info,
+                rules_hash=self._get_field_rules_hash(field_info),
+                table_stats=self._tables_mod_stats.get((field_info.nspname, field_info.relname)),
+                sensitive=field_info.obj_id in sensitive_obj_ids,
+            )
+        self._scan_state.retain({field_info.obj_id for field_info in fields_info_list})
+        self._scan_state.save()
+
+    def _get_classifier(self) -> DataClassifier:
+        if self._classifier is None:
+            dictionary_obj = self.context.meta_dictionary_obj
+            self._classifier = DataClassifier(
+                words=dictionary_obj["data_const"]["constants"]["words"],
+                phrases=dictionary_obj["data_const"]["constants"]["phrases"],
+                partial_constants=dictionary_obj["data_const"]["partial_constants"],
+                regexes=dictionary_obj["data_regex"]["rules"],
+                client_regexes=self._client_regex_patterns,
+            )
+        return self._classifier
+
+    def _start_classify_workers(self) -> None:
+        """Start worker processes for checks of field data, so the event loop only reads data from the database."""
+        if self.context.options.processes <= 1:
+            return
+
+        self.context.logger.info("Using %s processes for checks of field data", self.context.options.processes)
+        self._classify_executor = ProcessPoolExecutor(
+            max_workers=self.context.options.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_classifier_worker,
+            initargs=(self._get_classifier(),),
+        )
+
+    def _stop_classify_workers(self) -> None:
+        if self._classify_executor is not None:
+            self._classify_executor.shutdown(cancel_futures=True)
+            self._classify_executor = None
+
+    async def _classify_values(self, fld_data: list, screened: bool, check_regex: bool) -> list[CheckResult]:
+        # Small batches are checked faster than they are sent to a worker process
+        if self._classify_executor is None or len(fld_data) < CLASSIFY_IN_WORKER_MIN_VALUES:
+            return self._get_classifier().classify(fld_data, screened=screened, check_regex=check_regex)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._classify_executor, classify_in_worker, fld_data, screened, check_regex)
+
+    async def _scan_fields_by_data(self, fields_info_list: list[FieldInfo]) -> list[dict[str, FieldInfo]]:
+        """Check data of the fields which were not classified by names, return the sensitive fields."""
+        if self.context.options.scan_server_filter and self.context.options.scan_mode == ScanMode.FULL:
+            self._prepare_server_screening()
+
+        scan_fields = fields_info_list
+        scan_results: list[dict[str, FieldInfo]] = []
+        if self.context.options.scan_state_file:
+            state_results, scan_fields = await self._reuse_scan_state(scan_fields)
+            if state_results:
+                scan_results.append(state_results)
+        # Verdicts of these fields are saved after the scan, reused verdicts are kept as is
+        fields_to_scan = scan_fields
+
+        self._start_classify_workers()
+        try:
+            if self.context.options.scan_use_stats:
+                stats_results, decided_fields = await self._prescan_fields_by_stats(scan_fields)
+                if stats_results:
+                    scan_results.append(stats_results)
+                scan_fields = [field_info for field_info in scan_fields if field_info.obj_id not in decided_fields]
+
+            scan_results.extend(await self._run_scan_tasks(scan_fields))
+        finally:
+            self._stop_classify_workers()
+
+        self._save_scan_state(
+            fields_info_list=fields_info_list,
+            scanned_fields=fields_to_scan,
+            sensitive_obj_ids={obj_id for res in scan_results for obj_id in res},
+        )
+        self._log_checks_summary()
+        return scan_results
+
+    async def _create_dict(self) -> None:
         fields_info: dict[str, FieldInfo] = await self._get_fields_for_scan()
         if not fields_info:
             raise PgAnonError(ErrorCode.NO_OBJECTS_FOR_SCAN, "No objects for scan!")
@@ -727,7 +1138,7 @@ class CreateDictMode:
         need_prepare_no_sens_dict: bool = bool(self.context.options.output_no_sens_dict_file)
 
         if fields_info:
-            scan_results = await self._run_scan_tasks(list(fields_info.values()))
+            scan_results = await self._scan_fields_by_data(list(fields_info.values()))
 
             # Fill results based on scan tasks
             for res in scan_results:
@@ -814,6 +1225,28 @@ class CreateDictMode:
         finally:
             await connection.close()
 
+    async def _check_sample_method(self) -> None:
+        if (
+            self.context.options.scan_mode != ScanMode.PARTIAL
+            or self.context.options.scan_sample_method != ScanSampleMethod.SYSTEM_ROWS
+        ):
+            return
+
+        connection = await create_connection(
+            self.context.connection_params, server_settings=self.context.server_settings
+        )
+        try:
+            extensions = await get_extensions(connection)
+        finally:
+            await connection.close()
+
+        if not any(extension["name"] == "tsm_system_rows" for extension in extensions):
+            raise PgAnonError(
+                ErrorCode.EXTENSION_ERROR,
+                'Extension "tsm_system_rows" is required by --scan-sample-method=system_rows. '
+                'Run "CREATE EXTENSION tsm_system_rows" in the source database or use another sample method',
+            )
+
     async def run(self) -> None:
         """Run the create_dict mode to scan and build the sensitive data dictionary."""
         self.context.logger.info("-------------> Started create_dict mode")
@@ -821,6 +1254,7 @@ class CreateDictMode:
         try:
             self._save_input_dicts_to_run_dir()
             await self._check_available_connections()
+            await self._check_sample_method()
 
             self.context.read_meta_dict()
             if self.context.options.prepared_sens_dict_files:
@@ -1,18 +1,33 @@
 import asyncio
-import gzip
 import hashlib
+import math
+import multiprocessing
 import os
+import queue
 import re
 import shlex
 import shutil
-import subprocess
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 from asyncpg import Connection, Pool
 
+from pg_anon.common.compression import Compression, parse_compression
+from pg_anon.common.constants import (
+    COPY_OUTPUT_BUFFER_SIZE,
+    DUMP_JOURNAL_FILE_NAME,
+    DUMP_JOURNAL_VERSION,
+    DUMP_WORKER_POLL_TIMEOUT,
+    DUMP_WORKER_TASK_FAILED,
+    DUMP_WORKER_TASK_FINISHED,
+    DUMP_WORKER_TASK_PROGRESS,
+    DUMP_WORKER_TASK_STARTED,
+    SAVED_PROGRESS_FILE_NAME,
+)
 from pg_anon.common.db_queries import get_relation_size_query, get_sequences_query
 from pg_anon.common.db_utils import (
     check_required_connections,
@@ -37,14 +52,28 @@ from pg_anon.common.db_utils import (
     get_partition_ancestors_map,
     get_partitioned_ancestors,
     get_schemas,
+    get_tables_size_info,
     get_views_related_to_tables,
 )
-from pg_anon.common.dto import Metadata
+from pg_anon.common.dto import Metadata, RunOptions
 from pg_anon.common.enums import AnonMode
 from pg_anon.common.errors import ErrorCode, PgAnonError
-from pg_anon.common.utils import get_dict_rule_for_table, get_pg_util_version, safe_compile, save_dicts_info_file
+from pg_anon.common.journal import Journal
+from pg_anon.common.progress import TransferProgress
+from pg_anon.common.scheduler import estimate_table_cost, plan_tasks, TaskSchedule
+from pg_anon.common.utils import (
+    discard_queue,
+    get_major_version,
+    get_pg_util_version,
+    run_process_with_logs,
+    safe_compile,
+    save_dicts_info_file,
+)
 from pg_anon.context import Context
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class DumpMode:
     def __init__(self, context: Context) -> None:
@@ -55,8 +84,17 @@ class DumpMode:
 
         self._data_dump_queries: list[str] = []
         self._data_dump_files: dict[str, dict[str, Any]] = {}
-        self._data_dump_tasks_results: dict[str, int] = {}
-
+        self._data_dump_tasks_results: dict[str, str] = {}
+        self._data_dump_copy_bytes: dict[str, int] = {}
+        self._compression_executor: ThreadPoolExecutor | None = None
+        self._compression: Compression = parse_compression(self.context.options.compression)
+
+        self._data_dump_costs: list[float] = []
+        self._data_dump_sizes: list[int] = []
+        self._progress: TransferProgress | None = None
+        self._on_copy_progress: Callable[[str, int], None] | None = None
+        self._tables_size_info: dict[tuple[str, str], dict[str, int]] = {}
+        self._dump_in_chunks: bool = False
         self._total_tables_size: int = 0
         self._total_rows: int = 0
 
@@ -88,6 +126,11 @@ class DumpMode:
         self.metadata_file_path = self.output_dir / self.metadata_file_name
         self.dumped_tables_file_path = self.output_dir / self.dumped_tables_file_name
 
+        self._journal = Journal(self.output_dir / DUMP_JOURNAL_FILE_NAME)
+        self._dump_sessions: int = 1
+        self._resumed_files_count: int = 0
+        self._verified_journal_files: set[str] = set()
+
         self._need_dump_pre_and_post_sections = self.context.options.mode in (AnonMode.SYNC_STRUCT_DUMP, AnonMode.DUMP)
         self._need_dump_data = self.context.options.mode in (AnonMode.SYNC_DATA_DUMP, AnonMode.DUMP)
         self._skip_pre_data_dump = (
@@ -108,7 +151,7 @@ class DumpMode:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        if self.output_dir_is_empty:
+        if self._load_dump_journal() or self.output_dir_is_empty:
             return
         if not self.context.options.clear_output_dir:
             msg = f"Output directory {self.output_dir} is not empty!"
@@ -120,7 +163,10 @@ class DumpMode:
         expected_file_extensions = {
             ".sql",
             ".gz",
+            ".zst",
+            ".lz4",
             ".json",
+            ".jsonl",
             ".backup",
             ".bin",
             ".py",
@@ -141,18 +187,207 @@ class DumpMode:
         """Check whether the output directory is empty."""
         return not any(self.output_dir.iterdir())
 
+    @property
+    def _journal_enabled(self) -> bool:
+        return self._need_dump_data and not (
+            self.context.options.dbg_stage_1_validate_dict
+            or self.context.options.dbg_stage_2_validate_data
+            or self.context.options.dbg_stage_3_validate_full
+        )
+
+    def _get_dictionary_content_hash(self) -> dict[str, str]:
+        return {
+            dictionary_file_name: hashlib.sha256(dictionary_content.encode("utf-8")).hexdigest()
+            for dictionary_file_name, dictionary_content in self.context.prepared_dictionary_contents.items()
+        }
+
+    def _get_journal_header(self) -> dict[str, Any]:
+        return {
+            "version": DUMP_JOURNAL_VERSION,
+            "mode": self.context.options.mode.value,
+            "dictionary_content_hash": self._get_dictionary_content_hash(),
+            "compression": self._compression.to_dict(),
+            "dump_chunk_size": self.context.options.dump_chunk_size,
+            "sessions": self._dump_sessions,
+        }
+
+    def _load_dump_journal(self) -> bool:
+        """Load the journal of the interrupted dump for --resume. Returns False if there is nothing to resume."""
+        if not self.context.options.resume or not self._journal_enabled:
+            return False
+
+        self._journal.load()
+        if self._journal.header is None:
+            self.context.logger.warning("No dump journal found in %s, nothing to resume", self.output_dir)
+            return False
+
+        expected_header = self._get_journal_header()
+        for key in ("version", "mode", "dictionary_content_hash", "compression", "dump_chunk_size"):
+            if self._journal.header.get(key) != expected_header[key]:
+                msg = f'Can\'t resume dump in {self.output_dir}: "{key}" differs from the interrupted dump'
+                self.context.logger.error(msg)
+                raise PgAnonError(ErrorCode.DUMP_JOURNAL_MISMATCH, msg)
+
+        self._dump_sessions = self._journal.header.get("sessions", 1) + 1
+        return True
+
+    def _is_journal_entry_valid(self, entry: dict[str, Any], query: str) -> bool:
+        file_path = self.output_dir / entry["file"]
+        return (
+            entry.get("query_hash") == hashlib.sha256(query.encode()).hexdigest()
+            and file_path.is_file()
+            and file_path.stat().st_size == entry.get("size")
+            and entry["file"] in self._verified_journal_files
+        )
+
+    def _get_data_file_checksum(self, file_path: Path) -> str:
+        checksum = hashlib.sha256()
+        with self._compression.open_reader(file_path) as reader:
+            while data := reader.read(COPY_OUTPUT_BUFFER_SIZE):
+                checksum.update(data)
+        return checksum.hexdigest()
+
+    async def _verify_dump_journal_files(self) -> None:
+        """Check the SHA-256 of the COPY data of data files recorded in the journal of the interrupted dump.
+
+        Files are decompressed in threads before the dump snapshot is taken. Corrupted files are dumped again.
+        """
+        entries = [
+            entry
+            for entry in self._journal.entries
+            if entry.get("checksum") and (self.output_dir / entry["file"]).is_file()
+        ]
+        if not entries:
+            return
+
+        checksums = await asyncio.gather(
+            *(asyncio.to_thread(self._get_data_file_checksum, self.output_dir / entry["file"]) for entry in entries),
+            return_exceptions=True,
+        )
+        for entry, checksum in zip(entries, checksums, strict=True):
+            if checksum == entry["checksum"]:
+                self._verified_journal_files.add(entry["file"])
+            else:
+                self.context.logger.warning(
+                    "Data file %s from the dump journal is corrupted, its table will be dumped again", entry["file"]
+                )
+
+    def _apply_dump_journal(self) -> list[int]:
+        """Keep data files completed by previous dump sessions and return indexes of dump queries left to run.
+
+        A table is taken from the journal only if all of its files are there, so each table still
+        comes from a single snapshot. Files of other tables are removed and dumped again.
+        """
+        query_tasks = list(zip(self._data_dump_files, self._data_dump_queries, strict=True))
+        if not self._journal_enabled:
+            return list(range(len(query_tasks)))
+
+        journal_entries = {entry["file"]: entry for entry in self._journal.entries}
+        completed_tables: dict[tuple[str, str], bool] = {}
+        for file_name, query in query_tasks:
+            file = self._data_dump_files[file_name]
+            table = (file["schema"], file["table"])
+            entry = journal_entries.get(file_name)
+            completed_tables[table] = (
+                completed_tables.get(table, True) and entry is not None and self._is_journal_entry_valid(entry, query)
+            )
+
+        retained_entries = []
+        pending_tasks = []
+        for task_idx, (file_name, _) in enumerate(query_tasks):
+            file = self._data_dump_files[file_name]
+            if completed_tables[(file["schema"], file["table"])]:
+                entry = journal_entries.pop(file_name)
+                retained_entries.append(entry)
+                self._data_dump_tasks_results[entry["query_hash"]] = entry["rows"]
+                if "copy_bytes" in entry:
+                    self._data_dump_copy_bytes[entry["query_hash"]] = entry["copy_bytes"]
+            else:
+                pending_tasks.append(task_idx)
+
+        for entry in journal_entries.values():
+            (self.output_dir / entry["file"]).unlink(missing_ok=True)
+
+        self._resumed_files_count = len(retained_entries)
+        self._journal.start(self._get_journal_header(), retained_entries)
+
+        if self.context.options.resume:
+            self.context.logger.info(
+                "Resuming dump (session %s): %s data files are taken from the dump journal, %s left to dump",
+                self._dump_sessions,
+                len(retained_entries),
+                len(pending_tasks),
+            )
+
+        return pending_tasks
+
+    def _register_dump_result(self, file_name: str, result: dict[str, Any], results: dict[str, str]) -> None:
+        results[result["query_hash"]] = result["rows"]
+        self._data_dump_copy_bytes[result["query_hash"]] = result["copy_bytes"]
+
+        file_path = self.output_dir / file_name
+        file_size = file_path.stat().st_size if file_path.exists() else 0
+        if self._progress is not None:
+            self._progress.task_finished(file_name, rows=int(result["rows"]), file_bytes=file_size)
+
+        if not self._journal_enabled:
+            return
+
+        self._journal.append(
+            {
+                "file": file_name,
+                "query_hash": result["query_hash"],
+                "rows": result["rows"],
+                "size": file_size,
+                "copy_bytes": result["copy_bytes"],
+                "checksum": result["checksum"],
+            }
+        )
+
+    def _get_consistency_info(self) -> dict[str, Any] | None:
+        if not self._journal_enabled:
+            return None
+
+        if not self._resumed_files_count:
+            return {
+                "single_snapshot": True,
+                "dump_sessions": self._dump_sessions,
+                "resumed_files": 0,
+                "note": "All data files are dumped from a single snapshot",
+            }
+
+        return {
+            "single_snapshot": False,
+            "dump_sessions": self._dump_sessions,
+            "resumed_files": self._resumed_files_count,
+            "note": (
+                "Data files are dumped in several sessions under different snapshots. "
+                "Each table is consistent on its own, but changes made between the sessions "
+                "may break invariants between tables, e.g. foreign keys. "
+                "Sequences values, pre-data and post-data reflect the last session"
+            ),
+        }
+
     async def _count_totals(self, connection: Connection) -> None:
+        counted_tables: set[tuple[str, str]] = set()
         for query, file_key in zip(self._data_dump_queries, self._data_dump_files, strict=True):
             file = self._data_dump_files[file_key]
 
             result_key = hashlib.sha256(query.encode()).hexdigest()
             file.update({"rows": self._data_dump_tasks_results[result_key]})
+            if result_key in self._data_dump_copy_bytes:
+                file["copy_bytes"] = self._data_dump_copy_bytes[result_key]
+            self._total_rows += int(file["rows"])
+
+            # Chunked tables have several files, but the relation size must be counted once
+            if (file["schema"], file["table"]) in counted_tables:
+                continue
+            counted_tables.add((file["schema"], file["table"]))
 
             schema = file["schema"].replace("'", "''")
             table = file["table"].replace("'", "''")
 
             self._total_tables_size += await connection.fetchval(get_relation_size_query(schema=schema, table=table))
-            self._total_rows += int(file["rows"])
 
     async def _prepare_sequences_last_values(self, connection: Connection) -> None:
         self._sequences_last_values = {}
@@ -250,11 +485,7 @@ class DumpMode:
         self.metadata.pg_version = self.context.pg_version
         self.metadata.pg_dump_version = get_pg_util_version(self.context.pg_dump)
 
-        self.metadata.dictionary_content_hash = {}
-        for dictionary_file_name, dictionary_content in self.context.prepared_dictionary_contents.items():
-            self.metadata.dictionary_content_hash[dictionary_file_name] = hashlib.sha256(
-                dictionary_content.encode("utf-8")
-            ).hexdigest()
+        self.metadata.dictionary_content_hash = self._get_dictionary_content_hash()
 
         self.metadata.prepared_sens_dict_files = ",".join(self.context.options.prepared_sens_dict_files or [])
 
@@ -265,6 +496,8 @@ class DumpMode:
 
         if self.context.options.mode != AnonMode.SYNC_STRUCT_DUMP:
             self.metadata.files = self._data_dump_files
+            self.metadata.compression = self._compression.to_dict()
+            self.metadata.consistency = self._get_consistency_info()
             self.metadata.sequences_last_values = self._sequences_last_values
             self.metadata.views = self._views
             self.metadata.indexes = self._indexes
@@ -286,7 +519,7 @@ class DumpMode:
         if self._need_dump_data:
             self.metadata.save_dumped_tables_into_file(self.dumped_tables_file_path)
 
-    async def _run_pg_dump(self, section: str) -> None:
+    async def _run_pg_dump(self, section: str, snapshot_id: str | None = None) -> None:
         specific_tables: list[str] = []
 
         if self.context.black_listed_tables:
@@ -347,58 +580,77 @@ class DumpMode:
         if self.context.options.pg_dump_options:
             command.extend(shlex.split(self.context.options.pg_dump_options))
 
+        # The schema is dumped under the snapshot of the data dump, so all sections are consistent
+        if snapshot_id:
+            command.extend(["--snapshot", snapshot_id])
+
         command.append(self.context.options.db_name)
         self.context.logger.debug(str(command))
-        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        # pg_dump put command result into stdout if not using "-f" option, else stdout is empty
-        # pg_dump put logs into stderr
-        _, pg_dump_logs_bytes = proc.communicate()
-        pg_dump_logs = pg_dump_logs_bytes.decode("utf-8", errors="replace")
-
-        for log_line in pg_dump_logs.split("\n"):
-            self.context.logger.info(log_line)
+        # pg_dump put logs into stderr, they are logged while pg_dump is running
+        return_code = await run_process_with_logs(command, self.context.logger.info)
 
-        if proc.returncode != 0:
+        if return_code != 0:
             msg = "ERROR: database schema dump has failed!"
             self.context.logger.error(msg)
             raise PgAnonError(ErrorCode.DUMP_FAILED, msg)
 
-    async def _dump_data_into_file(self, db_conn: Connection, query: str, file_name: str | Path) -> str:
+    async def _dump_data_into_file(
+        self, db_conn: Connection, query: str, file_name: str | Path
+    ) -> tuple[str, str | None, int]:
+        """Stream COPY output of the query straight into a compressed file.
+
+        COPY chunks are buffered and handed to the compression executor, so the compressed file
+        is the only file written and no raw binary copy of the table ever lands on disk.
+        Returns the COPY status, the SHA-256 and the size of the uncompressed COPY data.
+        """
         try:
             if self.context.options.dbg_stage_1_validate_dict:
-                return await db_conn.execute(query)
+                return await db_conn.execute(query), None, 0
 
-            return await db_conn.copy_from_query(
-                query=query,
-                output=file_name,
-                format="binary",
-            )
+            return await self._copy_into_compressed_file(db_conn=db_conn, query=query, file_path=Path(file_name))
         except Exception:
             self.context.logger.exception("Exception in _dump_data_into_file")
             raise
 
-    async def compress_file(self, file_path: Path, remove_origin_file_after_compress: bool = True) -> None:
-        """Compress the specified file asynchronously."""
-        await asyncio.to_thread(
-            self._compress_file,
-            file_path,
-            remove_origin_file_after_compress=remove_origin_file_after_compress,
-        )
-
-    def _compress_file(self, file_path: Path, remove_origin_file_after_compress: bool = True) -> None:
-        gzipped_file_path = file_path.with_name(file_path.name + ".gz")
+    async def _copy_into_compressed_file(
+        self, db_conn: Connection, query: str, file_path: Path
+    ) -> tuple[str, str, int]:
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        compressed_file = self._compression.open_writer(file_path)
+        checksum = hashlib.sha256()
+        copy_bytes = 0
+
+        def _write(data: bytes) -> None:
+            checksum.update(data)
+            compressed_file.write(data)
+
+        async def _flush() -> None:
+            nonlocal copy_bytes
+            data = bytes(buffer)
+            buffer.clear()
+            copy_bytes += len(data)
+            if self._on_copy_progress is not None:
+                self._on_copy_progress(file_path.name, len(data))
+            await loop.run_in_executor(self._compression_executor, _write, data)
+
+        async def _write_chunk(chunk: bytes) -> None:
+            buffer.extend(chunk)
+            if len(buffer) >= COPY_OUTPUT_BUFFER_SIZE:
+                await _flush()
 
-        self.context.logger.debug("Start compressing file: %s", file_path)
-        with (
-            file_path.open("rb") as f_in,
-            gzip.open(gzipped_file_path, "wb", compresslevel=1) as f_out,
-        ):
-            shutil.copyfileobj(f_in, f_out, length=1024 * 1024)
-        self.context.logger.debug("Compressing has done. Output file: %s", gzipped_file_path)
+        try:
+            result = await db_conn.copy_from_query(query=query, output=_write_chunk, format="binary")
+            if buffer:
+                await _flush()
+        except BaseException:
+            await loop.run_in_executor(self._compression_executor, compressed_file.close)
+            file_path.unlink(missing_ok=True)
+            raise
 
-        if remove_origin_file_after_compress:
-            self.context.logger.debug("Removing origin file: %s", file_path)
-            file_path.unlink()
+        await loop.run_in_executor(self._compression_executor, compressed_file.close)
+        self.context.logger.debug("Compressed file written: %s", file_path)
+        return result, checksum.hexdigest(), copy_bytes
 
     async def _dump_data_by_query(
         self,
@@ -406,15 +658,15 @@ class DumpMode:
         query: str,
         transaction_snapshot_id: str,
         file_name: str,
-    ) -> tuple[dict[str, str], Path]:
-        binary_output_file_path = self.output_dir / Path(file_name).stem
+    ) -> dict[str, Any]:
+        output_file_path = self.output_dir / file_name
 
         task_id = uuid.uuid4()
         self.context.logger.info(
             "================> Task [%s] Started task %s to file %s",
             task_id,
             query,
-            binary_output_file_path,
+            output_file_path,
         )
 
         try:
@@ -424,10 +676,10 @@ class DumpMode:
                 async with db_conn.transaction(isolation="repeatable_read", readonly=True):
                     await db_conn.execute(f"SET TRANSACTION SNAPSHOT '{transaction_snapshot_id}';")
                     self.context.logger.debug("Task [%s] Transaction opened. Starting dump query", task_id)
-                    result = await self._dump_data_into_file(
+                    result, checksum, copy_bytes = await self._dump_data_into_file(
                         db_conn=db_conn,
                         query=query,
-                        file_name=binary_output_file_path,
+                        file_name=output_file_path,
                     )
                     self.context.logger.debug(
                         "Task [%s] Transaction setup to snapshot %s", task_id, transaction_snapshot_id
@@ -442,43 +694,105 @@ class DumpMode:
 
         self.context.logger.info("<================ Task [%s] Finished task %s", task_id, query)
 
-        result_hash = hashlib.sha256(query.encode()).hexdigest()
-        return {result_hash: count_rows}, binary_output_file_path
-
-    async def _compress_with_semaphore(self, file_path: Path, semaphore: asyncio.Semaphore) -> None:
-        try:
-            async with semaphore:
-                await self.compress_file(file_path)
-        except Exception as exc:
-            self.context.logger.exception("Can't compress file: %s", file_path)
-            raise PgAnonError(ErrorCode.DUMP_FAILED, f"Can't compress file: {file_path}") from exc
+        return {
+            "query_hash": hashlib.sha256(query.encode()).hexdigest(),
+            "rows": count_rows,
+            "checksum": checksum,
+            "copy_bytes": copy_bytes,
+        }
 
     def _resolve_table_rule(self, table_schema: str, table_name: str) -> dict | None:
-        dictionary_rules = self.context.prepared_dictionary_obj["dictionary"]
+        rule_index = self.context.get_rule_index("dictionary")
 
-        own_rule = get_dict_rule_for_table(
-            dictionary_rules=dictionary_rules,
-            schema=table_schema,
-            table=table_name,
-        )
+        own_rule = rule_index.find(table_schema, table_name)
         if own_rule is not None:
             return own_rule
 
         for ancestor_schema, ancestor_table in self._partition_ancestors_map.get((table_schema, table_name), []):
-            ancestor_rule = get_dict_rule_for_table(
-                dictionary_rules=dictionary_rules,
-                schema=ancestor_schema,
-                table=ancestor_table,
-            )
+            ancestor_rule = rule_index.find(ancestor_schema, ancestor_table)
             if ancestor_rule is not None:
                 return ancestor_rule
 
         return None
 
-    async def _prepare_dump_queries(self) -> None:
+    @property
+    def _chunked_dump_enabled(self) -> bool:
+        return self.context.options.dump_chunk_size > 0 and not (
+            self.context.options.dbg_stage_1_validate_dict
+            or self.context.options.dbg_stage_2_validate_data
+            or self.context.options.dbg_stage_3_validate_full
+        )
+
+    def _get_table_chunks(self, table_schema: str, table_name: str, table_rule: dict | None) -> list[dict | None]:
+        """Split the table into heap pages ranges, each of them is dumped by a separate task.
+
+        Returns ``[None]`` if the table must be dumped by a single query.
+        """
+        if not self._dump_in_chunks or (table_rule and "raw_sql" in table_rule):
+            return [None]
+
+        table_size_info = self._tables_size_info.get((table_schema, table_name))
+        chunk_size = self.context.options.dump_chunk_size * 1024 * 1024
+        if not table_size_info or not table_size_info["pages"] or table_size_info["size"] <= chunk_size:
+            return [None]
+
+        pages = table_size_info["pages"]
+        pages_per_chunk = max(1, math.ceil(pages * chunk_size / table_size_info["size"]))
+        chunks_count = math.ceil(pages / pages_per_chunk)
+        if chunks_count < 2:  # noqa: PLR2004
+            return [None]
+
+        chunks: list[dict | None] = []
+        for idx in range(chunks_count):
+            start_page = idx * pages_per_chunk
+            # The last chunk is open-ended to cover pages added after the size was measured
+            end_page = start_page + pages_per_chunk if idx < chunks_count - 1 else None
+            chunks.append({"index": idx, "count": chunks_count, "start_page": start_page, "end_page": end_page})
+
+        return chunks
+
+    @staticmethod
+    def _get_chunk_share(table_size_info: dict[str, int], chunk: dict | None) -> float:
+        if chunk is None or not table_size_info["pages"]:
+            return 1.0
+
+        end_page = chunk["end_page"] if chunk["end_page"] is not None else table_size_info["pages"]
+        return max(end_page - chunk["start_page"], 0) / table_size_info["pages"]
+
+    def _get_dump_cost(self, table_schema: str, table_name: str, chunk: dict | None) -> float:
+        table_size_info = self._tables_size_info.get((table_schema, table_name))
+        if not table_size_info:
+            return 0
+
+        cost = estimate_table_cost(table_size_info["size"], table_size_info["reltuples"])
+        return cost * self._get_chunk_share(table_size_info, chunk)
+
+    def _get_dump_size(self, table_schema: str, table_name: str, chunk: dict | None) -> int:
+        """Estimate the size of COPY data of the table or its chunk by the relation size."""
+        table_size_info = self._tables_size_info.get((table_schema, table_name))
+        if not table_size_info:
+            return 0
+        return int(table_size_info["size"] * self._get_chunk_share(table_size_info, chunk))
+
+    async def _prepare_tables_size_info(self, connection: Connection) -> None:
+        self._tables_size_info = await get_tables_size_info(connection, self.context.tables)
+
+        self._dump_in_chunks = self._chunked_dump_enabled
+        if self._dump_in_chunks and int(get_major_version(self.context.pg_version)) < 14:  # noqa: PLR2004
+            self.context.logger.warning(
+                "Option --dump-chunk-size is ignored: TID range scans require PostgreSQL 14+, source is %s",
+                self.context.pg_version,
+            )
+            self._dump_in_chunks = False
+
+    async def _prepare_dump_queries(self, connection: Connection) -> None:
         self._data_dump_queries = []
+        self._data_dump_costs = []
+        self._data_dump_sizes = []
         self._data_dump_files = {}
 
+        await self._prepare_tables_size_info(connection)
+
         fields_cache = await get_all_fields_list(
             connection_params=self.context.connection_params,
             exclude_schemas=self.context.exclude_schemas,
@@ -494,25 +808,211 @@ class DumpMode:
         for table_schema, table_name in self.context.tables:
             table_rule = self._resolve_table_rule(table_schema, table_name)
 
-            query = await get_dump_query(
-                ctx=self.context,
-                table_schema=table_schema,
-                table_name=table_name,
-                table_rule=table_rule,
-                files=self._data_dump_files,
-                fields_cache=fields_cache,
-                legacy_inherits_parents=legacy_inherits_parents,
-            )
+            for chunk in self._get_table_chunks(table_schema, table_name, table_rule):
+                query = await get_dump_query(
+                    ctx=self.context,
+                    table_schema=table_schema,
+                    table_name=table_name,
+                    table_rule=table_rule,
+                    files=self._data_dump_files,
+                    fields_cache=fields_cache,
+                    legacy_inherits_parents=legacy_inherits_parents,
+                    chunk=chunk,
+                    file_extension=self._compression.extension,
+                )
+
+                if not query:
+                    break
 
-            if query:
                 self.context.logger.info(str(query))
                 self._data_dump_queries.append(query)
+                self._data_dump_costs.append(self._get_dump_cost(table_schema, table_name, chunk))
+                self._data_dump_sizes.append(self._get_dump_size(table_schema, table_name, chunk))
+
+    @property
+    def _dump_connections_count(self) -> int:
+        if self.context.options.processes > 1:
+            return self.context.options.processes * self.context.options.db_connections_per_process
+        return self.context.options.db_connections_per_process
+
+    @property
+    def _schema_dump_connections_count(self) -> int:
+        # pg_dump of pre-data and post-data sections run at the same time with the data dump
+        return int(not self._skip_pre_data_dump) + int(not self._skip_post_data_dump)
+
+    def _start_progress(self, pending_tasks: list[int]) -> None:
+        self._progress = TransferProgress(
+            operation="dump",
+            file_path=Path(self.context.options.run_dir) / SAVED_PROGRESS_FILE_NAME,
+            logger=self.context.logger,
+        )
+        file_names = list(self._data_dump_files)
+        for task_idx in pending_tasks:
+            file_name = file_names[task_idx]
+            file = self._data_dump_files[file_name]
+            self._progress.add_task(file_name, file["schema"], file["table"], self._data_dump_sizes[task_idx])
+        self._on_copy_progress = self._progress.bytes_transferred
+
+    async def _run_dump_processes(  # noqa: C901
+        self,
+        query_tasks: list[tuple[str, str]],
+        transaction_snapshot_id: str,
+        schedule: TaskSchedule,
+    ) -> dict:
+        """Dump data by worker processes pulling tasks from the shared queue.
+
+        Tasks are put into the queue in the schedule order, so the largest tables are still taken first.
+        """
+        mp_context = multiprocessing.get_context("spawn")
+        task_queue = mp_context.Queue()
+        result_queue = mp_context.Queue()
+
+        for task_idx in schedule.order:
+            file_name, query = query_tasks[task_idx]
+            task_queue.put((task_idx, file_name, query))
+        # One stop marker for each task consumer of each worker
+        for _ in range(self._dump_connections_count):
+            task_queue.put(None)
+
+        workers = [
+            mp_context.Process(
+                name=f"pg_anon_dump_worker_{worker_idx}",
+                target=run_dump_worker,
+                args=(
+                    self.context.options,
+                    self.context.pg_version,
+                    self.output_dir,
+                    transaction_snapshot_id,
+                    task_queue,
+                    result_queue,
+                ),
+                daemon=True,
+            )
+            for worker_idx in range(self.context.options.processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        loop = asyncio.get_running_loop()
+        results: dict[str, str] = {}
+        finished_tasks_count = 0
+        succeeded = False
+
+        try:
+            while finished_tasks_count < len(query_tasks):
+                try:
+                    message = await loop.run_in_executor(
+                        None, partial(result_queue.get, timeout=DUMP_WORKER_POLL_TIMEOUT)
+                    )
+                except queue.Empty:
+                    if any(worker.exitcode not in (None, 0) for worker in workers):
+                        raise PgAnonError(
+                            ErrorCode.DUMP_FAILED, "Dump worker process terminated unexpectedly"
+                        ) from None
+                    continue
+
+                status, task_idx, payload = message
+                if status == DUMP_WORKER_TASK_FAILED:
+                    raise payload
+
+                if status == DUMP_WORKER_TASK_PROGRESS:
+                    if self._progress is not None:
+                        self._progress.bytes_transferred(*payload)
+                    continue
+
+                if status == DUMP_WORKER_TASK_STARTED:
+                    schedule.task_started(task_idx)
+                    if self._progress is not None:
+                        self._progress.task_started(query_tasks[task_idx][0])
+                    continue
+
+                schedule.task_finished(task_idx)
+                self._register_dump_result(query_tasks[task_idx][0], payload, results)
+                finished_tasks_count += 1
+
+            succeeded = True
+        finally:
+            if not succeeded:
+                # Tasks left in the queue are dropped before workers are terminated, a killed worker
+                # may hold the lock of the queue
+                await loop.run_in_executor(None, discard_queue, task_queue, DUMP_WORKER_POLL_TIMEOUT)
+            for worker in workers:
+                if not succeeded and worker.is_alive():
+                    worker.terminate()
+                await loop.run_in_executor(None, worker.join)
+            task_queue.close()
+            result_queue.close()
+
+        return results
+
+    async def run_worker(
+        self,
+        task_queue: multiprocessing.Queue,
+        result_queue: multiprocessing.Queue,
+        transaction_snapshot_id: str,
+    ) -> None:
+        """Dump data of tasks from the queue inside a worker process and report results back."""
+        connections_count = self.context.options.db_connections_per_process
+        pool = await create_pool(
+            connection_params=self.context.connection_params,
+            server_settings=self.context.server_settings,
+            min_size=connections_count,
+            max_size=connections_count,
+        )
+        # Every connection of the process writes its own file, so each one gets a compression thread
+        self._compression_executor = ThreadPoolExecutor(
+            max_workers=connections_count, thread_name_prefix="pg_anon_compress"
+        )
+        loop = asyncio.get_running_loop()
+
+        def _send_copy_progress(file_name: str, size: int) -> None:
+            result_queue.put((DUMP_WORKER_TASK_PROGRESS, None, (file_name, size)))
+
+        self._on_copy_progress = _send_copy_progress
+
+        async def _get_task() -> tuple[int, str, str] | None:
+            # Wait with a timeout, so the thread of a cancelled consumer does not stay blocked on an empty queue
+            while True:
+                try:
+                    return await loop.run_in_executor(None, partial(task_queue.get, timeout=DUMP_WORKER_POLL_TIMEOUT))
+                except queue.Empty:
+                    continue
+
+        async def _consume_tasks() -> None:
+            while True:
+                task = await _get_task()
+                if task is None:
+                    return
+
+                task_idx, file_name, query = task
+                result_queue.put((DUMP_WORKER_TASK_STARTED, task_idx, None))
+                result = await self._dump_data_by_query(
+                    pool=pool,
+                    query=query,
+                    transaction_snapshot_id=transaction_snapshot_id,
+                    file_name=file_name,
+                )
+                result_queue.put((DUMP_WORKER_TASK_FINISHED, task_idx, result))
+
+        consumers = [asyncio.create_task(_consume_tasks()) for _ in range(connections_count)]
+        try:
+            done, _pending = await asyncio.wait(consumers, return_when=asyncio.FIRST_EXCEPTION)
+            for done_task in done:
+                done_task.result()
+        finally:
+            # Other consumers must not take new tables after a failure, their COPYs are stopped before the pool closes
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            await pool.close()
+            self._compression_executor.shutdown(wait=True)
+            self._compression_executor = None
 
     async def _run_dump_tasks(  # noqa: C901
         self,
         query_tasks: list[tuple[str, str]],
         transaction_snapshot_id: str,
-        compression_semaphore: asyncio.Semaphore,
+        schedule: TaskSchedule,
     ) -> dict:
         pool = await create_pool(
             connection_params=self.context.connection_params,
@@ -521,25 +1021,24 @@ class DumpMode:
             max_size=self.context.options.db_connections_per_process,
         )
 
+        # Every connection writes its own file, so each one gets a compression thread
+        self._compression_executor = ThreadPoolExecutor(
+            max_workers=self.context.options.db_connections_per_process, thread_name_prefix="pg_anon_compress"
+        )
+
         results: dict[str, str] = {}
         dump_tasks: set[asyncio.Task] = set()
-        compress_tasks: set[asyncio.Task] = set()
-
-        status_ratio = 10
-        if len(query_tasks) > 1000:  # noqa: PLR2004
-            status_ratio = 100
-        if len(query_tasks) > 50000:  # noqa: PLR2004
-            status_ratio = 1000
+        dump_tasks_indexes: dict[asyncio.Task, int] = {}
 
         def _collect_dump_result(done_task: asyncio.Task) -> None:
-            result_dict, file_path = done_task.result()
-            results.update(result_dict)
-            if not self.context.options.dbg_stage_1_validate_dict:
-                compress_tasks.add(asyncio.create_task(self._compress_with_semaphore(file_path, compression_semaphore)))
+            task_idx = dump_tasks_indexes.pop(done_task)
+            schedule.task_finished(task_idx)
+            self._register_dump_result(query_tasks[task_idx][0], done_task.result(), results)
 
         try:
             query_tasks_count = len(query_tasks)
-            for idx, (file_name, query) in enumerate(query_tasks):
+            for idx, task_idx in enumerate(schedule.order):
+                file_name, query = query_tasks[task_idx]
                 while len(dump_tasks) >= self.context.options.db_connections_per_process:
                     done, dump_tasks = await asyncio.wait(dump_tasks, return_when=asyncio.FIRST_COMPLETED)
                     for done_task in done:
@@ -559,6 +1058,10 @@ class DumpMode:
                     )
                 )
                 dump_tasks.add(task)
+                dump_tasks_indexes[task] = task_idx
+                schedule.task_started(task_idx)
+                if self._progress is not None:
+                    self._progress.task_started(file_name)
 
                 self.context.logger.debug(
                     "New task added. Current dump tasks: %s / %s",
@@ -566,10 +1069,6 @@ class DumpMode:
                     self.context.options.db_connections_per_process,
                 )
 
-                if idx % status_ratio == 0:
-                    progress_percents = round(float(idx) * 100 / query_tasks_count, 2)
-                    self.context.logger.info("Progress %s%%", progress_percents)
-
             # Wait remaining dump tasks
             while dump_tasks:
                 done, dump_tasks = await asyncio.wait(dump_tasks, return_when=asyncio.FIRST_COMPLETED)
@@ -579,15 +1078,14 @@ class DumpMode:
                             t.cancel()
                         raise exc
                     _collect_dump_result(done_task)
-
-            # Wait remaining compress tasks
-            if compress_tasks:
-                done, _ = await asyncio.wait(compress_tasks)
-                for done_task in done:
-                    if exc := done_task.exception():
-                        raise exc
         finally:
+            # Tasks left after a failure or cancellation are stopped before the pool is closed
+            for dump_task in dump_tasks:
+                dump_task.cancel()
+            await asyncio.gather(*dump_tasks, return_exceptions=True)
             await pool.close()
+            self._compression_executor.shutdown(wait=True)
+            self._compression_executor = None
 
         return results
 
@@ -598,42 +1096,69 @@ class DumpMode:
 
         self.context.logger.info("-------------> Started dump data")
 
+        schema_task: asyncio.Task | None = None
         try:
             async with connection.transaction(isolation="repeatable_read", readonly=True):
                 transaction_snapshot_id = await connection.fetchval("select pg_export_snapshot()")
 
+                # pg_dump of the schema runs at the same time with the data dump, under the same snapshot
+                schema_task = asyncio.create_task(self._dump_schema(transaction_snapshot_id))
+
                 # Preparing dump queries
-                await self._prepare_dump_queries()
+                await self._prepare_dump_queries(connection)
                 if not self._data_dump_queries:
                     raise PgAnonError(ErrorCode.NO_OBJECTS_FOR_DUMP, "No objects for dump!")
 
                 self.context.logger.info(
-                    "Using %s concurrent connections",
+                    "Using %s processes with %s concurrent connections each, compression: %s",
+                    self.context.options.processes,
                     self.context.options.db_connections_per_process,
+                    self._compression,
                 )
 
-                compression_semaphore = asyncio.Semaphore(self.context.options.processes)
+                pending_tasks = self._apply_dump_journal()
                 all_query_tasks = list(zip(self._data_dump_files.keys(), self._data_dump_queries, strict=False))
+                query_tasks = [all_query_tasks[task_idx] for task_idx in pending_tasks]
+                schedule = plan_tasks(
+                    costs=[self._data_dump_costs[task_idx] for task_idx in pending_tasks],
+                    workers=self._dump_connections_count,
+                    largest_first=not self.context.options.disable_largest_first,
+                )
+                self.context.logger.info("Dump data schedule: %s", schedule.get_plan_summary())
+                self._start_progress(pending_tasks)
 
+                run_dump_tasks = (
+                    self._run_dump_processes if self.context.options.processes > 1 else self._run_dump_tasks
+                )
                 dump_task = asyncio.create_task(
-                    self._run_dump_tasks(
-                        query_tasks=all_query_tasks,
+                    run_dump_tasks(
+                        query_tasks=query_tasks,
                         transaction_snapshot_id=transaction_snapshot_id,
-                        compression_semaphore=compression_semaphore,
+                        schedule=schedule,
                     )
                 )
 
-                # Keep main transaction active while dump tasks run
+                # Keep main transaction active while dump tasks and pg_dump run, it holds the exported snapshot
+                running_tasks = {dump_task, schema_task}
                 try:
-                    while not dump_task.done():
-                        await asyncio.wait({dump_task}, timeout=5)
-                        if not dump_task.done():
+                    while running_tasks:
+                        done, running_tasks = await asyncio.wait(
+                            running_tasks, timeout=5, return_when=asyncio.FIRST_EXCEPTION
+                        )
+                        for done_task in done:
+                            done_task.result()  # raises an exception of a failed task
+                        if running_tasks:
                             await connection.execute("SELECT 1")
-                except Exception:
+                except BaseException:
+                    # The dump task closes its pool and compression executor before the snapshot connection is closed
                     dump_task.cancel()
+                    await asyncio.gather(dump_task, return_exceptions=True)
                     raise
 
-                self._data_dump_tasks_results = dump_task.result()
+                self._data_dump_tasks_results.update(dump_task.result())
+                if self._progress is not None:
+                    self._progress.save(force=True)
+                self.context.logger.info("Dump data schedule: %s", schedule.get_result_summary())
 
                 # Prepare data for metadata
                 await self._count_totals(connection=connection)
@@ -644,27 +1169,44 @@ class DumpMode:
                 await self._prepare_extensions(connection=connection)
                 await self._prepare_objects_ddl_to_metadata(connection)
         finally:
+            if schema_task is not None and not schema_task.done():
+                schema_task.cancel()
+                await asyncio.gather(schema_task, return_exceptions=True)
             await connection.close()
             self.context.logger.info("<------------- Finished dump data")
 
-    async def _dump_pre_data(self) -> None:
+    async def _dump_pre_data(self, snapshot_id: str | None = None) -> None:
         if self._skip_pre_data_dump:
             self.context.logger.info("-------------> Skipped dump pre-data (pg_dump)")
             return
 
         self.context.logger.info("-------------> Started dump pre-data (pg_dump)")
-        await self._run_pg_dump("pre-data")
+        await self._run_pg_dump("pre-data", snapshot_id)
         self.context.logger.info("<------------- Finished dump pre-data (pg_dump)")
 
-    async def _dump_post_data(self) -> None:
+    async def _dump_post_data(self, snapshot_id: str | None = None) -> None:
         if self._skip_post_data_dump:
             self.context.logger.info("-------------> Skipped dump post-data (pg_dump)")
             return
 
         self.context.logger.info("-------------> Started dump post-data (pg_dump)")
-        await self._run_pg_dump("post-data")
+        await self._run_pg_dump("post-data", snapshot_id)
         self.context.logger.info("<------------- Finished dump post-data (pg_dump)")
 
+    async def _dump_schema(self, snapshot_id: str | None = None) -> None:
+        """Dump pre-data and post-data sections by pg_dump processes running at the same time."""
+        tasks = [
+            asyncio.create_task(self._dump_pre_data(snapshot_id)),
+            asyncio.create_task(self._dump_post_data(snapshot_id)),
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _fetch_sequences_data(self, connection: Connection) -> None:
         """Fetch sequences data and cache for reuse in pg_dump and metadata."""
         query = get_sequences_query(self.context.exclude_schemas)
@@ -765,17 +1307,21 @@ class DumpMode:
                 self.context.connection_params, server_settings=self.context.server_settings
             )
 
-            await check_required_connections(connection, self.context.options.db_connections_per_process)
+            await check_required_connections(
+                connection, self._dump_connections_count + self._schema_dump_connections_count
+            )
 
             self.context.read_prepared_dict()
             self.context.read_partial_tables_dicts()
             self._prepare_output_dir()
+            await self._verify_dump_journal_files()
 
             await self._prepare_schemas_lists(connection)
             await self._prepare_tables_lists(connection)
             await self._fetch_sequences_data(connection)
-            await self._dump_pre_data()
-            await self._dump_post_data()
+            if not self._need_dump_data:
+                await self._dump_schema()
+            # Otherwise the schema is dumped while data is copied
             await self._dump_data(connection)
             await self._prepare_and_save_metadata()
 
@@ -786,3 +1332,36 @@ class DumpMode:
 
             if self.context.options.save_dicts:
                 save_dicts_info_file(self.context.options)
+
+
+async def _run_dump_worker(
+    options: RunOptions,
+    pg_version: str,
+    output_dir: Path,
+    transaction_snapshot_id: str,
+    task_queue: multiprocessing.Queue,
+    result_queue: multiprocessing.Queue,
+) -> None:
+    context = Context(options)
+    context.set_postgres_version(pg_version)
+    dump_mode = DumpMode(context)
+    dump_mode.output_dir = output_dir
+    await dump_mode.run_worker(task_queue, result_queue, transaction_snapshot_id)
+
+
+def run_dump_worker(
+    options: RunOptions,
+    pg_version: str,
+    output_dir: Path,
+    transaction_snapshot_id: str,
+    task_queue: multiprocessing.Queue,
+    result_queue: multiprocessing.Queue,
+) -> None:
+    """Entry point of a dump worker process. Errors are sent to the parent process through the result queue."""
+    try:
+        asyncio.run(
+            _run_dump_worker(options, pg_version, output_dir, transaction_snapshot_id, task_queue, result_queue)
+        )
+    except Exception as exc:
+        error = exc if isinstance(exc, PgAnonError) else PgAnonError(ErrorCode.DUMP_FAILED, str(exc))
+        result_queue.put((DUMP_WORKER_TASK_FAILED, None, error))
@@ -1,35 +1,54 @@
 import asyncio
-import gzip
+import hashlib
 import json
 import os
 import re
 import shlex
 import shutil
-import subprocess
+from collections import Counter
+from collections.abc import AsyncIterator
 from copy import copy
 from pathlib import Path
+from typing import Any
 
 import asyncpg
 from asyncpg import Connection
 
+from pg_anon.common.compression import get_metadata_compression
+from pg_anon.common.constants import (
+    PG_RESTORE_PROGRESS_FILE_NAME,
+    PG_UTIL_LOG_LINE_LIMIT,
+    RESTORE_JOURNAL_DUMP_ITEM,
+    RESTORE_JOURNAL_FILE_ITEM_PREFIX,
+    RESTORE_JOURNAL_SCHEMA_NAME,
+    RESTORE_JOURNAL_STAGE_ITEM_PREFIX,
+    SAVED_PROGRESS_FILE_NAME,
+)
 from pg_anon.common.db_queries import get_check_constraint_query, get_db_params, get_sequences_max_value_init_query
 from pg_anon.common.db_utils import (
+    add_restore_journal_item,
     check_db_is_empty,
     check_required_connections,
     create_connection,
     create_pool,
+    create_restore_journal,
+    drop_restore_journal,
     get_available_extensions_map,
     get_available_schemas,
+    get_restore_journal,
     run_query_in_pool,
 )
 from pg_anon.common.dto import Metadata
 from pg_anon.common.enums import AnonMode
 from pg_anon.common.errors import ErrorCode, PgAnonError
+from pg_anon.common.progress import PgRestoreProgress, TransferProgress
+from pg_anon.common.scheduler import plan_tasks
 from pg_anon.common.utils import (
     get_major_version,
     get_pg_util_version,
     pretty_size,
     resolve_dependencies,
+    run_process_with_logs,
     save_dicts_info_file,
 )
 from pg_anon.context import Context
@@ -47,6 +66,40 @@ _SCHEMA_TOC_RE = re.compile(r"^\d+;\s+\d+\s+\d+\s+SCHEMA - (?P<schema>\S+)")
 _TOC_FAILED_ENTRY_RE = re.compile(r"from TOC entry (\d+)")
 _TOC_LIST_LINE_RE = re.compile(r"^(\d+);\s")
 
+# Post-data entries which need the data of only one table. "INDEX ATTACH" and "FK CONSTRAINT" need two objects
+_TABLE_POST_DATA_TOC_RE = re.compile(
+    r"^\d+;\s+\d+\s+\d+\s+"
+    r"(?:INDEX\s+(?!ATTACH\s)(?P<index_schema>\S+)\s+(?P<index_name>\S+)"
+    r"|CONSTRAINT\s+(?P<schema>\S+)\s+(?P<table>\S+)\s)"
+)
+
+
+def map_post_data_toc_to_tables(
+    toc_lines: list[str], index_tables: dict[tuple[str, str], tuple[str, str]]
+) -> tuple[dict[tuple[str, str], list[str]], list[str]]:
+    """Split post-data TOC lines into indexes and constraints of every table and the rest of lines.
+
+    ``index_tables`` maps (schema, index name) to the table of the index. Lines of foreign keys,
+    attached partition indexes and other objects, and indexes of unknown tables are left in the rest.
+    """
+    table_lines: dict[tuple[str, str], list[str]] = {}
+    rest_lines: list[str] = []
+
+    for toc_line in toc_lines:
+        table = None
+        if match := _TABLE_POST_DATA_TOC_RE.match(toc_line):
+            if match.group("index_name"):
+                table = index_tables.get((match.group("index_schema"), match.group("index_name")))
+            else:
+                table = (match.group("schema"), match.group("table"))
+
+        if table is None:
+            rest_lines.append(toc_line)
+        else:
+            table_lines.setdefault(table, []).append(toc_line)
+
+    return table_lines, rest_lines
+
 
 class RestoreMode:
     context: Context
@@ -67,6 +120,21 @@ class RestoreMode:
 
     _restored_schemas: list[str]
 
+    _restore_journal: dict[str, dict[str, Any]]
+    _resuming: bool = False
+
+    _progress: TransferProgress | None = None
+
+    # Post-data entries restored by table as soon as its data is loaded, see --post-data-workers
+    _post_data_pipelined: bool = False
+    _post_data_table_entries: dict[tuple[str, str], list[str]]
+    _post_data_rest_entries: list[str]
+    _post_data_pending_files: Counter[tuple[str, str]]
+    _post_data_queue: list[str]
+    _post_data_tasks: set[asyncio.Task[None]]
+    _post_data_failed_task: asyncio.Task[None] | None = None
+    _post_data_batches_count: int = 0
+
     @property
     def _whitelist_active(self) -> bool:
         return bool(self.context.included_tables_rules)
@@ -81,6 +149,12 @@ class RestoreMode:
             raise PgAnonError(ErrorCode.INPUT_DIR_NOT_FOUND, msg)
 
         self._load_metadata()
+        self._restore_journal = {}
+        self._post_data_table_entries = {}
+        self._post_data_rest_entries = []
+        self._post_data_pending_files = Counter()
+        self._post_data_queue = []
+        self._post_data_tasks = set()
 
         self._db_must_be_empty = self.context.options.mode in (AnonMode.RESTORE, AnonMode.SYNC_STRUCT_RESTORE) and not (
             self.context.options.clean_db or self.context.options.drop_db
@@ -98,12 +172,48 @@ class RestoreMode:
         self.metadata_file_path = self.input_dir / self.metadata_file_name
         self.metadata = Metadata()
         self.metadata.load_from_file(self.metadata_file_path)
+        self._compression = get_metadata_compression(self.metadata.compression)
+
+    def _get_dump_hash(self) -> str:
+        return hashlib.sha256(self.metadata_file_path.read_bytes()).hexdigest()
+
+    async def _load_restore_journal(self, connection: Connection) -> None:
+        """Load the journal of the interrupted restore from the target database for --resume."""
+        if not self.context.options.resume:
+            return
+
+        journal = await get_restore_journal(connection)
+        if journal is None:
+            self.context.logger.warning("No restore journal found in the target database, nothing to resume")
+            return
+
+        dump_item = journal.get(RESTORE_JOURNAL_DUMP_ITEM)
+        if dump_item is None or dump_item["value"] != self._get_dump_hash():
+            msg = f"Can't resume restore: target DB {self.context.connection_params.database} was restored from another dump"
+            self.context.logger.error(msg)
+            raise PgAnonError(ErrorCode.RESTORE_JOURNAL_MISMATCH, msg)
+
+        self._restore_journal = journal
+        self._resuming = True
+        self.context.logger.info("Resuming restore: %s items are taken from the restore journal", len(journal) - 1)
+
+    async def _start_restore_journal(self, connection: Connection) -> None:
+        if self._resuming:
+            return
+
+        await create_restore_journal(connection)
+        await add_restore_journal_item(connection, RESTORE_JOURNAL_DUMP_ITEM, value=self._get_dump_hash())
+
+    def _is_stage_restored(self, stage: str) -> bool:
+        return RESTORE_JOURNAL_STAGE_ITEM_PREFIX + stage in self._restore_journal
+
+    async def _mark_stage_restored(self, connection: Connection, stage: str) -> None:
+        await add_restore_journal_item(connection, RESTORE_JOURNAL_STAGE_ITEM_PREFIX + stage)
 
     def _generate_analyze_queries(self) -> list[str]:
         analyze_queries = []
-        for target in (self.metadata.files or {}).values():
-            schema = target["schema"]
-            table = target["table"]
+        tables = dict.fromkeys((target["schema"], target["table"]) for target in (self.metadata.files or {}).values())
+        for schema, table in tables:
             if self.context.black_listed_tables and (schema, table) in self.context.black_listed_tables:
                 continue
 
@@ -164,8 +274,10 @@ class RestoreMode:
             WHERE c.relkind IN ('r', 'p')
               AND n.nspname NOT IN ('pg_catalog', 'information_schema')
               AND n.nspname NOT LIKE 'pg\\_%' ESCAPE '\\'
+              AND n.nspname <> $1
               AND p.oid IS NULL
-            """
+            """,
+            RESTORE_JOURNAL_SCHEMA_NAME,
         )
         target_tables = {(r[0], r[1]) for r in rows}
         extras = target_tables - dumped_tables
@@ -206,7 +318,7 @@ class RestoreMode:
                 f"Not enough freed disk space! Free {free_disk_space}, Required {required_disk_space}",
             )
 
-    def _make_filtered_toc_list(self) -> None:  # noqa: C901, PLR0912, PLR0915
+    async def _make_filtered_toc_list(self) -> None:  # noqa: C901, PLR0912, PLR0915
         whitelist: list[re.Pattern[str]] = []
         blacklist: list[re.Pattern[str]] = []
 
@@ -346,20 +458,17 @@ class RestoreMode:
 
         available_schemas = set(self._restored_schemas)
 
-        for section in ["pre_data", "post_data"]:
-            command = [self.context.pg_restore, "-l", str(self.input_dir / f"{section}.backup")]
-            if section == "pre_data":
+        for section in ["pre-data", "post-data"]:
+            if section == "pre-data":
                 self._toc_list_pre_data_file_path = self.input_dir / self._toc_list_pre_data_file_name
                 toc_file_path = self._toc_list_pre_data_file_path
             else:
                 self._toc_list_post_data_file_path = self.input_dir / self._toc_list_post_data_file_name
                 toc_file_path = self._toc_list_post_data_file_path
 
-            proc = subprocess.Popen(command, stdout=subprocess.PIPE)
-            toc_bytes, _ = proc.communicate()
-            toc_lines = toc_bytes.decode("utf-8", errors="replace")
+            toc_lines = await self._list_archive_toc(section) or []
             with toc_file_path.open("w", encoding="utf-8") as f:
-                for toc_line in toc_lines.split("\n"):
+                for toc_line in toc_lines:
                     if toc_line.startswith(";"):
                         continue
 
@@ -436,55 +545,95 @@ class RestoreMode:
         if not self.context.options.db_user:
             del command[command.index("-U") : command.index("-U") + 2]
 
-        if self.context.options.clean_db:
+        # A stage interrupted by the previous run may be partially restored
+        if self.context.options.clean_db or self._resuming:
             command.extend(["--clean", "--if-exists"])
 
         if self.context.options.ignore_privileges:
             command.append("--no-privileges")
 
-        if toc_override is not None:
-            command.extend(["-L", str(toc_override)])
-        elif self._toc_list_pre_data_file_path:
-            toc_path = (
-                self._toc_list_pre_data_file_path if section == "pre-data" else self._toc_list_post_data_file_path
-            )
-            if toc_path:
-                command.extend(["-L", str(toc_path)])
+        toc_path = self._get_pg_restore_toc_path(section, toc_override)
+        if toc_path is not None:
+            command.extend(["-L", str(toc_path)])
 
         if self.context.options.pg_restore_options:
             command.extend(shlex.split(self.context.options.pg_restore_options))
 
         return command
 
-    def _invoke_pg_restore(self, command: list[str]) -> tuple[str, int]:
-        env = self._make_pg_restore_env()
-        proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
-        # pg_restore writes logs to stderr; stdout stays empty unless -f is used
-        _, stderr_bytes = proc.communicate()
-        return stderr_bytes.decode("utf-8", errors="replace"), proc.returncode
+    def _get_pg_restore_toc_path(self, section: str, toc_override: Path | None = None) -> Path | None:
+        if toc_override is not None:
+            return toc_override
+        if not self._toc_list_pre_data_file_path:
+            return None
+        return self._toc_list_pre_data_file_path if section == "pre-data" else self._toc_list_post_data_file_path
+
+    async def _list_archive_toc(self, section: str) -> list[str] | None:
+        # The TOC of the archive is read by `pg_restore -l`, its output is streamed to not block the event loop
+        backup_path = (self.input_dir / section.replace("-", "_")).with_suffix(".backup")
+        if not backup_path.exists():
+            return None
+
+        proc = await asyncio.create_subprocess_exec(
+            self.context.pg_restore,
+            "-l",
+            str(backup_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=PG_UTIL_LOG_LINE_LIMIT,
+            env=self._make_pg_restore_env(),
+        )
+        toc_lines: list[str] = []
+        try:
+            if proc.stdout is not None:
+                async for line in proc.stdout:
+                    toc_lines.append(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+            returncode = await proc.wait()
+        except BaseException:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+
+        return toc_lines if returncode == 0 else None
+
+    async def _count_toc_entries(self, section: str, toc_override: Path | None = None) -> int:
+        toc_path = self._get_pg_restore_toc_path(section, toc_override)
+        if toc_path is not None:
+            toc_lines = toc_path.read_text(encoding="utf-8").splitlines()
+        else:
+            toc_lines = await self._list_archive_toc(section) or []
+        return sum(1 for line in toc_lines if _TOC_LIST_LINE_RE.match(line))
+
+    async def _invoke_pg_restore(self, command: list[str], progress: PgRestoreProgress) -> tuple[set[int], int]:
+        # pg_restore writes logs to stderr; every line is logged and parsed as soon as it is written
+        failed_ids: set[int] = set()
+
+        def on_log_line(line: str) -> None:
+            self.context.logger.info(line)
+            failed_ids.update(self._parse_failed_toc_ids(line))
+            progress.parse_line(line)
+
+        returncode = await run_process_with_logs(command, on_log_line, env=self._make_pg_restore_env())
+        if returncode == 0:
+            progress.finish()
+        return failed_ids, returncode
 
     @staticmethod
     def _parse_failed_toc_ids(stderr_text: str) -> set[int]:
         return {int(m) for m in _TOC_FAILED_ENTRY_RE.findall(stderr_text)}
 
-    def _build_retry_toc(self, section: str, failed_ids: set[int]) -> Path | None:
+    async def _build_retry_toc(self, section: str, failed_ids: set[int], toc_name: str | None = None) -> Path | None:
         # Materialize a -L file containing only the lines for failed TOC ids.
         # We get the canonical formatting by running `pg_restore -l` on the archive
         # and filtering its output rather than hand-crafting line content.
-        backup_path = (self.input_dir / section.replace("-", "_")).with_suffix(".backup")
-        if not backup_path.exists():
-            return None
-
-        cmd = [self.context.pg_restore, "-l", str(backup_path)]
-        env = self._make_pg_restore_env()
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
-        stdout_bytes, _ = proc.communicate()
-        if proc.returncode != 0:
+        toc_lines = await self._list_archive_toc(section)
+        if toc_lines is None:
             return None
 
         wanted = {str(i) for i in failed_ids}
         matching: list[str] = []
-        for line in stdout_bytes.decode("utf-8", errors="replace").split("\n"):
+        for line in toc_lines:
             match = _TOC_LIST_LINE_RE.match(line)
             if match and match.group(1) in wanted:
                 matching.append(line)
@@ -492,27 +641,44 @@ class RestoreMode:
         if not matching:
             return None
 
-        retry_toc = self.input_dir / f"toc_{section.replace('-', '_')}_retry.list"
+        toc_name = toc_name or f"toc_{section.replace('-', '_')}"
+        retry_toc = self.input_dir / f"{toc_name}_retry.list"
         retry_toc.write_text("\n".join(matching) + "\n", encoding="utf-8")
         return retry_toc
 
-    async def _run_pg_restore(self, section: str) -> None:
+    def _make_pg_restore_progress(
+        self, section: str, total_items: int, parallelism: int, save_progress: bool
+    ) -> PgRestoreProgress:
+        return PgRestoreProgress(
+            section=section,
+            total_items=total_items,
+            parallel=parallelism > 1,
+            file_path=Path(self.context.options.run_dir) / PG_RESTORE_PROGRESS_FILE_NAME if save_progress else None,
+            logger=self.context.logger,
+        )
+
+    async def _run_pg_restore(
+        self,
+        section: str,
+        toc_override: Path | None = None,
+        parallelism: int | None = None,
+        save_progress: bool = True,
+    ) -> None:
         if self.context.options.db_user_password:
             os.environ["PGPASSWORD"] = self.context.options.db_user_password
 
-        parallelism = self.context.options.db_connections_per_process
-        command = self._build_pg_restore_command(section, parallelism=parallelism)
+        parallelism = parallelism or self.context.options.db_connections_per_process
+        command = self._build_pg_restore_command(section, parallelism=parallelism, toc_override=toc_override)
+        progress = self._make_pg_restore_progress(
+            section, await self._count_toc_entries(section, toc_override), parallelism, save_progress
+        )
 
         self.context.logger.debug(str(command))
-        stderr_text, returncode = self._invoke_pg_restore(command)
-
-        for log_line in stderr_text.split("\n"):
-            self.context.logger.info(log_line)
+        failed_ids, returncode = await self._invoke_pg_restore(command, progress)
 
         if returncode == 0:
             return
 
-        failed_ids = self._parse_failed_toc_ids(stderr_text)
         if not failed_ids:
             msg = "ERROR: database restore has failed!"
             self.context.logger.error(msg)
@@ -525,7 +691,7 @@ class RestoreMode:
             sorted(failed_ids),
         )
 
-        retry_toc = self._build_retry_toc(section, failed_ids)
+        retry_toc = await self._build_retry_toc(section, failed_ids, toc_override.stem if toc_override else None)
         if retry_toc is None:
             msg = "ERROR: database restore has failed; could not build retry TOC list!"
             self.context.logger.error(msg)
@@ -536,14 +702,13 @@ class RestoreMode:
             parallelism=1,
             toc_override=retry_toc,
         )
+        retry_progress = self._make_pg_restore_progress(
+            f"{section} retry", len(failed_ids), parallelism=1, save_progress=save_progress
+        )
         self.context.logger.debug(str(retry_command))
-        stderr_text, returncode = self._invoke_pg_restore(retry_command)
-
-        for log_line in stderr_text.split("\n"):
-            self.context.logger.info(log_line)
+        retry_failed_ids, returncode = await self._invoke_pg_restore(retry_command, retry_progress)
 
         if returncode != 0:
-            retry_failed_ids = self._parse_failed_toc_ids(stderr_text)
             msg = (
                 "ERROR: database restore has failed! Serial retry could not recover "
                 f"{len(retry_failed_ids)} TOC entries: {sorted(retry_failed_ids)}"
@@ -585,22 +750,18 @@ class RestoreMode:
                 self.context.logger.info(query)
                 await connection.execute(query)
 
-    def _extract_schemas_from_toc(self) -> set[str]:
+    async def _extract_schemas_from_toc(self) -> set[str]:
         """Extract schema names from pre_data backup TOC.
 
         Used when partial_dump_schemas is not available in metadata (e.g. full dump + partial restore).
         """
-        pre_data_backup = self.input_dir / "pre_data.backup"
-        if not pre_data_backup.exists():
+        toc_lines = await self._list_archive_toc("pre-data")
+        if toc_lines is None:
             return set()
 
-        command = [self.context.pg_restore, "-l", str(pre_data_backup)]
-        proc = subprocess.Popen(command, stdout=subprocess.PIPE)
-        toc_bytes, _ = proc.communicate()
-
         schemas: set[str] = set()
         schema_re = re.compile(r"^\d+;\s+\d+\s+\d+\s+SCHEMA\s+-\s+(\S+)")
-        for line in toc_bytes.decode("utf-8", errors="replace").split("\n"):
+        for line in toc_lines:
             match = schema_re.match(line)
             if match:
                 schemas.add(match.group(1))
@@ -613,7 +774,7 @@ class RestoreMode:
             self._restored_schemas = copy(self.metadata.partial_dump_schemas)
         elif self.context.black_listed_tables or self._whitelist_active:
             table_schemas = {schema for schema, _ in self.context.tables}
-            toc_schemas = self._extract_schemas_from_toc()
+            toc_schemas = await self._extract_schemas_from_toc()
             self._restored_schemas = list(table_schemas | toc_schemas)
 
         if not self._restored_schemas:
@@ -710,6 +871,9 @@ class RestoreMode:
                 await connection.execute(extension_dependency_query)
 
     async def _create_objects_from_ddl_for_partial_mode(self, connection: Connection) -> None:  # noqa: C901
+        if self._is_stage_restored("partial-ddl"):
+            return
+
         ddl_list = []
 
         if self.metadata.partial_dump_types:
@@ -756,6 +920,8 @@ class RestoreMode:
             remaining = [query for query, _ in failed]
             self.context.logger.info("PARTIAL RESTORE MODE: Retrying %s failed DDL(s)", len(remaining))
 
+        await self._mark_stage_restored(connection, "partial-ddl")
+
     async def _drop_constraints(self, connection: Connection) -> None:
         """Drop all CHECK constraints containing user-defined procedures."""
         if not self.context.options.drop_custom_check_constr:
@@ -775,10 +941,25 @@ class RestoreMode:
             query = f'ALTER TABLE "{schema}"."{table}" DROP CONSTRAINT IF EXISTS "{constraint}" CASCADE'
             await connection.execute(query)
 
-    @staticmethod
-    def _extract_file(src_path: Path, dst_path: Path) -> None:
-        with gzip.open(src_path, "rb") as src_file, dst_path.open("wb") as trg_file:
-            shutil.copyfileobj(src_file, trg_file, length=1024 * 1024)
+    async def _read_dump_file(self, dump_file: Path) -> AsyncIterator[bytes]:
+        """Yield decompressed content of the dump file chunk by chunk.
+
+        Decompression runs in a worker thread and the next chunk is read while the current one is sent
+        to the server, so no more than two chunks of ``--restore-buffer-size`` are held in memory.
+        """
+        chunk_size = self.context.options.restore_buffer_size * 1024 * 1024
+        reader = await asyncio.to_thread(self._compression.open_reader, dump_file)
+        next_chunk = asyncio.ensure_future(asyncio.to_thread(reader.read, chunk_size))
+        try:
+            while chunk := await next_chunk:
+                next_chunk = asyncio.ensure_future(asyncio.to_thread(reader.read, chunk_size))
+                if self._progress is not None:
+                    self._progress.bytes_transferred(dump_file.name, len(chunk))
+                yield chunk
+        finally:
+            # The reader must not be closed while the worker thread still reads from it
+            await asyncio.wait({next_chunk})
+            await asyncio.to_thread(reader.close)
 
     async def _restore_table_data(
         self,
@@ -787,12 +968,11 @@ class RestoreMode:
         schema_name: str,
         table_name: str,
         transaction_snapshot_id: str,
-    ) -> None:
+    ) -> bool:
+        """Load a data file into the table. Returns False if the file is not loaded, the error is logged."""
         self.context.logger.info("%s Started task copy_to_table %s.%s", ">" * 20, schema_name, table_name)
-        extracted_file = dump_file.with_suffix("")
-
-        await asyncio.to_thread(self._extract_file, dump_file, extracted_file)
 
+        loaded = False
         try:
             async with pool.acquire() as connection:
                 async with connection.transaction(isolation="repeatable_read"):
@@ -802,79 +982,279 @@ class RestoreMode:
                     result = await connection.copy_to_table(
                         schema_name=schema_name,
                         table_name=table_name,
-                        source=extracted_file,
+                        source=self._read_dump_file(dump_file),
                         format="binary",
                     )
-                    self.context.total_rows += int(re.findall(r"(\d+)", result)[0])
+                    rows = int(re.findall(r"(\d+)", result)[0])
+                    # Recorded in the same transaction, so the journal never lists a file which is not loaded
+                    await add_restore_journal_item(
+                        connection, RESTORE_JOURNAL_FILE_ITEM_PREFIX + dump_file.name, rows=rows
+                    )
+                    self.context.total_rows += rows
                     await connection.execute("COMMIT;")
+
+            if self._progress is not None:
+                self._progress.task_finished(dump_file.name, rows=rows, file_bytes=dump_file.stat().st_size)
+            loaded = True
         except Exception:
             self.context.logger.exception(
-                "Exception in RestoreMode._restore_table_data: schema_name=%s table_name=%s extracted_file=%s",
+                "Exception in RestoreMode._restore_table_data: schema_name=%s table_name=%s dump_file=%s",
                 schema_name,
                 table_name,
-                extracted_file,
+                dump_file,
             )
-        finally:
-            extracted_file.unlink()
 
         self.context.logger.info("%s Finished task %s.%s", ">" * 20, schema_name, table_name)
+        return loaded
+
+    def _get_restore_data_files(self) -> list[tuple[str, dict[str, Any]]]:
+        data_files = []
+        for file_name, target in (self.metadata.files or {}).items():
+            table_name_full = f'"{target["schema"]}"."{target["table"]}"'
+
+            # black list has the highest priority for pg_dump / pg_restore
+            if (
+                self.context.black_listed_tables
+                and (target["schema"], target["table"]) in self.context.black_listed_tables
+            ):
+                self.context.logger.info("Skipping restore data of table: %s", table_name_full)
+                continue
+
+            # white list has the second priority for pg_dump / pg_restore
+            if self._whitelist_active and (target["schema"], target["table"]) not in self.context.white_listed_tables:
+                self.context.logger.info("Skipping restore data of table: %s", table_name_full)
+                continue
+
+            data_files.append((file_name, target))
+
+        return data_files
+
+    def _skip_restored_data_files(
+        self, data_files: list[tuple[str, dict[str, Any]]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        pending_files = []
+        for file_name, target in data_files:
+            journal_item = self._restore_journal.get(RESTORE_JOURNAL_FILE_ITEM_PREFIX + file_name)
+            if journal_item is None:
+                pending_files.append((file_name, target))
+                continue
+            self.context.total_rows += int(journal_item["rows"] or 0)
+
+        if len(pending_files) < len(data_files):
+            self.context.logger.info(
+                "%s data files are already restored, %s left",
+                len(data_files) - len(pending_files),
+                len(pending_files),
+            )
+
+        return pending_files
+
+    def _get_restore_cost(self, file_name: str, target: dict[str, Any]) -> float:
+        file_path = self.input_dir / file_name
+        if file_path.exists():
+            return file_path.stat().st_size
+        return int(target.get("rows", 0))
+
+    def _start_progress(self, data_files: list[tuple[str, dict[str, Any]]]) -> TransferProgress:
+        self._progress = TransferProgress(
+            operation="restore",
+            file_path=Path(self.context.options.run_dir) / SAVED_PROGRESS_FILE_NAME,
+            logger=self.context.logger,
+        )
+        for file_name, target in data_files:
+            # Dumps made before "copy_bytes" was recorded are estimated by the compressed file size
+            expected_bytes = target.get("copy_bytes")
+            if expected_bytes is None:
+                file_path = self.input_dir / file_name
+                expected_bytes = file_path.stat().st_size if file_path.exists() else 0
+            self._progress.add_task(file_name, target["schema"], target["table"], expected_bytes)
+        return self._progress
+
+    def _start_post_data_pipeline(self, data_files: list[tuple[str, dict[str, Any]]]) -> None:
+        """Map post-data entries to tables and release entries of tables which have no data files left to load."""
+        if (
+            self.context.options.post_data_workers <= 0
+            or self._skip_post_data_restore
+            or self._is_stage_restored("post-data")
+            or not self._toc_list_post_data_file_path
+            or not self._toc_list_post_data_file_path.exists()
+        ):
+            return
+
+        index_tables = {
+            (index["schema"], index["index_name"]): (index["schema"], index["table"])
+            for index in (self.metadata.indexes or {}).values()
+        }
+        toc_lines = self._toc_list_post_data_file_path.read_text(encoding="utf-8").splitlines()
+        table_entries, self._post_data_rest_entries = map_post_data_toc_to_tables(toc_lines, index_tables)
+
+        # Objects of tables without data files in the dump, like partitioned tables, are restored after all data
+        dumped_tables = {(target["schema"], target["table"]) for target in (self.metadata.files or {}).values()}
+        for table, entries in table_entries.items():
+            if table in dumped_tables:
+                self._post_data_table_entries[table] = entries
+            else:
+                self._post_data_rest_entries.extend(entries)
+
+        self._post_data_pending_files = Counter((target["schema"], target["table"]) for _, target in data_files)
+        self._post_data_pipelined = True
+        self.context.logger.info(
+            "Post-data of %s tables is restored as soon as their data is loaded by %s workers",
+            len(self._post_data_table_entries),
+            self.context.options.post_data_workers,
+        )
+
+        # Data of these tables was loaded by the previous run
+        for table in list(self._post_data_table_entries):
+            if not self._post_data_pending_files[table]:
+                self._release_post_data(table)
+
+    def _post_data_file_loaded(self, table: tuple[str, str]) -> None:
+        if not self._post_data_pipelined:
+            return
+
+        self._post_data_pending_files[table] -= 1
+        if self._post_data_pending_files[table] <= 0:
+            self._release_post_data(table)
+
+    def _release_post_data(self, table: tuple[str, str]) -> None:
+        self._post_data_queue.extend(self._post_data_table_entries.pop(table, []))
+        self._launch_post_data_batches()
+
+    def _launch_post_data_batches(self) -> None:
+        """Split released entries into batches between free workers, every batch is restored by one pg_restore."""
+        free_workers = self.context.options.post_data_workers - len(self._post_data_tasks)
+        if not self._post_data_queue or free_workers <= 0 or self._post_data_failed_task is not None:
+            return
+
+        batches_count = min(free_workers, len(self._post_data_queue))
+        batches = [self._post_data_queue[batch_idx::batches_count] for batch_idx in range(batches_count)]
+        self._post_data_queue = []
+
+        for batch in batches:
+            self._post_data_batches_count += 1
+            task = asyncio.create_task(self._restore_post_data_batch(batch, self._post_data_batches_count))
+            self._post_data_tasks.add(task)
+            task.add_done_callback(self._post_data_batch_done)
+
+    def _post_data_batch_done(self, task: asyncio.Task[None]) -> None:
+        self._post_data_tasks.discard(task)
+        if task.cancelled():
+            return
+
+        # The error is raised by _wait_post_data_pipeline, next batches are not started
+        if task.exception() is not None:
+            self._post_data_failed_task = self._post_data_failed_task or task
+            return
+
+        self._launch_post_data_batches()
+
+    async def _restore_post_data_batch(self, toc_lines: list[str], batch_idx: int) -> None:
+        toc_path = self.input_dir / f"toc_post_data_batch_{batch_idx}.list"
+        toc_path.write_text("\n".join(toc_lines) + "\n", encoding="utf-8")
+        self.context.logger.info(
+            "-------------> Started restore post-data batch %s (%s entries)", batch_idx, len(toc_lines)
+        )
+        try:
+            await self._run_pg_restore("post-data", toc_override=toc_path, parallelism=1, save_progress=False)
+        finally:
+            if not self.context.options.debug:
+                toc_path.unlink(missing_ok=True)
+        self.context.logger.info("<------------- Finished restore post-data batch %s", batch_idx)
+
+    async def _wait_post_data_pipeline(self) -> None:
+        """Wait until all released post-data entries are restored."""
+        self._launch_post_data_batches()
+        while self._post_data_tasks and self._post_data_failed_task is None:
+            await asyncio.wait(set(self._post_data_tasks), return_when=asyncio.FIRST_COMPLETED)
+
+        if self._post_data_failed_task is not None:
+            await self._stop_post_data_pipeline()
+            self._post_data_failed_task.result()
+
+    async def _stop_post_data_pipeline(self) -> None:
+        self._post_data_queue = []
+        tasks = set(self._post_data_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def _process_restore_data(self, transaction_snapshot_id: str) -> None:
+        """Restore data files concurrently.
+
+        Files of a chunked table are loaded in parallel as well, but no more than
+        ``--table-restore-concurrency`` of them into the same table at once.
+        """
+        connections_count = self.context.options.db_connections_per_process
+        table_concurrency = self.context.options.table_restore_concurrency or connections_count
+
         pool = await create_pool(
             connection_params=self.context.connection_params,
             server_settings=self.context.server_settings,
-            min_size=self.context.options.db_connections_per_process,
-            max_size=self.context.options.db_connections_per_process,
+            min_size=connections_count,
+            max_size=connections_count,
         )
 
-        try:
-            loop = asyncio.get_event_loop()
-            tasks: set[asyncio.Task[None]] = set()
-            for file_name, target in (self.metadata.files or {}).items():
-                table_name_full = f'"{target["schema"]}"."{target["table"]}"'
-
-                # black list has the highest priority for pg_dump / pg_restore
-                if (
-                    self.context.black_listed_tables
-                    and (target["schema"], target["table"]) in self.context.black_listed_tables
-                ):
-                    self.context.logger.info("Skipping restore data of table: %s", table_name_full)
-                    continue
-
-                # white list has the second priority for pg_dump / pg_restore
-                if (
-                    self._whitelist_active
-                    and (target["schema"], target["table"]) not in self.context.white_listed_tables
-                ):
-                    self.context.logger.info("Skipping restore data of table: %s", table_name_full)
-                    continue
+        data_files = self._skip_restored_data_files(self._get_restore_data_files())
+        schedule = plan_tasks(
+            costs=[self._get_restore_cost(file_name, target) for file_name, target in data_files],
+            workers=connections_count,
+            largest_first=not self.context.options.disable_largest_first,
+        )
+        self.context.logger.info("Restore data schedule: %s", schedule.get_plan_summary())
+        progress = self._start_progress(data_files)
+        self._start_post_data_pipeline(data_files)
+
+        pending_files = [(idx, *data_files[idx]) for idx in schedule.order]
+        tasks: dict[asyncio.Task[bool], tuple[tuple[str, str], int]] = {}
+        running_per_table: Counter[tuple[str, str]] = Counter()
+
+        def _take_next_file() -> tuple[int, str, dict[str, Any]] | None:
+            for position, (_, _, target) in enumerate(pending_files):
+                if running_per_table[(target["schema"], target["table"])] < table_concurrency:
+                    return pending_files.pop(position)
+            return None
 
-                full_path = self.input_dir / file_name
-                if len(tasks) >= self.context.options.db_connections_per_process:
-                    # Wait for some restore to finish before adding a new one
-                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-                    exception = done.pop().exception()
-                    if exception is not None:
-                        await pool.close()
-                        raise exception
-                tasks.add(
-                    loop.create_task(
+        try:
+            while pending_files or tasks:
+                next_file = _take_next_file() if len(tasks) < connections_count else None
+                if next_file is not None:
+                    file_idx, file_name, target = next_file
+                    table = (target["schema"], target["table"])
+                    running_per_table[table] += 1
+                    schedule.task_started(file_idx)
+                    progress.task_started(file_name)
+                    task = asyncio.create_task(
                         self._restore_table_data(
                             pool=pool,
-                            dump_file=full_path,
+                            dump_file=self.input_dir / file_name,
                             schema_name=target["schema"],
                             table_name=target["table"],
                             transaction_snapshot_id=transaction_snapshot_id,
                         )
                     )
-                )
+                    tasks[task] = (table, file_idx)
+                    continue
 
-            # Wait for the remaining restores to finish
-            if tasks:
-                await asyncio.wait(tasks)
+                # Wait for some restore to finish before adding a new one
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for done_task in done:
+                    table, file_idx = tasks.pop(done_task)
+                    running_per_table[table] -= 1
+                    schedule.task_finished(file_idx)
+                    if exception := done_task.exception():
+                        for task in tasks:
+                            task.cancel()
+                        raise exception
+                    # Post-data of a table with a failed file is not restored early
+                    if done_task.result():
+                        self._post_data_file_loaded(table)
         finally:
             await pool.close()
 
+        progress.save(force=True)
+        self.context.logger.info("Restore data schedule: %s", schedule.get_result_summary())
+
     async def _restore_data(self, connection: Connection) -> None:
         if self.context.options.mode == AnonMode.SYNC_STRUCT_RESTORE:
             return
@@ -910,24 +1290,57 @@ class RestoreMode:
                 f"The number of restored rows ({restored_rows}) is different from the metadata ({dumped_rows})",
             )
 
-    async def _restore_pre_data(self) -> None:
+    async def _restore_pre_data(self, connection: Connection) -> None:
         if self._skip_pre_data_restore:
             self.context.logger.info("-------------> Skipped restore pre-data (pg_restore)")
             return
 
+        if self._is_stage_restored("pre-data"):
+            self.context.logger.info("-------------> Skipped restore pre-data (restored by the previous run)")
+            return
+
         self.context.logger.info("-------------> Started restore pre-data (pg_restore)")
         await self._run_pg_restore("pre-data")
+        await self._mark_stage_restored(connection, "pre-data")
         self.context.logger.info("<------------- Finished restore pre-data (pg_restore)")
 
-    async def _restore_post_data(self) -> None:
+    async def _restore_post_data(self, connection: Connection) -> None:
         if self._skip_post_data_restore:
             self.context.logger.info("-------------> Skipped restore post-data (pg_restore)")
             return
 
+        if self._is_stage_restored("post-data"):
+            self.context.logger.info("-------------> Skipped restore post-data (restored by the previous run)")
+            return
+
         self.context.logger.info("-------------> Started restore post-data (pg_restore)")
-        await self._run_pg_restore("post-data")
+        if self._post_data_pipelined:
+            await self._wait_post_data_pipeline()
+            await self._restore_post_data_rest()
+        else:
+            await self._run_pg_restore("post-data")
+        await self._mark_stage_restored(connection, "post-data")
         self.context.logger.info("<------------- Finished restore post-data (pg_restore)")
 
+    async def _restore_post_data_rest(self) -> None:
+        """Restore post-data entries which were not restored together with the data of their tables."""
+        rest_entries = set(self._post_data_rest_entries)
+        for entries in self._post_data_table_entries.values():
+            rest_entries.update(entries)
+
+        if not rest_entries or not self._toc_list_post_data_file_path:
+            return
+
+        # Keep the order of the TOC, pg_restore uses it for entries without dependencies
+        toc_lines = self._toc_list_post_data_file_path.read_text(encoding="utf-8").splitlines()
+        toc_path = self.input_dir / "toc_post_data_rest.list"
+        toc_path.write_text("\n".join(line for line in toc_lines if line in rest_entries) + "\n", encoding="utf-8")
+        try:
+            await self._run_pg_restore("post-data", toc_override=toc_path)
+        finally:
+            if not self.context.options.debug:
+                toc_path.unlink(missing_ok=True)
+
     async def _drop_database(self) -> None:
         if not self.context.options.drop_db:
             return
@@ -960,8 +1373,10 @@ class RestoreMode:
         if self.context.options.mode == AnonMode.SYNC_STRUCT_RESTORE:
             return
 
-        tables = [(table_info["schema"], table_info["table"]) for table_info in (self.metadata.files or {}).values()]
-        self.context.set_tables_lists(tables)
+        tables = dict.fromkeys(
+            (table_info["schema"], table_info["table"]) for table_info in (self.metadata.files or {}).values()
+        )
+        self.context.set_tables_lists(list(tables))
 
         if self._whitelist_active and not self.context.white_listed_tables:
             raise PgAnonError(ErrorCode.NO_TABLES_FOR_RESTORE, "None of the requested tables match the dump contents")
@@ -1085,11 +1500,16 @@ class RestoreMode:
                 self.context.connection_params, server_settings=self.context.server_settings
             )
 
-            await check_required_connections(connection, self.context.options.db_connections_per_process)
+            await check_required_connections(
+                connection, self.context.options.db_connections_per_process + self.context.options.post_data_workers
+            )
 
-            await self._check_db_is_empty(connection)
-            await self._check_no_extra_tables_in_target(connection)
+            await self._load_restore_journal(connection)
+            if not self._resuming:
+                await self._check_db_is_empty(connection)
+                await self._check_no_extra_tables_in_target(connection)
             self._check_utils_version_for_dump()
+            await self._start_restore_journal(connection)
 
             self.context.read_partial_tables_dicts()
             self._prepare_tables_lists()
@@ -1097,21 +1517,23 @@ class RestoreMode:
             await self._create_schemas_for_partial_mode(connection)
             await self._create_extensions_for_partial_mode(connection)
             await self._create_objects_from_ddl_for_partial_mode(connection)
-            self._make_filtered_toc_list()
+            await self._make_filtered_toc_list()
 
-            await self._restore_pre_data()
+            await self._restore_pre_data(connection)
             await self._drop_constraints(connection)
 
             await self._restore_data(connection)
 
-            await self._restore_post_data()
+            await self._restore_post_data(connection)
             await self._sequences_init(connection)
 
             await self.run_analyze()
+            await drop_restore_journal(connection)
             self._remove_toc_lists()
 
             self.context.logger.info("<------------- Finished restore")
         finally:
+            await self._stop_post_data_pipeline()
             if connection:
                 await connection.close()
 
@@ -6,7 +6,7 @@ from prettytable import PrettyTable, SINGLE_BORDER
 from pg_anon.common.db_utils import get_scan_fields_list
 from pg_anon.common.dto import FieldInfo
 from pg_anon.common.errors import ErrorCode, PgAnonError
-from pg_anon.common.utils import get_dict_rule_for_table
+from pg_anon.common.utils import RuleIndex
 from pg_anon.context import Context
 
 ORM_SCHEMA_KEY = "schema"
@@ -106,6 +106,7 @@ class ViewFieldsMode:
         self.context = context
         self._output_fields_limit: int | None = context.options.fields_count
         self._filter_dict_rule: dict | None = None
+        self._filter_rule_index: RuleIndex | None = None
         self.fields: list[FieldInfo] | None = None
         self.table: PrettyTable | None = None
         self.json: str | None = None
@@ -141,16 +142,12 @@ class ViewFieldsMode:
         if not has_schema and has_table:
             self._filter_dict_rule["schema_mask"] = "*"
 
+        self._filter_rule_index = RuleIndex([self._filter_dict_rule])
+
     def _check_by_filters(self, field: FieldInfo) -> bool:
-        if self._filter_dict_rule is None:
+        if self._filter_rule_index is None:
             return False
-        return bool(
-            get_dict_rule_for_table(
-                dictionary_rules=[self._filter_dict_rule],
-                schema=field.nspname,
-                table=field.relname,
-            )
-        )
+        return bool(self._filter_rule_index.find(field.nspname, field.relname))
 
     async def _get_fields_for_view(self) -> list[FieldInfo]:
         """Get scanning fields for view mode."""
@@ -186,18 +183,10 @@ class ViewFieldsMode:
         fields_with_find_rules = []
 
         for field in (self.fields or []).copy():
-            include_rule = get_dict_rule_for_table(
-                dictionary_rules=self.context.prepared_dictionary_obj["dictionary"],
-                schema=field.nspname,
-                table=field.relname,
-            )
+            include_rule = self.context.get_rule_index("dictionary").find(field.nspname, field.relname)
 
             if "dictionary_exclude" in self.context.prepared_dictionary_obj:
-                exclude_rule = get_dict_rule_for_table(
-                    dictionary_rules=self.context.prepared_dictionary_obj["dictionary_exclude"],
-                    schema=field.nspname,
-                    table=field.relname,
-                )
+                exclude_rule = self.context.get_rule_index("dictionary_exclude").find(field.nspname, field.relname)
 
                 if exclude_rule is not None and include_rule is None:
                     continue
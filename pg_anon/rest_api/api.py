@@ -11,6 +11,7 @@ from pg_anon.common.constants import (
     LOGS_DIR_NAME,
     RUNS_BASE_DIR,
     SAVED_DICTS_INFO_FILE_NAME,
+    SAVED_PROGRESS_FILE_NAME,
     SAVED_RUN_OPTIONS_FILE_NAME,
     SAVED_RUN_STATUS_FILE_NAME,
 )
@@ -325,6 +326,9 @@ async def stateless_operation_data(operation_run_dir: Annotated[Path, Depends(ge
     ):
         extra_data = {"dump_size": get_folder_size(run_options_data["output_dir"])}
 
+    progress_file_path = operation_run_dir / SAVED_PROGRESS_FILE_NAME
+    progress_data = read_json_file(progress_file_path) if progress_file_path.exists() else None
+
     return {
         "run_status": {
             "status_id": operation_status.value,
@@ -337,9 +341,30 @@ async def stateless_operation_data(operation_run_dir: Annotated[Path, Depends(ge
         "run_options": run_options_data,
         "dictionaries": saved_dicts_info_data,
         "extra_data": extra_data,
+        "progress": progress_data,
     }
 
 
+@app.get(
+    "/operation/{internal_operation_id}/progress",
+    tags=["Operations"],
+    summary="Progress of operation",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Operation run directory or progress file not found"},
+    },
+)
+async def stateless_operation_progress(operation_run_dir: Annotated[Path, Depends(get_operation_run_dir)]) -> dict:
+    """Return the data transfer progress of a dump or restore operation, including running ones."""
+    progress_file_path = operation_run_dir / SAVED_PROGRESS_FILE_NAME
+    if not progress_file_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Operation progress not found",
+        )
+
+    return read_json_file(progress_file_path)
+
+
 @app.get(
     "/operation/{internal_operation_id}/logs",
     tags=["Operations"],
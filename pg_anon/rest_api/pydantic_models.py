@@ -291,3 +291,4 @@ class OperationDataResponse(BaseModel):
     run_options: dict[str, Any]
     dictionaries: dict[str, Any]
     extra_data: dict[str, Any] | None = None
+    progress: dict[str, Any] | None = None
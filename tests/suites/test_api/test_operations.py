@@ -69,6 +69,34 @@ async def test_operation_details_404_for_unknown_id(api_client):
     assert resp.status == 404
 
 
+async def test_operation_progress_returns_finished_dump(
+    api_client,
+    api_source_db,
+    db_params,
+    webhook_recorder,
+):
+    success = await _dump_with_save(api_client, api_source_db, db_params, webhook_recorder)
+    op_id = success["internal_operation_id"]
+
+    resp = await api_client.get(f"/operation/{op_id}/progress")
+    assert resp.status == 200
+    progress = await resp.json()
+    assert progress["operation"] == "dump"
+    assert progress["percent"] == 100
+    assert progress["files_finished"] == progress["files_total"]
+    assert progress["rows"] > 0
+
+    resp = await api_client.get(f"/operation/{op_id}")
+    assert resp.status == 200
+    data = await resp.json()
+    assert data["progress"]["files_total"] == progress["files_total"]
+
+
+async def test_operation_progress_404_for_unknown_id(api_client):
+    resp = await api_client.get("/operation/no-such-operation-id-42/progress")
+    assert resp.status == 404
+
+
 async def test_operation_logs_returns_tail(
     api_client,
     api_source_db,
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import pytest
+
+from pg_anon.cli import build_run_options
+from pg_anon.common.constants import CLASSIFY_IN_WORKER_MIN_VALUES
+from pg_anon.common.dto import FieldInfo
+from pg_anon.context import Context
+from pg_anon.modes import create_dict as create_dict_module
+from pg_anon.modes.create_dict import CreateDictMode
+
+META_DICT = """
+{
+    "field": {"rules": []},
+    "data_const": {
+        "constants": ["Engineering"],
+        "partial_constants": ["secret"]
+    },
+    "data_regex": {"rules": [r"[A-Za-z0-9]+@[A-Za-z0-9-]+\\.[A-Za-z]{2,}"]},
+    "sens_pg_types": ["text"]
+}
+"""
+
+DATA_FUNC_META_DICT = """
+{
+    "field": {"rules": []},
+    "data_const": {"constants": ["Engineering"]},
+    "data_regex": {"rules": []},
+    "data_func": {
+        "text": [
+            {"scan_func": "public.is_default", "anon_func": "md5(\\"%s\\")", "n_count": 1},
+            {"scan_func": "public.is_email", "anon_func": "partial_email(\\"%s\\")", "n_count": 1}
+        ]
+    },
+    "sens_pg_types": ["text"],
+    "funcs": {"text": "md5(\\"%s\\")"}
+}
+"""
+
+SPARSE_FIELD_META_DICT = """
+{
+    "field": {"rules": []},
+    "data_const": {"constants": []},
+    "data_regex": {"rules": []},
+    "data_func": {
+        "text": [{"scan_func": "public.is_email", "anon_func": "partial_email(\\"%s\\")", "n_count": 3}]
+    },
+    "sens_pg_types": ["text"],
+    "funcs": {"text": "md5(\\"%s\\")"}
+}
+"""
+
+
+def _create_dict_mode(tmp_path, processes: int = 1, meta_dict: str = META_DICT) -> CreateDictMode:
+    meta_dict_file = tmp_path / "meta_dict.py"
+    meta_dict_file.write_text(meta_dict, encoding="utf-8")
+    context = Context(
+        build_run_options(
+            [
+                "create-dict",
+                "--db-host=localhost",
+                "--db-name=db",
+                "--db-user=user",
+                f"--meta-dict-file={meta_dict_file}",
+                f"--output-sens-dict-file={tmp_path / 'sens_dict.py'}",
+                f"--processes={processes}",
+            ]
+        )
+    )
+    context.read_meta_dict()
+    return CreateDictMode(context)
+
+
+@pytest.fixture
+def create_dict_mode(tmp_path) -> CreateDictMode:
+    return _create_dict_mode(tmp_path)
+
+
+def _field_info() -> FieldInfo:
+    return FieldInfo(
+        nspname="public", relname="users", column_name="info", type="text", oid=0, attnum=1, obj_id="0", tbl_id="0"
+    )
+
+
+async def _check(mode: CreateDictMode, values: list[str], field_info: FieldInfo | None = None) -> dict:
+    field_info = field_info or _field_info()
+    return await mode._check_sensitive_data_in_fld(  # noqa: SLF001
+        connection=None,
+        name="test",
+        dictionary_obj=mode.context.meta_dictionary_obj,
+        create_dict_matches={},
+        field_info=field_info,
+        fld_data=values,
+    )
+
+
+async def _check_values(mode: CreateDictMode, values: list[str]) -> list:
+    return await mode._classify_values(values, screened=False, check_regex=True)  # noqa: SLF001
+
+
+@pytest.mark.parametrize(
+    ("values", "expected_stages", "hit_stage"),
+    [
+        (["Engineering"], ["data_const"], "data_const"),
+        (["top secret"], ["data_const", "data_partial_const"], "data_partial_const"),
+        (["user@example.com"], ["data_const", "data_partial_const", "data_regex"], "data_regex"),
+        (["nothing"], ["data_const", "data_partial_const", "data_regex"], None),
+    ],
+)
+async def test_checks_stop_at_first_hit(create_dict_mode, values, expected_stages, hit_stage) -> None:
+    result = await _check(create_dict_mode, values)
+
+    assert bool(result) == (hit_stage is not None)
+    summary = create_dict_mode.get_checks_summary()
+    assert list(summary) == expected_stages
+    assert {stage for stage, stats in summary.items() if stats["hits"]} == ({hit_stage} if hit_stage else set())
+
+
+async def test_checks_stats_are_accumulated(create_dict_mode) -> None:
+    await _check(create_dict_mode, ["Engineering"])
+    await _check(create_dict_mode, ["nothing"])
+
+    stats = create_dict_mode.get_checks_summary()["data_const"]
+    assert (stats["calls"], stats["hits"]) == (2, 1)
+    assert stats["seconds"] >= 0
+
+
+async def test_checks_in_worker_processes_give_same_results(tmp_path) -> None:
+    values = [f"value {idx}" for idx in range(CLASSIFY_IN_WORKER_MIN_VALUES)]
+    batches = [values, [*values, "top secret"], [*values, "user@example.com"], [*values, "Engineering"]]
+
+    local_mode = _create_dict_mode(tmp_path)
+    expected = [[result[:2] for result in await _check_values(local_mode, batch)] for batch in batches]
+
+    worker_mode = _create_dict_mode(tmp_path, processes=2)
+    worker_mode._start_classify_workers()  # noqa: SLF001
+    try:
+        actual = [[result[:2] for result in await _check_values(worker_mode, batch)] for batch in batches]
+    finally:
+        worker_mode._stop_classify_workers()  # noqa: SLF001
+
+    assert actual == expected
+    assert [checks[-1][1] is not None for checks in actual] == [False, True, True, True]
+
+
+@pytest.fixture
+def scan_func_calls(monkeypatch) -> list[str]:
+    calls: list[str] = []
+
+    async def _exec_data_scan_func_query(connection, scan_func, values, field_info, max_matches) -> int:  # noqa: ARG001
+        calls.append(scan_func)
+        return int(scan_func == "public.is_email" and any("@" in value for value in values))
+
+    monkeypatch.setattr(create_dict_module, "exec_data_scan_func_query", _exec_data_scan_func_query)
+    return calls
+
+
+@pytest.mark.parametrize(
+    ("values", "expected_calls", "expected_rule"),
+    [
+        # not matched by constants: all data functions are checked
+        (["user@example.com"], ["public.is_default", "public.is_email"], 'partial_email("%s")'),
+        (["nothing"], ["public.is_default", "public.is_email"], None),
+        # matched by constants: only data functions giving another anonymization function are checked
+        (["Engineering"], ["public.is_email"], None),
+        (["Engineering", "user@example.com"], ["public.is_email"], 'partial_email("%s")'),
+    ],
+)
+async def test_data_functions_after_match_only_change_anon_func(
+    tmp_path, scan_func_calls, values, expected_calls, expected_rule
+) -> None:
+    mode = _create_dict_mode(tmp_path, meta_dict=DATA_FUNC_META_DICT)
+    field_info = _field_info()
+
+    result = await _check(mode, values, field_info)
+
+    assert bool(result) == (values != ["nothing"])
+    assert scan_func_calls == expected_calls
+    assert field_info.rule == expected_rule
+
+
+class _FetchConnection:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    async def fetch(self, query: str) -> list:  # noqa: ARG002
+        return self.rows
+
+
+async def test_sparse_field_matches_are_counted_over_both_samples(tmp_path, monkeypatch) -> None:
+    async def _exec_data_scan_func_query(connection, scan_func, values, field_info, max_matches) -> int:  # noqa: ARG001
+        return min(sum("@" in value for value in values), max_matches)
+
+    monkeypatch.setattr(create_dict_module, "exec_data_scan_func_query", _exec_data_scan_func_query)
+    mode = _create_dict_mode(tmp_path, meta_dict=SPARSE_FIELD_META_DICT)
+    field_info = _field_info()
+
+    # Two matches in the table sample and two in the sample of the field, one of them already seen
+    table_rows = [("a@example.com",), ("b@example.com",), (None,), (None,)]
+    field_rows = [("b@example.com",), ("c@example.com",), ("nothing",)]
+    result = await mode._sample_sparse_fields(  # noqa: SLF001
+        connection=_FetchConnection(field_rows),
+        name="test",
+        fields_info={0: field_info},
+        rows=table_rows,
+        found={},
+        scan_partial_rows=len(table_rows),
+        condition=None,
+        reltuples=0,
+    )
+
+    assert field_info.obj_id in result
+    assert field_info.rule == 'partial_email("%s")'
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from .conftest import input_dict, output_path
 from pg_anon import PgAnonApp
 from pg_anon.cli import build_run_options
+from pg_anon.common.constants import DEFAULT_PROCESSES
 from pg_anon.common.enums import ResultCode
 
 
@@ -198,3 +201,32 @@ async def test_seq_init_by_max_value_resets_sequences(
         f"--seq-init-by-max-value must reset hr.employee_id_seq past source max; "
         f"max(src.id)={src_max_id}, new id={new_id}"
     )
+
+
+def test_table_restore_concurrency_must_not_be_negative(capsys):
+    args = ["restore", "--db-host=localhost", "--db-name=db", "--db-user=user", "--input-dir=dump"]
+
+    assert build_run_options([*args, "--table-restore-concurrency=0"]).table_restore_concurrency == 0
+    with pytest.raises(SystemExit):
+        build_run_options([*args, "--table-restore-concurrency=-1"])
+    assert "must be 0 or greater" in capsys.readouterr().err
+
+
+def test_dump_runs_in_main_process_by_default():
+    args = ["--db-host=localhost", "--db-name=db", "--db-user=user"]
+
+    dump_args = ["dump", *args, "--prepared-sens-dict-file=sens_dict.py"]
+    scan_args = ["create-dict", *args, "--meta-dict-file=meta_dict.py", "--output-sens-dict-file=sens_dict.py"]
+
+    assert build_run_options(dump_args).processes == 1
+    assert build_run_options([*dump_args, "--processes=3"]).processes == 3
+    assert build_run_options(scan_args).processes == DEFAULT_PROCESSES
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_restore_buffer_size_must_be_positive(value, capsys):
+    args = ["restore", "--db-host=localhost", "--db-name=db", "--db-user=user", "--input-dir=dump"]
+
+    with pytest.raises(SystemExit):
+        build_run_options([*args, f"--restore-buffer-size={value}"])
+    assert "must be" in capsys.readouterr().err
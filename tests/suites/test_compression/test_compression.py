@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from pg_anon.common.compression import get_metadata_compression, parse_compression
+from pg_anon.common.errors import ErrorCode, PgAnonError
+
+
+@pytest.mark.parametrize(
+    ("spec", "codec", "level", "extension"),
+    [
+        ("gzip", "gzip", None, ".bin.gz"),
+        ("gz:6", "gzip", 6, ".bin.gz"),
+        ("zstd:3", "zstd", 3, ".bin.zst"),
+        ("LZ4", "lz4", None, ".bin.lz4"),
+        ("none", "none", None, ".bin"),
+    ],
+)
+def test_parse_compression(spec: str, codec: str, level: int | None, extension: str) -> None:
+    compression = parse_compression(spec)
+
+    assert compression.to_dict() == {"codec": codec, "level": level}
+    assert compression.extension == extension
+
+
+@pytest.mark.parametrize("spec", ["brotli", "gzip:10", "gzip:fast", "none:1", "zstd:0"])
+def test_parse_invalid_compression(spec: str) -> None:
+    with pytest.raises(PgAnonError) as exc_info:
+        parse_compression(spec)
+
+    assert exc_info.value.code == ErrorCode.UNSUPPORTED_COMPRESSION
+
+
+def test_metadata_without_compression_is_gzip() -> None:
+    assert str(get_metadata_compression(None)) == "gzip:1"
+
+
+@pytest.mark.parametrize(
+    ("spec", "module"),
+    [
+        ("gzip:1", None),
+        ("zstd:3", "zstandard"),
+        ("lz4", "lz4.frame"),
+        ("none", None),
+    ],
+)
+def test_compression_round_trip(tmp_path, spec: str, module: str | None) -> None:
+    if module:
+        pytest.importorskip(module)
+
+    data = os.urandom(4096) + b"pg_anon" * 100_000
+    compression = parse_compression(spec)
+    file_path = tmp_path / f"data{compression.extension}"
+
+    with compression.open_writer(file_path) as writer:
+        for offset in range(0, len(data), 65536):
+            writer.write(data[offset : offset + 65536])
+
+    with get_metadata_compression(compression.to_dict()).open_reader(file_path) as reader:
+        assert reader.read() == data
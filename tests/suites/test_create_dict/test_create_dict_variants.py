@@ -3,13 +3,16 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from .conftest import input_dict, output_dict
 from pg_anon import PgAnonApp
 from pg_anon.cli import build_run_options
-from pg_anon.common.enums import ResultCode
+from pg_anon.common.db_queries import get_table_sample_clause
+from pg_anon.common.enums import ResultCode, ScanSampleMethod
 
 
-def _options(db_params, db_name, *, meta_dicts, sens_out, no_sens_out=None):
+def _options(db_params, db_name, *, meta_dicts, sens_out, no_sens_out=None, extra_args=()):
     args = [
         "create-dict",
         f"--db-host={db_params.test_db_host}",
@@ -27,6 +30,7 @@ def _options(db_params, db_name, *, meta_dicts, sens_out, no_sens_out=None):
     ]
     if no_sens_out is not None:
         args.append(f"--output-no-sens-dict-file={no_sens_out}")
+    args.extend(extra_args)
     return build_run_options(args)
 
 
@@ -127,6 +131,162 @@ async def test_variant_words_and_phrases_constants(source_db, db_params):
     )
 
 
+@pytest.mark.parametrize(
+    "meta_dict",
+    [
+        "meta_partial_constants.py",
+        "meta_words_and_phrases.py",
+        "meta_data_sql_condition.py",
+        "meta_include_skip_with_masks.py",
+        "meta_data_func.py",
+    ],
+)
+async def test_variant_server_filter_gives_same_dictionary(source_db, db_params, meta_dict):
+    results = []
+    for extra_args in ((), ("--scan-server-filter",)):
+        sens_out = output_dict(f"variant_server_filter_{len(extra_args)}_{meta_dict}.json")
+        res = await PgAnonApp(
+            _options(
+                db_params,
+                source_db,
+                meta_dicts=[input_dict(meta_dict)],
+                sens_out=sens_out,
+                extra_args=extra_args,
+            )
+        ).run()
+        assert res.result_code == ResultCode.DONE
+        results.append(_rules_index(_load(sens_out)))
+
+    client_side, server_side = results
+    assert server_side == client_side
+
+
+@pytest.mark.parametrize(
+    "meta_dict",
+    [
+        "meta_words_and_phrases.py",
+        "meta_data_sql_condition.py",
+        "meta_data_func.py",
+    ],
+)
+async def test_variant_stats_prescan_gives_same_dictionary(source_db, db_params, db_manager, meta_dict):
+    await db_manager.execute(source_db, "ANALYZE")
+
+    results = []
+    for extra_args in ((), ("--scan-use-stats",)):
+        sens_out = output_dict(f"variant_stats_{len(extra_args)}_{meta_dict}.json")
+        res = await PgAnonApp(
+            _options(
+                db_params,
+                source_db,
+                meta_dicts=[input_dict(meta_dict)],
+                sens_out=sens_out,
+                extra_args=extra_args,
+            )
+        ).run()
+        assert res.result_code == ResultCode.DONE
+        results.append(_rules_index(_load(sens_out)))
+
+    scanned, prescanned = results
+    assert prescanned == scanned
+
+
+@pytest.mark.parametrize("sample_method", ["limit", "system", "bernoulli", "system_rows"])
+async def test_variant_partial_scan_sample_method(source_db, db_params, db_manager, sample_method):
+    await db_manager.execute(source_db, "CREATE EXTENSION IF NOT EXISTS tsm_system_rows")
+    await db_manager.execute(source_db, "ANALYZE")
+
+    sens_out = output_dict(f"variant_sample_method_{sample_method}.json")
+    res = await PgAnonApp(
+        _options(
+            db_params,
+            source_db,
+            meta_dicts=[input_dict("meta_words_and_phrases.py")],
+            sens_out=sens_out,
+            extra_args=("--scan-mode=partial", f"--scan-sample-method={sample_method}"),
+        )
+    ).run()
+    assert res.result_code == ResultCode.DONE
+
+    idx = _rules_index(_load(sens_out))
+    assert "name" in idx.get(("hr", "department"), {}), f"{sample_method} sample should hit hr.department.name"
+
+
+async def test_variant_partial_scan_samples_sparse_field_again(source_db, db_params, db_manager):
+    # The first rows have only "note", the sensitive constant of "secret" appears after the --scan-partial-rows rows
+    await db_manager.execute(
+        source_db,
+        """
+        CREATE TABLE public.sparse_scan (id int, note text, secret text);
+        INSERT INTO public.sparse_scan
+        SELECT i, 'note ' || i, CASE WHEN i > 900 THEN 'Engineering' END FROM generate_series(1, 1000) AS i;
+        """,
+    )
+    try:
+        sens_out = output_dict("variant_sparse_field.json")
+        res = await PgAnonApp(
+            _options(
+                db_params,
+                source_db,
+                meta_dicts=[input_dict("meta_words_and_phrases.py")],
+                sens_out=sens_out,
+                extra_args=("--scan-mode=partial", "--scan-partial-rows=100"),
+            )
+        ).run()
+        assert res.result_code == ResultCode.DONE
+
+        fields = _rules_index(_load(sens_out)).get(("public", "sparse_scan"), {})
+        assert "secret" in fields, f"sparse field public.sparse_scan.secret should be sampled again; got {fields}"
+        assert "note" not in fields
+    finally:
+        await db_manager.execute(source_db, "DROP TABLE public.sparse_scan")
+
+
+@pytest.mark.parametrize(
+    ("sample_method", "limit", "reltuples", "expected"),
+    [
+        (ScanSampleMethod.LIMIT, 100, 1_000_000, ""),
+        (ScanSampleMethod.SYSTEM, 100, 1_000_000, "TABLESAMPLE SYSTEM (0.02)"),
+        (ScanSampleMethod.BERNOULLI, 100, 1_000_000, "TABLESAMPLE BERNOULLI (0.02)"),
+        (ScanSampleMethod.BERNOULLI, 100, 150, "TABLESAMPLE BERNOULLI (100)"),
+        (ScanSampleMethod.SYSTEM, 100, 100, ""),
+        (ScanSampleMethod.SYSTEM, 100, 0, ""),
+        (ScanSampleMethod.SYSTEM_ROWS, 100, 0, "TABLESAMPLE SYSTEM_ROWS (100)"),
+    ],
+)
+def test_table_sample_clause(sample_method, limit, reltuples, expected):
+    assert get_table_sample_clause(sample_method, limit, reltuples) == expected
+
+
+async def test_variant_scan_state_reuses_verdicts(source_db, db_params):
+    state_file = output_dict("variant_scan_state.json")
+    Path(state_file).unlink(missing_ok=True)
+
+    results = []
+    for run in range(2):
+        sens_out = output_dict(f"variant_scan_state_{run}.json")
+        res = await PgAnonApp(
+            _options(
+                db_params,
+                source_db,
+                meta_dicts=[input_dict("meta_data_func.py")],
+                sens_out=sens_out,
+                extra_args=(f"--scan-state-file={state_file}",),
+            )
+        ).run()
+        assert res.result_code == ResultCode.DONE
+        results.append(_rules_index(_load(sens_out)))
+
+    first_run, second_run = results
+    assert second_run == first_run
+
+    state = _load(state_file)
+    assert state["fields"], "verdicts of scanned fields must be saved"
+    assert any(field["sensitive"] and field["rule"] for field in state["fields"].values()), (
+        "anon_func of data_func rules must be saved with the verdict"
+    )
+
+
 async def test_variant_data_sql_condition_does_not_break_scan(source_db, db_params):
     sens_out = output_dict("variant_data_sql_condition.json")
     res = await PgAnonApp(
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import filecmp
+import json
 from pathlib import Path
 
-from tests.infrastructure.assertions import check_list_tables, check_rows_count, list_tables
+from tests.infrastructure.assertions import check_list_tables, check_rows_count, diff_catalog, list_tables
 
 from .conftest import input_dict, output_path
 from pg_anon import PgAnonApp
@@ -410,3 +411,259 @@ async def test_restore_with_save_dicts_snapshots_inputs(
     assert filecmp.cmp(snapshot_exclude, partial_exclude, shallow=False), (
         "partial-tables-exclude-dict snapshot differs from original"
     )
+
+
+async def test_chunked_dump_and_parallel_table_restore(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    await db_manager.execute(
+        source_db,
+        """
+        CREATE TABLE hr.chunked_big AS
+        SELECT g AS id, repeat(md5(g::text), 8) AS payload
+        FROM generate_series(1, 20000) g
+        """,
+    )
+    try:
+        out = output_path("dump_chunks")
+        res = await _dump(
+            pg_anon_runner,
+            db_params,
+            source_db,
+            out_dir=out,
+            dict_file=input_dict("full_sens.py"),
+            extra=["--dump-chunk-size=1"],
+        )
+        assert res.result_code == ResultCode.DONE
+
+        metadata = json.loads((Path(out) / "metadata.json").read_text())
+        chunks = [info for info in metadata["files"].values() if info["table"] == "chunked_big"]
+        assert len(chunks) > 1
+        assert all("chunk" in info for info in chunks)
+        assert sum(int(info["rows"]) for info in chunks) == 20000
+
+        res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out, extra=["--table-restore-concurrency=2"])
+        assert res.result_code == ResultCode.DONE
+
+        assert await check_rows_count(db_manager, target_db, [["hr", "chunked_big", 20000]])
+    finally:
+        await db_manager.execute(source_db, "DROP TABLE hr.chunked_big")
+
+
+async def test_restore_with_post_data_workers_restores_all_objects(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("post_data_workers")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out, extra=["--post-data-workers=2"])
+    assert res.result_code == ResultCode.DONE
+
+    expected = await list_tables(db_manager, source_db)
+    assert await check_list_tables(db_manager, target_db, expected)
+    assert await diff_catalog(db_manager, source_db, target_db) == {}
+
+
+async def test_post_data_workers_skip_table_with_failed_file(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("post_data_workers_failed_file")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    # Break a data file of a table with indexes
+    indexes_query = (
+        "SELECT schemaname, tablename FROM pg_indexes WHERE schemaname NOT IN ('pg_catalog', 'information_schema')"
+    )
+    indexed_tables = {(row["schemaname"], row["tablename"]) for row in await db_manager.fetch(source_db, indexes_query)}
+    metadata = json.loads((Path(out) / "metadata.json").read_text())
+    broken_name = max(
+        (name for name, info in metadata["files"].items() if (info["schema"], info["table"]) in indexed_tables),
+        key=lambda name: int(metadata["files"][name]["rows"]),
+    )
+    broken_file = Path(out) / broken_name
+    broken_file.write_bytes(broken_file.read_bytes()[: broken_file.stat().st_size // 2])
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out, extra=["--post-data-workers=2"])
+    assert res.result_code == ResultCode.FAIL
+
+    broken_table = (metadata["files"][broken_name]["schema"], metadata["files"][broken_name]["table"])
+    target_indexed_tables = {
+        (row["schemaname"], row["tablename"]) for row in await db_manager.fetch(target_db, indexes_query)
+    }
+    assert broken_table not in target_indexed_tables
+
+
+async def test_dump_in_single_process_preserves_all_tables(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("dump_single_process")
+    res = await _dump(
+        pg_anon_runner,
+        db_params,
+        source_db,
+        out_dir=out,
+        dict_file=input_dict("full_sens.py"),
+        extra=["--processes=1"],
+    )
+    assert res.result_code == ResultCode.DONE
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out)
+    assert res.result_code == ResultCode.DONE
+
+    expected = await list_tables(db_manager, source_db)
+    assert await check_list_tables(db_manager, target_db, expected)
+
+
+async def test_resumed_dump_keeps_journaled_files(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("dump_resume")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    # Simulate a dump interrupted before the last data file was completed
+    journal_path = Path(out) / "dump_journal.jsonl"
+    header, *entries = journal_path.read_text().splitlines()
+    lost_entry = json.loads(entries[-1])
+    journal_path.write_text("\n".join([header, *entries[:-1]]) + "\n")
+    (Path(out) / lost_entry["file"]).unlink()
+    kept_file = Path(out) / json.loads(entries[0])["file"]
+    kept_mtime = kept_file.stat().st_mtime_ns
+
+    res = await _dump(
+        pg_anon_runner,
+        db_params,
+        source_db,
+        out_dir=out,
+        dict_file=input_dict("full_sens.py"),
+        extra=["--resume"],
+    )
+    assert res.result_code == ResultCode.DONE
+    assert (Path(out) / lost_entry["file"]).exists()
+    assert kept_file.stat().st_mtime_ns == kept_mtime
+
+    metadata = json.loads((Path(out) / "metadata.json").read_text())
+    assert metadata["consistency"]["single_snapshot"] is False
+    assert metadata["consistency"]["dump_sessions"] == 2
+    assert metadata["consistency"]["resumed_files"] == len(entries) - 1
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out)
+    assert res.result_code == ResultCode.DONE
+
+    expected = await list_tables(db_manager, source_db)
+    assert await check_list_tables(db_manager, target_db, expected)
+
+
+async def test_resumed_dump_redumps_corrupted_files(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("dump_resume_corrupted")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    # Damage the largest data file without changing its size
+    entries = [json.loads(line) for line in (Path(out) / "dump_journal.jsonl").read_text().splitlines()[1:]]
+    corrupted_file = max((Path(out) / entry["file"] for entry in entries), key=lambda path: path.stat().st_size)
+    data = bytearray(corrupted_file.read_bytes())
+    data[len(data) // 2] ^= 0xFF
+    corrupted_file.write_bytes(data)
+
+    res = await _dump(
+        pg_anon_runner,
+        db_params,
+        source_db,
+        out_dir=out,
+        dict_file=input_dict("full_sens.py"),
+        extra=["--resume"],
+    )
+    assert res.result_code == ResultCode.DONE
+    assert corrupted_file.read_bytes() != data
+
+    metadata = json.loads((Path(out) / "metadata.json").read_text())
+    assert metadata["consistency"]["resumed_files"] < len(entries)
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out)
+    assert res.result_code == ResultCode.DONE
+
+    expected = await list_tables(db_manager, source_db)
+    assert await check_list_tables(db_manager, target_db, expected)
+
+
+async def test_resume_with_changed_compression_fails(
+    source_db,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("dump_resume_mismatch")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    res = await _dump(
+        pg_anon_runner,
+        db_params,
+        source_db,
+        out_dir=out,
+        dict_file=input_dict("full_sens.py"),
+        extra=["--resume", "--compression=none"],
+    )
+    assert res.result_code == ResultCode.FAIL
+
+
+async def test_resumed_restore_loads_only_missing_files(
+    source_db,
+    target_db,
+    db_manager,
+    db_params,
+    pg_anon_runner,
+):
+    out = output_path("restore_resume")
+    res = await _dump(pg_anon_runner, db_params, source_db, out_dir=out, dict_file=input_dict("full_sens.py"))
+    assert res.result_code == ResultCode.DONE
+
+    # Break one data file, so the first restore fails on the rows count check
+    metadata = json.loads((Path(out) / "metadata.json").read_text())
+    broken_file = Path(out) / max(metadata["files"], key=lambda name: int(metadata["files"][name]["rows"]))
+    original_content = broken_file.read_bytes()
+    broken_file.write_bytes(original_content[: len(original_content) // 2])
+
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out)
+    assert res.result_code == ResultCode.FAIL
+
+    journal = await db_manager.fetch(target_db, "SELECT item FROM anon_restore_journal.journal")
+    journal_items = {row["item"] for row in journal}
+    assert "stage:pre-data" in journal_items
+    assert f"file:{broken_file.name}" not in journal_items
+
+    broken_file.write_bytes(original_content)
+    res = await _restore(pg_anon_runner, db_params, target_db, in_dir=out, extra=["--resume"])
+    assert res.result_code == ResultCode.DONE
+
+    expected = await list_tables(db_manager, source_db)
+    assert await check_list_tables(db_manager, target_db, expected)
+    assert not await db_manager.fetch(target_db, "SELECT 1 FROM pg_namespace WHERE nspname = 'anon_restore_journal'")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pg_anon.common.journal import Journal
+
+
+def test_journal_round_trip(tmp_path) -> None:
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.start({"version": 1})
+    journal.append({"file": "a.bin.gz", "rows": "10"})
+    journal.append({"file": "b.bin.gz", "rows": "20"})
+
+    loaded = Journal(tmp_path / "journal.jsonl")
+    loaded.load()
+
+    assert loaded.header == {"version": 1}
+    assert [entry["file"] for entry in loaded.entries] == ["a.bin.gz", "b.bin.gz"]
+
+
+def test_journal_ignores_torn_last_line(tmp_path) -> None:
+    journal_path = tmp_path / "journal.jsonl"
+    journal = Journal(journal_path)
+    journal.start({"version": 1}, [{"file": "a.bin.gz"}])
+    with journal_path.open("a") as journal_file:
+        journal_file.write('{"file": "b.bi')
+
+    journal.load()
+
+    assert journal.header == {"version": 1}
+    assert journal.entries == [{"file": "a.bin.gz"}]
+
+
+def test_journal_start_replaces_entries(tmp_path) -> None:
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.start({"sessions": 1}, [{"file": "a.bin.gz"}, {"file": "b.bin.gz"}])
+    journal.start({"sessions": 2}, [{"file": "b.bin.gz"}])
+
+    journal.load()
+
+    assert journal.header == {"sessions": 2}
+    assert journal.entries == [{"file": "b.bin.gz"}]
+
+
+def test_missing_journal(tmp_path) -> None:
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.load()
+
+    assert not journal.exists
+    assert journal.header is None
+    assert journal.entries == []
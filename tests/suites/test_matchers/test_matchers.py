@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from pg_anon.common.matchers import get_posix_regex, get_required_literal, RegexMatcher, SubstringMatcher
+from pg_anon.common.utils import safe_compile
+
+RULES = [
+    r"\d{3}-\d{2}-\d{4}",
+    r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[a-z]{2,}",
+    r"(?i)^secret",
+    r"(ab)\1",
+    r"(?P<card>\d{4}) \d{4}",
+    r"line\nbreak",
+    r"[invalid",
+]
+
+
+@pytest.fixture
+def matcher() -> RegexMatcher:
+    return RegexMatcher([safe_compile(rule, re.DOTALL) for rule in RULES])
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_rule"),
+    [
+        ("ssn 123-45-6789", r"\d{3}-\d{2}-\d{4}"),
+        ("write to john@example.com", r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[a-z]{2,}"),
+        ("SECRET value", r"(?i)^secret"),
+        ("xxababyy", r"(ab)\1"),
+        ("card 1234 5678", r"(?P<card>\d{4}) \d{4}"),
+        ("line\nbreak", r"line\nbreak"),
+        ("nothing here", None),
+    ],
+)
+def test_matcher_names_matched_rule(matcher, value, expected_rule) -> None:
+    rule = matcher.search(value)
+
+    assert (rule.pattern if rule else None) == expected_rule
+
+
+def test_matcher_agrees_with_search_by_every_rule(matcher) -> None:
+    values = ["123-45-6789", "abab", "no match", "Secret", "not secret", "a@b.io", "1234 5678", "line\nbreak", ""]
+
+    for value in values:
+        expected = any(re.search(pattern, value) for pattern in matcher.patterns)
+        assert (matcher.search(value) is not None) == expected, value
+
+
+def test_matcher_keeps_pattern_flags() -> None:
+    matcher = RegexMatcher([re.compile("abc", re.IGNORECASE), re.compile("a.c")])
+
+    assert matcher.search("ABC").pattern == "abc"
+    assert matcher.search("a\nc") is None
+
+
+def test_matcher_without_patterns() -> None:
+    assert RegexMatcher([]).search("value") is None
+
+
+FIELD_RULES = [
+    r"^(?i:e-?mail)$",
+    r"phone",
+    r"(ab)\1",
+    r"(?i)^passw",
+    r"_name$",
+    r"[invalid",
+]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected_rule"),
+    [
+        ("EMail", r"^(?i:e-?mail)$"),
+        ("mobile_phone", r"phone"),
+        ("xabab", r"(ab)\1"),
+        ("PASSWORD", r"(?i)^passw"),
+        ("first_name_phone", r"phone"),
+        ("last_name", r"_name$"),
+        ("id", None),
+    ],
+)
+def test_matcher_names_first_matched_field_rule(value, expected_rule) -> None:
+    matcher = RegexMatcher([safe_compile(rule) for rule in FIELD_RULES])
+
+    rule = matcher.search(value)
+
+    assert (rule.pattern if rule else None) == expected_rule
+
+
+def test_matcher_agrees_with_search_by_every_field_rule() -> None:
+    patterns = [safe_compile(rule) for rule in FIELD_RULES]
+    matcher = RegexMatcher(patterns)
+    values = ["email", "e-mail", "emails", "phone", "abab", "Passwd", "my_passwd", "_name", "name", ""]
+
+    for value in values:
+        expected = next((pattern for pattern in patterns if pattern.search(value)), None)
+        assert matcher.search(value) is expected, value
+
+
+@pytest.mark.parametrize(
+    ("rule", "expected_literal"),
+    [
+        (r"[a-z]+@[a-z]+\.[a-z]{2,}", "@"),
+        (r"https?://\S+", "http"),
+        (r"(?:\d{1,3}\.){3}\d{1,3}", "."),
+        (r"(abc)?\d+", None),
+        (r"\d{16}", None),
+        (r"(?i)secret", None),
+        (r"x(?i:abc)", "x"),
+        (r"foo|bar", None),
+    ],
+)
+def test_required_literal(rule, expected_literal) -> None:
+    assert get_required_literal(re.compile(rule)) == expected_literal
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("john smith lives here", "john smith"),
+        ("mr. smithson", "smith"),
+        ("ushers", "she"),
+        ("hers", "he"),
+        ("nothing", None),
+        ("", None),
+    ],
+)
+def test_substring_matcher(text, expected) -> None:
+    matcher = SubstringMatcher(["john smith", "smith", "she", "he", "his"])
+
+    assert matcher.search(text) == expected
+
+
+def test_substring_matcher_agrees_with_in_operator() -> None:
+    strings = ["abc", "bcd", "cde", "aab", "b c", "dddd"]
+    matcher = SubstringMatcher(strings)
+
+    for text in ["xxabcxx", "bcd", "aaab", "ab cd", "dddcdddd", "zzz", "b", "cdcdc"]:
+        found = matcher.search(text)
+        if found is None:
+            assert not any(string in text for string in strings), text
+        else:
+            assert found in strings
+            assert found in text
+
+
+def test_substring_matcher_without_strings() -> None:
+    assert SubstringMatcher([]).search("value") is None
+
+
+@pytest.mark.parametrize(
+    ("rule", "expected_regex"),
+    [
+        (r"\d{3}-\d{2}", r"(?:\d){3,3}-(?:\d){2,2}"),
+        (r"\bfoo\b", r"\yfoo\y"),
+        (r"^[a-z._-]+@x\.com$", r"^(?:[a-z._\-]){1,}@x\.com(?=\n?$)"),
+        (r"(?i)secret", r"(?i)secret"),
+        (r"(?:ab|cd)+?", r"(?:(?:ab|cd)){1,}"),
+        (r"(?<!\d)\D", r"(?<!\d)\D"),
+        (r"(ab)\1", None),
+        (r"(?>ab)", None),
+        (r"a{1000}", None),
+        (r"(?m)^a", None),
+        (r"[^\S]", None),
+    ],
+)
+def test_posix_regex(rule, expected_regex) -> None:
+    assert get_posix_regex(re.compile(rule, re.DOTALL)) == expected_regex
+
+
+def test_posix_regex_requires_dotall() -> None:
+    assert get_posix_regex(re.compile("a.b")) is None
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import random
+import string
+import time
+
+import pytest
+
+from pg_anon.common.matchers import SubstringMatcher
+
+# Excluded from the default test run; run explicitly with `pytest -m stress`.
+pytestmark = pytest.mark.stress
+
+CONSTANTS_COUNT = 10_000
+VALUES_COUNT = 100_000
+# Scanning by every constant is too slow for all values, so it is measured on a sample and extrapolated
+NAIVE_SAMPLE_SIZE = 2_000
+EXPECTED_MIN_SPEEDUP = 10
+
+
+def _random_word(rnd: random.Random, min_length: int, max_length: int) -> str:
+    return "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(min_length, max_length)))
+
+
+def test_substring_matcher_speedup_on_10k_constants_and_100k_values() -> None:
+    rnd = random.Random(42)  # noqa: S311
+    constants = sorted({f"{_random_word(rnd, 5, 14)} {_random_word(rnd, 4, 10)}" for _ in range(CONSTANTS_COUNT)})
+    values = [" ".join(_random_word(rnd, 3, 10) for _ in range(8)) for _ in range(VALUES_COUNT)]
+    for idx, constant in enumerate(rnd.sample(constants, 50)):
+        values[idx * (VALUES_COUNT // 50)] += f" {constant}"
+
+    matcher = SubstringMatcher(constants)
+    started = time.perf_counter()
+    matched = [matcher.search(value) for value in values]
+    matcher_elapsed = time.perf_counter() - started
+
+    sample = values[:NAIVE_SAMPLE_SIZE]
+    started = time.perf_counter()
+    naive_matched = [next((constant for constant in constants if constant in value), None) for value in sample]
+    naive_elapsed = (time.perf_counter() - started) * VALUES_COUNT / NAIVE_SAMPLE_SIZE
+
+    assert sum(found is not None for found in matched) == 50
+    assert [found is not None for found in matched[:NAIVE_SAMPLE_SIZE]] == [
+        found is not None for found in naive_matched
+    ]
+
+    speedup = naive_elapsed / matcher_elapsed
+    print(  # noqa: T201
+        f"\n{CONSTANTS_COUNT} constants x {VALUES_COUNT} values: "
+        f"substring matcher {matcher_elapsed:.2f}s, scan by every constant ~{naive_elapsed:.2f}s, "
+        f"speedup {speedup:.1f}x"
+    )
+    assert speedup >= EXPECTED_MIN_SPEEDUP, f"expected >= {EXPECTED_MIN_SPEEDUP}x speedup, got {speedup:.1f}x"
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pg_anon.modes.restore import map_post_data_toc_to_tables
+
+TOC_LINES = [
+    "3301; 2606 16410 CONSTRAINT public users users_pkey postgres",
+    "3302; 2606 16412 CONSTRAINT public orders orders_pkey postgres",
+    "3303; 1259 16413 INDEX public users_email_idx postgres",
+    "3304; 1259 16414 INDEX public orphan_idx postgres",
+    "3305; 0 0 INDEX ATTACH public events_2024_created_idx postgres",
+    "3306; 2620 16415 TRIGGER public users users_audit postgres",
+    "3307; 2606 16416 FK CONSTRAINT public orders orders_user_id_fkey postgres",
+    "3308; 1259 16417 INDEX sales orders_created_idx postgres",
+]
+
+INDEX_TABLES = {
+    ("public", "users_email_idx"): ("public", "users"),
+    ("sales", "orders_created_idx"): ("sales", "orders"),
+    ("public", "events_2024_created_idx"): ("public", "events_2024"),
+}
+
+
+def test_post_data_toc_is_mapped_to_tables() -> None:
+    table_lines, rest_lines = map_post_data_toc_to_tables(TOC_LINES, INDEX_TABLES)
+
+    assert table_lines == {
+        ("public", "users"): [TOC_LINES[0], TOC_LINES[2]],
+        ("public", "orders"): [TOC_LINES[1]],
+        ("sales", "orders"): [TOC_LINES[7]],
+    }
+    # Unknown indexes, attached indexes, triggers and foreign keys are restored after all data
+    assert rest_lines == [TOC_LINES[3], TOC_LINES[4], TOC_LINES[5], TOC_LINES[6]]
+
+
+def test_post_data_toc_keeps_all_lines() -> None:
+    table_lines, rest_lines = map_post_data_toc_to_tables(TOC_LINES, INDEX_TABLES)
+
+    mapped = [line for lines in table_lines.values() for line in lines]
+    assert sorted(mapped + rest_lines) == sorted(TOC_LINES)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pg_anon.common.utils import run_process_with_logs
+
+
+async def test_process_logs_are_passed_line_by_line() -> None:
+    lines: list[str] = []
+    code = (
+        "import sys\n"
+        "print('to stdout')\n"
+        "for idx in range(3):\n"
+        "    print(f'processing item {idx}', file=sys.stderr)\n"
+        "sys.exit(3)\n"
+    )
+
+    return_code = await run_process_with_logs([sys.executable, "-c", code], lines.append)
+
+    assert return_code == 3
+    assert lines == ["processing item 0", "processing item 1", "processing item 2"]
+
+
+async def test_process_gets_environment() -> None:
+    lines: list[str] = []
+    code = "import os, sys\nprint(os.environ['LC_MESSAGES'], file=sys.stderr)\n"
+
+    await run_process_with_logs([sys.executable, "-c", code], lines.append, env={**os.environ, "LC_MESSAGES": "C"})
+
+    assert lines == ["C"]
+
+
+async def test_process_logs_come_while_process_is_running() -> None:
+    received_at: list[float] = []
+    code = "import sys, time\nprint('first', file=sys.stderr, flush=True)\ntime.sleep(1)\n"
+
+    started = time.monotonic()
+    await run_process_with_logs([sys.executable, "-c", code], lambda _line: received_at.append(time.monotonic()))
+    finished = time.monotonic()
+
+    assert len(received_at) == 1
+    assert finished - received_at[0] >= 0.5
+    assert received_at[0] >= started
+
+
+async def test_process_is_killed_when_task_is_cancelled() -> None:
+    process_started = asyncio.Event()
+    code = "import sys, time\nprint('started', file=sys.stderr, flush=True)\ntime.sleep(60)\n"
+    task = asyncio.create_task(run_process_with_logs([sys.executable, "-c", code], lambda _line: process_started.set()))
+
+    await asyncio.wait_for(process_started.wait(), timeout=30)
+    started = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert time.monotonic() - started < 10
+
+
+def test_discarded_queue_does_not_block_process_exit() -> None:
+    # Items which don't fit into the pipe stay in the feeder thread, which is joined at the process exit
+    code = (
+        "import multiprocessing\n"
+        "from pg_anon.common.utils import discard_queue\n"
+        "if __name__ == '__main__':\n"
+        "    task_queue = multiprocessing.get_context('spawn').Queue()\n"
+        "    for idx in range(5000):\n"
+        "        task_queue.put((idx, f'file_{idx}.bin.gz', 'SELECT * FROM public.users' * 5))\n"
+        "    discard_queue(task_queue, timeout=0.1)\n"
+        "    task_queue.close()\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+
+from pg_anon.common.progress import PgRestoreProgress, TransferProgress
+
+
+def test_progress_is_weighted_by_bytes() -> None:
+    progress = TransferProgress("dump")
+    progress.add_task("big.bin.gz", "public", "big", expected_bytes=900)
+    progress.add_task("small.bin.gz", "public", "small", expected_bytes=100)
+
+    progress.task_started("small.bin.gz")
+    progress.bytes_transferred("small.bin.gz", 100)
+    progress.task_finished("small.bin.gz", rows=10, file_bytes=40)
+
+    summary = progress.get_summary()
+    assert summary["percent"] == 10
+    assert summary["files_finished"] == 1
+    assert summary["rows"] == 10
+    assert summary["file_bytes"] == 40
+    assert summary["eta_seconds"] is not None
+
+
+def test_progress_caps_transferred_bytes_by_expected() -> None:
+    progress = TransferProgress("restore")
+    progress.add_task("a.bin.gz", "public", "a", expected_bytes=100)
+    progress.add_task("b.bin.gz", "public", "b", expected_bytes=100)
+
+    progress.task_started("a.bin.gz")
+    progress.bytes_transferred("a.bin.gz", 500)
+
+    summary = progress.get_summary()
+    assert summary["percent"] == 50
+    assert summary["transferred_bytes"] == 500
+
+
+def test_progress_without_sizes_counts_files() -> None:
+    progress = TransferProgress("dump")
+    progress.add_task("a.bin.gz", "public", "a", expected_bytes=0)
+    progress.add_task("b.bin.gz", "public", "b", expected_bytes=0)
+    progress.task_finished("a.bin.gz", rows=1, file_bytes=1)
+
+    assert progress.get_summary()["percent"] == 50
+
+
+def test_progress_groups_files_by_table() -> None:
+    progress = TransferProgress("dump")
+    progress.add_task("t_1.bin.gz", "public", "t", expected_bytes=100)
+    progress.add_task("t_2.bin.gz", "public", "t", expected_bytes=100)
+    for key in ("t_1.bin.gz", "t_2.bin.gz"):
+        progress.task_started(key)
+        progress.task_finished(key, rows=5, file_bytes=10)
+
+    table = progress.get_summary()["tables"]["public.t"]
+    assert table["files_total"] == 2
+    assert table["files_finished"] == 2
+    assert table["rows"] == 10
+
+
+def test_progress_save_is_throttled(tmp_path) -> None:
+    file_path = tmp_path / "progress.json"
+    progress = TransferProgress("dump", file_path=file_path, save_interval=3600)
+    progress.add_task("a.bin.gz", "public", "a", expected_bytes=100)
+
+    progress.bytes_transferred("a.bin.gz", 10)
+    progress.bytes_transferred("a.bin.gz", 10)
+    assert json.loads(file_path.read_text())["transferred_bytes"] == 10
+
+    progress.save(force=True)
+    assert json.loads(file_path.read_text())["transferred_bytes"] == 20
+    assert not (tmp_path / "progress.json.tmp").exists()
+
+
+def test_pg_restore_progress_counts_parallel_items() -> None:
+    progress = PgRestoreProgress("post-data", total_items=4, parallel=True)
+
+    progress.parse_line('pg_restore: processing item 3512 SCHEMA "public"')
+    progress.parse_line("pg_restore: launching item 3520 INDEX users_email_idx")
+    progress.parse_line("pg_restore: finished item 3520 INDEX users_email_idx")
+    progress.parse_line("pg_restore: processing missed item 3530 CONSTRAINT users_pkey")
+    progress.parse_line("pg_restore: entering main parallel loop")
+
+    summary = progress.get_summary()
+    assert summary["items_done"] == 3
+    assert summary["percent"] == 75
+    assert summary["eta_seconds"] is not None
+
+
+def test_pg_restore_progress_counts_serial_items_up_to_total() -> None:
+    progress = PgRestoreProgress("pre-data", total_items=2, parallel=False)
+
+    progress.parse_line('pg_restore: creating TABLE "public.users"')
+    progress.parse_line('pg_restore: creating SEQUENCE "public.users_id_seq"')
+    progress.parse_line('pg_restore: creating SEQUENCE OWNED BY "public.users_id_seq"')
+    progress.parse_line("pg_restore: connecting to database for restore")
+
+    assert progress.get_summary()["items_done"] == 2
+    assert progress.get_summary()["percent"] == 100
+
+
+def test_pg_restore_progress_is_complete_when_finished(tmp_path) -> None:
+    file_path = tmp_path / "pg_restore_progress.json"
+    progress = PgRestoreProgress("post-data", total_items=10, parallel=True, file_path=file_path, save_interval=60)
+
+    progress.parse_line("pg_restore: finished item 1 INDEX a_idx")
+    first_summary = json.loads(file_path.read_text())
+    assert first_summary["items_done"] == 1
+
+    progress.parse_line("pg_restore: finished item 2 INDEX b_idx")
+    assert json.loads(file_path.read_text()) == first_summary
+
+    progress.finish()
+    summary = json.loads(file_path.read_text())
+    assert summary["percent"] == 100
+    assert summary["items_done"] == 10
+    assert summary["eta_seconds"] == 0
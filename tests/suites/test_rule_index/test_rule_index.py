@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+from pg_anon.common.utils import filter_db_tables, get_dict_rule_for_table, RuleIndex
+
+
+def _linear_rule_for_table(dictionary_rules: list[dict], schema: str, table: str) -> dict | None:
+    """Previous implementation of ``get_dict_rule_for_table``, which walks all rules on every lookup."""
+    result = None
+    for rule in dictionary_rules:
+        schema_matched = "schema" in rule and schema == rule["schema"]
+        table_matched = "table" in rule and table == rule["table"]
+        if schema_matched and table_matched:
+            return rule
+
+        schema_mask_matched = "schema_mask" in rule and (
+            rule["schema_mask"] == "*" or re.search(rule["schema_mask"], schema) is not None
+        )
+        table_mask_matched = "table_mask" in rule and (
+            rule["table_mask"] == "*" or re.search(rule["table_mask"], table) is not None
+        )
+        if (
+            (schema_mask_matched and table_matched)
+            or (schema_matched and table_mask_matched)
+            or (schema_mask_matched and table_mask_matched)
+        ):
+            result = rule
+
+    return result
+
+
+RULES = [
+    {"schema_mask": "*", "table_mask": "^log_", "id": "any log"},
+    {"schema": "public", "table": "users", "id": "exact users"},
+    {"schema": "public", "table_mask": "^user", "id": "public user*"},
+    {"schema_mask": "^app", "table": "users", "id": "app* users"},
+    {"schema_mask": "^sales", "table": "users", "id": "sales* users"},
+    {"schema": "public", "table": "users", "id": "second exact users"},
+    {"schema_mask": "^app", "table_mask": "s$", "id": "app* *s"},
+    {"schema": "public", "id": "schema only"},
+    {"schema_mask": "*", "id": "schema mask only"},
+    {"schema_mask": "*", "table_mask": "[invalid", "id": "invalid mask"},
+]
+
+
+@pytest.mark.parametrize(
+    ("schema", "table", "expected_id"),
+    [
+        ("public", "users", "exact users"),
+        ("public", "user_roles", "public user*"),
+        ("public", "log_users", "any log"),
+        # the last matched mask rule wins over an earlier one
+        ("app1", "users", "app* *s"),
+        ("app1", "user", None),
+        ("app1", "orders", "app* *s"),
+        ("app1", "log_orders", "app* *s"),
+        ("app1", "log_order", "any log"),
+        ("sales_eu", "users", "sales* users"),
+        ("other", "orders", None),
+        ("public", "orders", None),
+    ],
+)
+def test_rule_index_keeps_rules_priority(schema, table, expected_id) -> None:
+    rule = RuleIndex(RULES).find(schema, table)
+
+    assert (rule or {}).get("id") == expected_id
+    assert get_dict_rule_for_table(RULES, schema, table) is rule
+
+
+def test_rule_index_matches_linear_lookup_on_random_rules() -> None:
+    rnd = random.Random(7)  # noqa: S311
+    schemas = ["public", "app1", "app2", "sales"]
+    tables = ["users", "orders", "log_users", "items", "user_roles"]
+    schema_conditions = [*({"schema": schema} for schema in schemas), {"schema_mask": "*"}, {"schema_mask": "^app"}]
+    table_conditions = [
+        *({"table": table} for table in tables),
+        {"table_mask": "*"},
+        {"table_mask": "^log_"},
+        {"table_mask": "s$"},
+    ]
+
+    for _ in range(50):
+        rules = [
+            {**rnd.choice(schema_conditions), **rnd.choice(table_conditions), "id": idx}
+            for idx in range(rnd.randint(1, 30))
+        ]
+        rule_index = RuleIndex(rules)
+        for schema in [*schemas, "other"]:
+            for table in [*tables, "other"]:
+                assert rule_index.find(schema, table) is _linear_rule_for_table(rules, schema, table)
+                # a cached result is the same
+                assert rule_index.find(schema, table) is _linear_rule_for_table(rules, schema, table)
+
+
+def test_filter_db_tables_by_rule_index() -> None:
+    tables = [("public", "users"), ("public", "orders"), ("app1", "users"), ("app1", "log_items")]
+
+    filtered, black_listed, white_listed = filter_db_tables(
+        tables,
+        white_list_rules=[{"schema_mask": "*", "table": "users"}, {"schema": "app1", "table_mask": "^log_"}],
+        black_list_rules=[{"schema": "app1", "table": "users"}],
+    )
+
+    assert filtered == [("public", "users"), ("app1", "log_items")]
+    assert black_listed == {("app1", "users")}
+    assert white_listed == {("public", "users"), ("app1", "log_items")}
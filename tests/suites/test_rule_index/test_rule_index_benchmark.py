@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from pg_anon.common.utils import RuleIndex
+
+# Excluded from the default test run; run explicitly with `pytest -m stress`.
+pytestmark = pytest.mark.stress
+
+RULES_COUNTS = (1_000, 10_000, 100_000)
+LOOKUPS_COUNT = 300_000
+MASK_RULES_COUNT = 100
+# Lookup time of exact rules must not grow with the number of rules, a linear scan would be 100x slower
+EXPECTED_MAX_SLOWDOWN = 5
+
+
+def _make_rules(rules_count: int) -> list[dict]:
+    rules: list[dict] = [
+        {"schema": f"schema_{idx % 100}", "table": f"table_{idx}", "fields": {"name": "md5(name)"}}
+        for idx in range(rules_count - MASK_RULES_COUNT)
+    ]
+    rules.extend(
+        {"schema_mask": f"^schema_{idx}$", "table_mask": f"^log_{idx}_", "fields": {"name": "md5(name)"}}
+        for idx in range(MASK_RULES_COUNT)
+    )
+    return rules
+
+
+def _measure_exact_lookups(rules_count: int) -> float:
+    rule_index = RuleIndex(_make_rules(rules_count))
+    exact_rules_count = rules_count - MASK_RULES_COUNT
+    tables = [(f"schema_{idx % 100}", f"table_{idx}") for idx in range(0, exact_rules_count, 7)]
+    lookups = (tables * (LOOKUPS_COUNT // len(tables) + 1))[:LOOKUPS_COUNT]
+
+    started = time.perf_counter()
+    found = [rule_index.find(schema, table) for schema, table in lookups]
+    elapsed = time.perf_counter() - started
+
+    assert all(rule is not None for rule in found)
+    return elapsed
+
+
+def test_rule_index_exact_lookup_time_does_not_depend_on_rules_count() -> None:
+    elapsed = {rules_count: _measure_exact_lookups(rules_count) for rules_count in RULES_COUNTS}
+
+    print(  # noqa: T201
+        f"\n{LOOKUPS_COUNT} exact lookups: "
+        + ", ".join(f"{rules_count} rules {seconds:.3f}s" for rules_count, seconds in elapsed.items())
+    )
+    slowdown = elapsed[RULES_COUNTS[-1]] / elapsed[RULES_COUNTS[0]]
+    assert slowdown <= EXPECTED_MAX_SLOWDOWN, (
+        f"expected lookups to take about the same time, got {slowdown:.1f}x slowdown for "
+        f"{RULES_COUNTS[-1]} rules against {RULES_COUNTS[0]} rules"
+    )
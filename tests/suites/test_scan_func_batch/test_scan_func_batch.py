@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from pg_anon.common.db_utils import create_connection, exec_data_scan_func_query
+from pg_anon.common.dto import ConnectionParams, FieldInfo
+
+DB_NAME = "pg_anon_scan_func_batch"
+
+FIELD_INFO = FieldInfo(
+    nspname="public",
+    relname="users",
+    column_name="email",
+    type="text",
+    oid=0,
+    attnum=1,
+    obj_id="0",
+    tbl_id="0",
+)
+
+
+@pytest.fixture(scope="module")
+async def database(db_manager):
+    await db_manager.create_db(DB_NAME)
+    yield DB_NAME
+    await db_manager.drop_db(DB_NAME)
+
+
+@pytest.fixture
+async def connection(database, db_params):
+    conn = await create_connection(
+        ConnectionParams(
+            host=db_params.test_db_host,
+            port=int(db_params.test_db_port),
+            database=database,
+            user=db_params.test_db_user,
+            password=db_params.test_db_user_password,
+        )
+    )
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scan_calls (value text);
+
+        CREATE OR REPLACE FUNCTION public.is_email(value text, schema_name text, table_name text, field_name text)
+        RETURNS boolean AS $$
+        BEGIN
+            INSERT INTO scan_calls VALUES (value);
+            RETURN value LIKE '%@%';
+        END;
+        $$ LANGUAGE plpgsql;
+
+        TRUNCATE scan_calls;
+        """
+    )
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+async def test_scan_func_counts_matches_in_one_query(connection):
+    values = ["a@example.com", "plain", "b@example.com", "c@example.com"]
+
+    matched = await exec_data_scan_func_query(connection, "public.is_email", values, FIELD_INFO, max_matches=10)
+
+    assert matched == 3
+
+
+async def test_scan_func_stops_after_n_count_matches(connection):
+    values = ["a@example.com", "b@example.com", "plain", "c@example.com"]
+
+    matched = await exec_data_scan_func_query(connection, "public.is_email", values, FIELD_INFO, max_matches=2)
+
+    assert matched == 2
+    assert await connection.fetchval("SELECT count(*) FROM scan_calls") == 2
+
+
+async def test_scan_func_returns_zero_for_not_enough_matches(connection):
+    matched = await exec_data_scan_func_query(
+        connection, "public.is_email", ["plain", "text"], FIELD_INFO, max_matches=1
+    )
+
+    assert matched == 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from pg_anon.common.dto import FieldInfo
+from pg_anon.common.scan_state import ScanState
+
+
+def _field(type_: str = "text", rule: str | None = None) -> FieldInfo:
+    return FieldInfo(
+        nspname="public",
+        relname="users",
+        column_name="email",
+        type=type_,
+        oid=1,
+        attnum=1,
+        obj_id="f1",
+        tbl_id="t1",
+        rule=rule,
+    )
+
+
+def _saved_state(tmp_path, table_stats) -> ScanState:
+    state = ScanState(tmp_path / "scan_state.json", database="db")
+    state.set_verdict(_field(rule="anon_funcs.partial_email(email)"), "hash", table_stats, sensitive=True)
+    state.save()
+
+    loaded = ScanState(tmp_path / "scan_state.json", database="db")
+    loaded.load()
+    return loaded
+
+
+def test_scan_state_round_trip(tmp_path) -> None:
+    state = _saved_state(tmp_path, {"n_tup_mod": 100, "n_live_tup": 1000})
+
+    verdict = state.get_verdict(_field(), "hash", {"n_tup_mod": 150, "n_live_tup": 1000})
+
+    assert verdict is not None
+    assert verdict["sensitive"] is True
+    assert verdict["rule"] == "anon_funcs.partial_email(email)"
+
+
+@pytest.mark.parametrize(
+    ("field_type", "rules_hash", "table_stats"),
+    [
+        ("varchar", "hash", {"n_tup_mod": 100, "n_live_tup": 1000}),  # type changed
+        ("text", "other_hash", {"n_tup_mod": 100, "n_live_tup": 1000}),  # rules changed
+        ("text", "hash", {"n_tup_mod": 201, "n_live_tup": 1000}),  # too many writes
+        ("text", "hash", {"n_tup_mod": 10, "n_live_tup": 1000}),  # statistics were reset
+        ("text", "hash", {"n_tup_mod": None, "n_live_tup": None}),  # no statistics
+        ("text", "hash", None),  # table is missing in statistics
+    ],
+)
+def test_scan_state_invalidates_verdict(tmp_path, field_type, rules_hash, table_stats) -> None:
+    state = _saved_state(tmp_path, {"n_tup_mod": 100, "n_live_tup": 1000})
+
+    assert state.get_verdict(_field(field_type), rules_hash, table_stats) is None
+
+
+def test_scan_state_of_another_database_is_ignored(tmp_path) -> None:
+    _saved_state(tmp_path, {"n_tup_mod": 100, "n_live_tup": 1000})
+
+    state = ScanState(tmp_path / "scan_state.json", database="other_db")
+    state.load()
+
+    assert state.fields == {}
+
+
+def test_scan_state_retain_forgets_dropped_fields(tmp_path) -> None:
+    state = _saved_state(tmp_path, {"n_tup_mod": 100, "n_live_tup": 1000})
+
+    state.retain({"f2"})
+
+    assert state.fields == {}
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from pg_anon.common.scheduler import estimate_table_cost, plan_tasks, simulate_makespan
+
+
+@pytest.mark.parametrize(
+    ("costs", "workers", "expected"),
+    [
+        ([], 4, 0),
+        ([5], 4, 5),
+        ([1, 1, 1, 1], 2, 2),
+        ([1, 1, 1, 10], 2, 11),
+        ([10, 1, 1, 1], 2, 10),
+    ],
+)
+def test_simulate_makespan(costs: list[float], workers: int, expected: float) -> None:
+    assert simulate_makespan(costs, workers) == expected
+
+
+def test_largest_first_puts_giant_task_first() -> None:
+    schedule = plan_tasks(costs=[1, 2, 3, 100, 4], workers=2)
+
+    assert schedule.order == [3, 4, 2, 1, 0]
+    assert schedule.predicted_makespan == 100
+    assert schedule.in_order_makespan == 102
+
+
+def test_largest_first_keeps_catalog_order_for_equal_costs() -> None:
+    schedule = plan_tasks(costs=[5, 5, 5], workers=2)
+
+    assert schedule.order == [0, 1, 2]
+
+
+def test_disabled_largest_first_keeps_order() -> None:
+    schedule = plan_tasks(costs=[1, 2, 3, 100, 4], workers=2, largest_first=False)
+
+    assert schedule.order == [0, 1, 2, 3, 4]
+    assert schedule.predicted_makespan == schedule.in_order_makespan == 102
+
+
+def test_largest_first_is_never_worse_than_lower_bound_ratio() -> None:
+    costs = [7, 7, 6, 6, 5, 5, 4, 4, 4]
+    workers = 3
+    schedule = plan_tasks(costs=costs, workers=workers)
+
+    lower_bound = max(sum(costs) / workers, max(costs))
+    # Graham's bound for LPT scheduling
+    assert schedule.predicted_makespan <= lower_bound * (4 / 3 - 1 / (3 * workers))
+
+
+def test_schedule_reports_actual_makespan() -> None:
+    schedule = plan_tasks(costs=[2, 1], workers=1)
+
+    assert schedule.get_result_summary() == "no tasks were executed"
+
+    for idx in schedule.order:
+        schedule.task_started(idx)
+        schedule.task_finished(idx)
+
+    summary = schedule.get_result_summary()
+    assert summary.startswith("actual makespan")
+    assert "predicted makespan" in summary
+    assert "2 tasks on 1 workers" in schedule.get_plan_summary()
+
+
+def test_estimate_table_cost_counts_rows() -> None:
+    assert estimate_table_cost(size=8192, reltuples=0) == 8192
+    assert estimate_table_cost(size=8192, reltuples=100) > 8192
+    assert estimate_table_cost(size=0, reltuples=-1) == 0